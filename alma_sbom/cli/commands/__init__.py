@@ -6,17 +6,27 @@ from .commands import SubCommand
 from .package import PackageCommand
 from .build import BuildCommand
 from .iso import IsoCommand
+from .batch import BatchCommand
+from .serve import ServeCommand
+from .collect import CollectCommand
+from .render import RenderCommand
+from .notarized_filter import NotarizedFilterCommand
 
 command_classes: dict[str, type[SubCommand]] = {
     'package': PackageCommand,
     'build': BuildCommand,
     'iso': IsoCommand,
+    'batch': BatchCommand,
+    'serve': ServeCommand,
+    'collect': CollectCommand,
+    'render': RenderCommand,
+    'notarized-filter': NotarizedFilterCommand,
 }
 
 def command_factory(base: CommonConfig, args: argparse.Namespace) -> SubCommand:
     try:
         command_class = command_classes[args.command]
-        return command_class(base, args)
+        return command_class.from_base_args(base, args)
     except KeyError:
         raise ValueError(f"Unknown command: {args.command}")
 
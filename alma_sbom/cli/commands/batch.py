@@ -0,0 +1,64 @@
+from dataclasses import replace
+from logging import getLogger
+from typing import ClassVar
+
+from alma_sbom.cli.config import CommonConfig, BatchConfig, BatchTarget
+
+from .commands import SubCommand
+from .package import PackageCommand
+from .build import BuildCommand
+from .iso import IsoCommand
+
+_logger = getLogger(__name__)
+
+class BatchCommand(SubCommand):
+    CONFIG_CLASS : ClassVar[type[CommonConfig]] = BatchConfig
+    config: BatchConfig
+
+    TARGET_COMMAND_CLASSES: ClassVar[dict[str, type[SubCommand]]] = {
+        'package': PackageCommand,
+        'build': BuildCommand,
+        'iso': IsoCommand,
+    }
+
+    def run(self) -> int:
+        targets = self.runner()
+        _logger.info(f'Generating SBOMs of {len(targets)} targets from {self.config.manifest}')
+
+        ### NOTE:
+        # Targets are generated on config.jobs threads, and each target is
+        # generated serially to avoid nesting worker pools. All targets share
+        # the collector factory, so immudb collectors (and their connections)
+        # are reused by each worker thread and the immudb cache is opened once.
+        base = replace(self.config.get_base(), jobs=1)
+        results = list(self._map_concurrently(
+            lambda target: self._generate_target(base, target),
+            targets,
+        ))
+
+        failed = results.count(False)
+        if failed:
+            _logger.error(f'Failed to generate {failed} of {len(targets)} SBOMs')
+            return 1
+        return 0
+
+    def _select_runner(self) -> None:
+        if self.config.manifest:
+            self.runner = self.config.read_manifest
+        else:
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                'Required info to generate SBOMs in batch has not been provided.'
+            )
+
+    def _generate_target(self, base: CommonConfig, target: BatchTarget) -> bool:
+        try:
+            command_class = self.TARGET_COMMAND_CLASSES[target.command]
+            command = command_class(target.to_config(base), self.collector_factory)
+            exit_code = command.run()
+        except Exception as e:
+            _logger.error(f'Failed to generate {target.output_file}: {e}')
+            _logger.debug('Traceback of the failure', exc_info=True)
+            return False
+        _logger.debug(f'Generated {target.output_file}')
+        return exit_code == 0
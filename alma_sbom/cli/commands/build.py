@@ -1,29 +1,45 @@
 import argparse
+from dataclasses import replace
 from logging import getLogger
-from typing import ClassVar, TYPE_CHECKING
+from typing import ClassVar, Iterator, TYPE_CHECKING
 
 from alma_sbom.cli.config import CommonConfig, BuildConfig
+from alma_sbom.cli.factory import DocumentFactory
+
+from alma_sbom.compact import intern_str
+from alma_sbom.profiling import stage
 
 from .commands import SubCommand
 
 if TYPE_CHECKING:
-    from alma_sbom.data import Build
+    from alma_sbom.data import Build, Package
+    from alma_sbom.data.collectors.albs import AlbsArtifact, AlbsCollector
 
 _logger = getLogger(__name__)
 
 class BuildCommand(SubCommand):
     CONFIG_CLASS : ClassVar[type[CommonConfig]] = BuildConfig
     config: BuildConfig
+    ### whether the build collected by the runner has finished
+    build_finished: bool = True
 
     def run(self) -> int:
+        if self.config.is_multi():
+            return self._run_builds(self.runner())
         build = self.runner()
-        doc = self.document_factory.gen_from_build(build)
-        doc.write(self.config.output_file)
-        return 0
+        return self._write_documents(DocumentFactory.gen_from_build, build)
+
+    def is_final(self) -> bool:
+        ### tasks of an unfinished build may still add packages
+        return self.build_finished
 
     def _select_runner(self) -> None:
         if self.config.build_id:
             self.runner = self._runner_with_build_id
+        elif self.config.build_ids:
+            self.runner = self._runner_with_build_ids
+        elif self.config.created_after:
+            self.runner = self._runner_with_created_at
         else:
             raise RuntimeError(
                 'Unexpected situation has occurred. '
@@ -32,13 +48,82 @@ class BuildCommand(SubCommand):
 
     def _runner_with_build_id(self) -> 'Build':
         albs_collector = self.collector_factory.gen_albs_collector()
-        build = albs_collector.collect_build_by_id(build_id=self.config.build_id)
+        with stage('albs'):
+            build = albs_collector.collect_build_by_id(build_id=self.config.build_id)
+        self.build_finished = albs_collector.build_finished
+
+        ### NOTE:
+        # Packages are a pipeline: hashes are looked up on config.jobs
+        # threads while the resolved packages are consumed, either by the
+        # streaming document as it writes them or by append_package(). The
+        # number of lookups in flight is bounded by _map_concurrently().
+        return self._set_packages(build, self._iter_packages(albs_collector))
+
+    def _iter_packages(self, albs_collector: 'AlbsCollector') -> Iterator['Package']:
+        ### each unique artifact is looked up once, even if several tasks built it
+        pkg_hashes = list(albs_collector.iter_package_hash())
+        for pkg_hash, pkg in zip(pkg_hashes, self._map_concurrently(
+            self._collect_package_by_hash,
+            pkg_hashes,
+        )):
+            self._set_build_tasks(pkg, albs_collector.get_artifact(pkg_hash))
+            yield pkg
+
+    @staticmethod
+    def _set_build_tasks(pkg: 'Package', artifact: 'AlbsArtifact') -> None:
+        if pkg.build_properties is None:
+            return
+        if artifact.task_ids:
+            pkg.build_properties.task_ids = ','.join(artifact.task_ids)
+        if artifact.arches:
+            pkg.build_properties.task_arches = intern_str(','.join(artifact.arches))
+
+    def _runner_with_build_ids(self) -> list[str]:
+        return self.config.parse_build_ids(self.config.build_ids)
+
+    def _runner_with_created_at(self) -> list[str]:
+        albs_collector = self.collector_factory.gen_albs_collector()
+        with stage('albs'):
+            return list(albs_collector.iter_build_id_by_created_at(
+                self.config.created_after,
+                self.config.created_before,
+            ))
 
-        immudb_collector = self.collector_factory.gen_immudb_collector()
+    def _run_builds(self, build_ids: list[str]) -> int:
+        _logger.info(f'Generating SBOMs of {len(build_ids)} builds into {self.config.output_dir}')
+        self.config.output_dir.mkdir(parents=True, exist_ok=True)
+
+        ### NOTE:
+        # Builds are generated on config.jobs threads like targets of the
+        # batch subcommand, and share the collector factory, so the ALBS
+        # session, the immudb collectors of the worker threads and the
+        # caches are reused by every build.
+        base = replace(self.config.get_base(), jobs=1)
+        results = list(self._map_concurrently(
+            lambda build_id: self._generate_build(base, build_id),
+            build_ids,
+        ))
+
+        failed = results.count(False)
+        if failed:
+            _logger.error(f'Failed to generate {failed} of {len(build_ids)} SBOMs')
+            return 1
+        return 0
 
-        for pkg_hash in albs_collector.iter_package_hash():
-            pkg = immudb_collector.collect_package_by_hash(pkg_hash)
-            build.append_package(pkg)
+    def _generate_build(self, base: CommonConfig, build_id: str) -> bool:
+        output_file = self.config.get_output_file(build_id)
+        try:
+            config = BuildConfig.from_base(replace(base, output_file=output_file), build_id)
+            exit_code = BuildCommand(config, self.collector_factory).run()
+        except Exception as e:
+            _logger.error(f'Failed to generate {output_file}: {e}')
+            _logger.debug('Traceback of the failure', exc_info=True)
+            return False
+        _logger.debug(f'Generated {output_file}')
+        return exit_code == 0
 
-        return build
+    def _collect_package_by_hash(self, pkg_hash: str) -> 'Package':
+        immudb_collector = self.collector_factory.get_thread_immudb_collector()
+        with stage('immudb'):
+            return immudb_collector.collect_package_by_hash(pkg_hash)
 
@@ -0,0 +1,44 @@
+from logging import getLogger
+from typing import ClassVar
+
+from alma_sbom.cli.config import CommonConfig, CollectConfig
+from alma_sbom.data.snapshot import write_snapshot
+from alma_sbom.profiling import stage
+
+from .commands import SubCommand
+from .package import PackageCommand
+from .build import BuildCommand
+from .iso import IsoCommand
+
+_logger = getLogger(__name__)
+
+class CollectCommand(SubCommand):
+    CONFIG_CLASS : ClassVar[type[CommonConfig]] = CollectConfig
+    config: CollectConfig
+
+    TARGET_COMMAND_CLASSES: ClassVar[dict[str, type[SubCommand]]] = {
+        'package': PackageCommand,
+        'build': BuildCommand,
+        'iso': IsoCommand,
+    }
+
+    def run(self) -> int:
+        collected = self.runner()
+        ### NOTE:
+        # With --stream, packages of an ISO image are collected while the
+        # snapshot is written, like the streaming documents.
+        with stage('write'):
+            write_snapshot(self.config.output_file, collected)
+        _logger.debug(f'Snapshot has been written to {self.config.output_file}')
+        return 0
+
+    def _select_runner(self) -> None:
+        command_class = self.TARGET_COMMAND_CLASSES.get(self.config.target_command)
+        if command_class is None:
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                'Required info to collect data has not been provided.'
+            )
+        ### the runner of the target subcommand returns the collected data
+        ### instead of writing a document of it
+        self.runner = command_class(self.config.target, self.collector_factory).runner
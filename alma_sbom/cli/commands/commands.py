@@ -1,24 +1,48 @@
 import argparse
 from abc import ABC, abstractmethod
-from typing import Callable, ClassVar
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from logging import getLogger
+from typing import Callable, ClassVar, Iterable, Iterator, TypeVar, TYPE_CHECKING
 
 from alma_sbom.cli.config import CommonConfig
 from alma_sbom.cli.factory import CollectorFactory, DocumentFactory
+from alma_sbom.profiling import stage
+
+if TYPE_CHECKING:
+    from alma_sbom.data import Package
+    from alma_sbom.formats import Document
+
+_logger = getLogger(__name__)
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
 
 class SubCommand(ABC):
     CONFIG_CLASS : ClassVar[type[CommonConfig]]
+    ### items submitted ahead of the consumer by _map_concurrently(), per worker
+    MAX_PENDING_PER_JOB: ClassVar[int] = 4
 
     config: CommonConfig
     collector_factory: CollectorFactory
-    document_factory: DocumentFactory
+    ### one for each output format
+    document_factories: list[DocumentFactory]
     runner: Callable
 
-    def __init__(self, base: CommonConfig, args: argparse.Namespace) -> None:
-        self.config = self.CONFIG_CLASS.from_base_args(base, args)
-        self.collector_factory = CollectorFactory(self.config)
-        self.document_factory = DocumentFactory(self.config)
+    def __init__(self, config: CommonConfig, collector_factory: CollectorFactory = None) -> None:
+        self.config = config
+        ### collector_factory is given when collectors are shared among commands
+        self.collector_factory = collector_factory or CollectorFactory(self.config)
+        self.document_factories = [
+            DocumentFactory(output_config) for output_config in self.config.get_output_configs()
+        ]
         self._select_runner()
 
+    @classmethod
+    def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'SubCommand':
+        return cls(cls.CONFIG_CLASS.from_base_args(base, args))
+
     @abstractmethod
     def run(self, args: argparse.Namespace) -> int:
         pass
@@ -27,3 +51,85 @@ class SubCommand(ABC):
     def _select_runner() -> None:
         pass
 
+    def is_final(self) -> bool:
+        """Return whether the documents written by run() would be the same if written again"""
+        return True
+
+    def _write_documents(self, gen_document: Callable[[DocumentFactory, _T], 'Document'], obj: _T) -> int:
+        """Write documents of obj in every output format and return the exit code.
+
+        gen_document is one of the gen_from_*() methods of DocumentFactory.
+        Several formats are rendered by worker processes, one for each of
+        them, from the model collected once. The stages run by the workers
+        are not included in --profile.
+        """
+        if len(self.document_factories) == 1:
+            return _write_document(self.document_factories[0], gen_document, obj)
+
+        with stage('write'), ProcessPoolExecutor(max_workers=len(self.document_factories)) as executor:
+            exit_codes = list(executor.map(
+                _write_document, self.document_factories, repeat(gen_document), repeat(obj),
+            ))
+        return max(exit_codes)
+
+    def _map_concurrently(self, func: Callable[[_T], _R], items: Iterable[_T]) -> Iterator[_R]:
+        """Apply func to each item using up to config.jobs worker threads.
+
+        Results are yielded in the order of items regardless of the order
+        in which the workers complete, so the output stays deterministic.
+        """
+        if self.config.jobs <= 1:
+            yield from map(func, items)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.config.jobs) as executor:
+            yield from self._map_bounded(executor, func, items)
+
+    def _map_bounded(self, executor: Executor, func: Callable[[_T], _R], items: Iterable[_T]) -> Iterator[_R]:
+        """Apply func to each item on executor, yielding results in the order of items.
+
+        At most config.jobs * MAX_PENDING_PER_JOB items are in flight, so
+        items are pulled from an iterator as results are consumed, and
+        results do not pile up in memory when the consumer is slower, e.g.
+        a streaming document writing them.
+        """
+        max_pending = self.config.jobs * self.MAX_PENDING_PER_JOB
+        pending = deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            ### e.g. func has raised or the consumer has stopped
+            for future in pending:
+                future.cancel()
+
+    def _set_packages(self, obj: _T, packages: Iterator['Package']) -> _T:
+        """Set packages to obj, which is a Build or an Iso"""
+        if self.config.stream and len(self.document_factories) == 1:
+            ### NOTE:
+            # Packages are collected while the streaming document is
+            # written, so they are never held in memory all at once.
+            # Several formats are rendered from the same packages, so they
+            # are collected beforehand then.
+            obj.packages = packages
+        else:
+            for pkg in packages:
+                obj.append_package(pkg)
+        return obj
+
+def _write_document(document_factory: DocumentFactory, gen_document: Callable[[DocumentFactory, _T], 'Document'], obj: _T) -> int:
+    """Write a document of obj to the output file of document_factory and return the exit code"""
+    doc = gen_document(document_factory, obj)
+    output_file = document_factory.config.output_file
+    with stage('write'):
+        doc.write(output_file)
+    with stage('validation'):
+        valid = doc.wait_validation()
+    if not valid:
+        _logger.error(f'Invalid document has been written to {output_file}')
+        return 1
+    return 0
@@ -1,52 +1,178 @@
 import argparse
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from logging import getLogger
-from typing import ClassVar, TYPE_CHECKING
+from pathlib import Path
+from typing import ClassVar, Iterator, TYPE_CHECKING
 
 from alma_sbom.cli.config import CommonConfig, IsoConfig
+from alma_sbom.cli.factory import CollectorFactory, DocumentFactory
 
 ### TODO: https://github.com/AlmaLinux/alma-sbom/issues/59
 from alma_sbom.data import NullPackage
+from alma_sbom.profiling import stage, iter_stage
 
 from .commands import SubCommand
 
+if TYPE_CHECKING:
+    from alma_sbom.data import (
+        Iso,
+        IsoCollector,
+        ImmudbCollector,
+        Package,
+        RpmCollector,
+    )
+
 _logger = getLogger(__name__)
 
 class IsoCommand(SubCommand):
     CONFIG_CLASS : ClassVar[type[CommonConfig]] = IsoConfig
+    ### packages processed by a worker process per task with --jobs
+    CHUNK_SIZE: ClassVar[int] = 8
     config: IsoConfig
 
     def run(self) -> int:
         iso = self.runner()
-        doc = self.document_factory.gen_from_iso(iso)
-        doc.write(self.config.output_file)
-        return 0
+        return self._write_documents(DocumentFactory.gen_from_iso, iso)
 
     def _select_runner(self) -> None:
-        if self.config.iso_image:
+        if self.config.iso_image and self.config.repodata:
+            self.runner = self._runner_with_repodata
+        elif self.config.iso_image and self.config.jobs > 1:
+            self.runner = self._runner_with_iso_image_in_parallel
+        elif self.config.iso_image:
             self.runner = self._runner_with_iso_image
         else:
             raise RuntimeError('Unexpected situation has occurred')
 
     def _runner_with_iso_image(self) -> 'Iso':
-        iso_collector = self.collector_factory.gen_iso_collector()
-        immudb_collector = self.collector_factory.gen_immudb_collector()
-        rpm_collector = self.collector_factory.gen_rpm_collector()
+        iso_collector = self.collector_factory.gen_iso_collector(zero_copy=self.config.zero_copy)
+        with stage('iso'):
+            iso = iso_collector.collect_iso_by_file(self.config.iso_image)
+        return self._set_packages(iso, self._iter_merged_packages(iso_collector))
 
-        iso = iso_collector.collect_iso_by_file(self.config.iso_image)
+    def _iter_merged_packages(self, iso_collector: 'IsoCollector') -> Iterator['Package']:
+        immudb_collector = self.collector_factory.get_thread_immudb_collector()
+        rpm_collector = self.collector_factory.gen_rpm_collector()
 
         count = 1
-        fd_path = iso_collector.get_fd_path()
-        for _ in iso_collector.iter_packages():
+        for pkg_from_pkg in self._iter_packages_from_iso(iso_collector, rpm_collector):
             _logger.debug(f'Processing package #{count}...')
-            count = count + 1
-            try:
-                pkg_from_immudb = immudb_collector.collect_package_by_package(fd_path)
-            except KeyError as e:
-                pkg_from_immudb = NullPackage
-            pkg_from_pkg = rpm_collector.collect_package_from_file(fd_path)
-            pkg_merged = pkg_from_immudb.merge(pkg_from_pkg)
-            iso.append_package(pkg_merged)
+            count += 1
+            yield _merge_package_from_immudb(immudb_collector, pkg_from_pkg)
+
+        from alma_sbom.data.collectors.licenses import licenses_cache_info
+        _logger.debug(f'License cache: {licenses_cache_info()}')
+
+    def _runner_with_iso_image_in_parallel(self) -> 'Iso':
+        ### NOTE:
+        # The parent process only reads the ISO directory records. Each worker
+        # process opens the image again and has its own pycdlib handle, memfd
+        # and collectors, so no state is shared between the workers.
+        # The stages run by the workers are not included in --profile.
+        iso_collector = self.collector_factory.gen_iso_collector()
+        with stage('iso'):
+            iso = iso_collector.collect_iso_by_file(self.config.iso_image)
+            package_paths = list(iso_collector.iter_package_paths())
+        return self._set_packages(iso, self._iter_packages_in_parallel(package_paths))
+
+    def _iter_packages_in_parallel(self, package_paths: list[Path]) -> Iterator['Package']:
+        with ProcessPoolExecutor(
+            max_workers=self.config.jobs,
+            initializer=_IsoWorker.initialize,
+            initargs=(self.config,),
+        ) as executor:
+            ### NOTE:
+            # Chunks are submitted within the bounded window of
+            # _map_bounded(), so that packages processed ahead of a slow
+            # consumer such as a streaming document do not pile up, and
+            # they are yielded in the order of package_paths, which is the
+            # order of the serial runner.
+            chunks = self._iter_chunks(package_paths)
+            count = 0
+            for packages in self._map_bounded(executor, _IsoWorker.process_chunk, chunks):
+                for pkg in packages:
+                    count += 1
+                    _logger.debug(f'Processed package #{count}')
+                    yield pkg
+
+    def _iter_chunks(self, package_paths: list[Path]) -> Iterator[list[Path]]:
+        """Split package_paths into the lists of paths sent to a worker at once"""
+        for start in range(0, len(package_paths), self.CHUNK_SIZE):
+            yield package_paths[start:start + self.CHUNK_SIZE]
+
+    def _runner_with_repodata(self) -> 'Iso':
+        iso_collector = self.collector_factory.gen_iso_collector(zero_copy=self.config.zero_copy)
+        with stage('iso'):
+            iso = iso_collector.collect_iso_by_file(self.config.iso_image)
+        with stage('repodata'):
+            packages = iso_collector.collect_packages_from_repodata(
+                verify_count=self.config.verify_checksums,
+            )
+
+        ### NOTE:
+        # Nothing is read from the ISO image any more, so the immudb lookups
+        # are I/O bound and run on threads like the build subcommand.
+        return self._set_packages(
+            iso,
+            self._map_concurrently(self._merge_package_from_thread_immudb, packages),
+        )
 
-        return iso
+    def _merge_package_from_thread_immudb(self, pkg_from_repodata: 'Package') -> 'Package':
+        immudb_collector = self.collector_factory.get_thread_immudb_collector()
+        return _merge_package_from_immudb(immudb_collector, pkg_from_repodata)
+
+    def _iter_packages_from_iso(self, iso_collector: 'IsoCollector', rpm_collector: 'RpmCollector') -> Iterator['Package']:
+        if self.config.zero_copy:
+            for window in iter_stage('iso', iso_collector.iter_package_windows()):
+                with stage('rpm'):
+                    pkg = rpm_collector.collect_package_from_window(window)
+                yield pkg
+        else:
+            fd_path = iso_collector.get_fd_path()
+            for _ in iter_stage('iso', iso_collector.iter_packages()):
+                with stage('rpm'):
+                    pkg = rpm_collector.collect_package_from_file(fd_path)
+                yield pkg
+
+class _IsoWorker:
+    """Per process state of the workers of IsoCommand"""
+    instance: ClassVar['_IsoWorker'] = None
+
+    config: IsoConfig
+    iso_collector: 'IsoCollector'
+    immudb_collector: 'ImmudbCollector'
+    rpm_collector: 'RpmCollector'
+
+    def __init__(self, config: IsoConfig) -> None:
+        collector_factory = CollectorFactory(config)
+        self.config = config
+        self.iso_collector = collector_factory.gen_iso_collector(zero_copy=config.zero_copy)
+        self.iso_collector.collect_iso_by_file(config.iso_image)
+        self.immudb_collector = collector_factory.gen_immudb_collector()
+        self.rpm_collector = collector_factory.gen_rpm_collector()
+
+    @classmethod
+    def initialize(cls, config: IsoConfig) -> None:
+        cls.instance = cls(config)
+
+    @classmethod
+    def process_chunk(cls, full_rr_paths: list[Path]) -> list['Package']:
+        return [cls.instance._process(full_rr_path) for full_rr_path in full_rr_paths]
+
+    def _process(self, full_rr_path: Path) -> 'Package':
+        if self.config.zero_copy:
+            with self.iso_collector.open_package_window(full_rr_path) as window:
+                pkg_from_pkg = self.rpm_collector.collect_package_from_window(window)
+        else:
+            fd_path = self.iso_collector.extract_package(full_rr_path)
+            pkg_from_pkg = self.rpm_collector.collect_package_from_file(fd_path)
+        return _merge_package_from_immudb(self.immudb_collector, pkg_from_pkg)
 
+def _merge_package_from_immudb(immudb_collector: 'ImmudbCollector', pkg_from_pkg: 'Package') -> 'Package':
+    try:
+        with stage('immudb'):
+            pkg_from_immudb = immudb_collector.collect_package_by_hash(pkg_from_pkg.hashs[0].value, allow_negative=True)
+    except KeyError as e:
+        pkg_from_immudb = NullPackage
+    return pkg_from_immudb.merge(pkg_from_pkg)
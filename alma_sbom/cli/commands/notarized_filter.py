@@ -0,0 +1,43 @@
+from logging import getLogger
+from typing import ClassVar, TYPE_CHECKING
+
+from alma_sbom.cli.config import CommonConfig, NotarizedFilterConfig
+from alma_sbom.profiling import stage
+
+from .commands import SubCommand
+
+if TYPE_CHECKING:
+    from alma_sbom.data.collectors.immudb.bloom import BloomFilter
+
+_logger = getLogger(__name__)
+
+class NotarizedFilterCommand(SubCommand):
+    CONFIG_CLASS : ClassVar[type[CommonConfig]] = NotarizedFilterConfig
+    config: NotarizedFilterConfig
+
+    def run(self) -> int:
+        bloom_filter = self.runner()
+        with stage('write'):
+            bloom_filter.write(self.config.output_file)
+        return 0
+
+    def _select_runner(self) -> None:
+        if self.config.hashes:
+            self.runner = self._runner_with_hashes
+        else:
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                'Required info to make a filter of notarized hashes has not been provided.'
+            )
+
+    def _runner_with_hashes(self) -> 'BloomFilter':
+        from alma_sbom.data.collectors.immudb.bloom import BloomFilter
+        with open(self.config.hashes) as fd:
+            hashes = [line.strip() for line in fd if line.strip() and not line.startswith('#')]
+        with stage('filter'):
+            bloom_filter = BloomFilter.from_hashes(hashes, self.config.false_positive_rate)
+        _logger.info(
+            f'Made a filter of {len(hashes)} hashes with {bloom_filter.num_bits} bits '
+            f'and {bloom_filter.num_hashes} hash functions'
+        )
+        return bloom_filter
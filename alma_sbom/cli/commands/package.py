@@ -3,6 +3,9 @@ from logging import getLogger
 from typing import ClassVar, TYPE_CHECKING
 
 from alma_sbom.cli.config import CommonConfig, PackageConfig
+from alma_sbom.cli.factory import DocumentFactory
+
+from alma_sbom.profiling import stage
 
 from .commands import SubCommand
 
@@ -20,9 +23,7 @@ class PackageCommand(SubCommand):
 
     def run(self) -> int:
         package = self.runner()
-        doc = self.document_factory.gen_from_package(package)
-        doc.write(self.config.output_file)
-        return 0
+        return self._write_documents(DocumentFactory.gen_from_package, package)
 
     def _select_runner(self) -> None:
         if self.config.rpm_package_hash:
@@ -36,23 +37,29 @@ class PackageCommand(SubCommand):
             )
 
     def _runner_with_rpm_package_hash(self) -> 'Package':
-        immudb_collector = self.collector_factory.gen_immudb_collector()
+        immudb_collector = self.collector_factory.get_thread_immudb_collector()
         try:
-            return immudb_collector.collect_package_by_hash(self.config.rpm_package_hash)
+            with stage('immudb'):
+                return immudb_collector.collect_package_by_hash(self.config.rpm_package_hash)
         except KeyError as e:
             raise KeyError(f'Failed to get data from immudb for hash value: {self.config.rpm_package_hash}') from e
 
     def _runner_with_rpm_package(self) -> 'Package':
-        immudb_collector = self.collector_factory.gen_immudb_collector()
-        rpm_collector = self.collector_factory.gen_rpm_collector()
+        immudb_collector = self.collector_factory.get_thread_immudb_collector()
+        rpm_collector = self.collector_factory.get_thread_rpm_collector()
 
+        with stage('rpm'):
+            pkg_from_pkg = rpm_collector.collect_package_from_file(self.config.rpm_package)
         try:
-            pkg_from_immudb = immudb_collector.collect_package_by_package(self.config.rpm_package)
+            with stage('immudb'):
+                pkg_from_immudb = immudb_collector.collect_package_by_hash(
+                    pkg_from_pkg.hashs[0].value,
+                    allow_negative=True,
+                )
         except KeyError as e:
             _logger.warning(f'Failed to get data from immudb corresponding to {self.config.rpm_package}')
             _logger.warning(f'Create SBOM from only package data.')
             pkg_from_immudb = NullPackage
-        pkg_from_pkg = rpm_collector.collect_package_from_file(self.config.rpm_package)
 
         pkg_merged = pkg_from_immudb.merge(pkg_from_pkg)
         return pkg_merged
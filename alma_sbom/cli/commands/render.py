@@ -0,0 +1,44 @@
+from logging import getLogger
+from typing import Callable, ClassVar
+
+from alma_sbom.cli.config import CommonConfig, RenderConfig
+from alma_sbom.cli.factory import DocumentFactory
+from alma_sbom.data.snapshot import Collected, get_kind, read_snapshot
+from alma_sbom.profiling import stage
+
+from .commands import SubCommand
+
+_logger = getLogger(__name__)
+
+class RenderCommand(SubCommand):
+    CONFIG_CLASS : ClassVar[type[CommonConfig]] = RenderConfig
+    config: RenderConfig
+
+    ### kind of snapshot -> method of DocumentFactory
+    GENERATORS: ClassVar[dict[str, Callable]] = {
+        'package': DocumentFactory.gen_from_package,
+        'build': DocumentFactory.gen_from_build,
+        'iso': DocumentFactory.gen_from_iso,
+    }
+
+    def run(self) -> int:
+        collected = self.runner()
+        return self._write_documents(self.GENERATORS[get_kind(collected)], collected)
+
+    def _select_runner(self) -> None:
+        if self.config.snapshot:
+            self.runner = self._runner_with_snapshot
+        else:
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                'Required info to render SBOM has not been provided.'
+            )
+
+    def _runner_with_snapshot(self) -> Collected:
+        ### NOTE:
+        # Packages are read while the streaming document is written, so
+        # they are never held in memory all at once. Several formats are
+        # rendered from the same packages, so they are read beforehand then.
+        stream = self.config.stream and len(self.document_factories) == 1
+        with stage('snapshot'):
+            return read_snapshot(self.config.snapshot, stream=stream)
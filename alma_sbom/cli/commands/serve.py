@@ -0,0 +1,278 @@
+import argparse
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from logging import getLogger
+from pathlib import Path
+from typing import ClassVar, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from alma_sbom.cli.config import CommonConfig, ServeConfig, BatchTarget
+from alma_sbom.cli.factory import CollectorFactory
+from alma_sbom.type import SbomType, SbomRecordType, SbomFileFormatType
+
+from .commands import SubCommand
+from .package import PackageCommand
+from .build import BuildCommand
+
+_logger = getLogger(__name__)
+
+class ServeCommand(SubCommand):
+    CONFIG_CLASS : ClassVar[type[CommonConfig]] = ServeConfig
+    config: ServeConfig
+
+    ### request path -> (subcommand, query parameter giving the object)
+    ROUTES: ClassVar[dict[str, tuple[str, str]]] = {
+        '/package': ('package', 'rpm_package_hash'),
+        '/build': ('build', 'build_id'),
+    }
+    TARGET_COMMAND_CLASSES: ClassVar[dict[str, type[SubCommand]]] = {
+        'package': PackageCommand,
+        'build': BuildCommand,
+    }
+    CONTENT_TYPES: ClassVar[dict[SbomFileFormatType, str]] = {
+        SbomFileFormatType.JSON: 'application/json',
+        SbomFileFormatType.XML: 'application/xml',
+        SbomFileFormatType.YAML: 'application/yaml',
+        SbomFileFormatType.TAGVALUE: 'text/plain',
+        SbomFileFormatType.RDF: 'application/rdf+xml',
+    }
+
+    def __init__(self, config: ServeConfig, collector_factory: CollectorFactory = None) -> None:
+        super().__init__(config, collector_factory)
+        self._documents = DocumentCache(self.config.document_cache_size)
+        self._base = replace(self.config.get_base(), jobs=1)
+
+    def run(self) -> int:
+        self._warm_up()
+        with self.runner() as server:
+            _logger.info(f'Serving SBOMs on {self._address_str()}')
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                _logger.info('Interrupted, shutting down')
+            finally:
+                if self.config.unix_socket:
+                    server.remove_socket()
+        return 0
+
+    def _select_runner(self) -> None:
+        if self.config.unix_socket:
+            self.runner = self._gen_unix_server
+        elif self.config.host:
+            self.runner = self._gen_http_server
+        else:
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                'Required info to serve SBOMs has not been provided.'
+            )
+
+    def _gen_http_server(self) -> '_PooledHTTPServer':
+        return _PooledHTTPServer(
+            (self.config.host, self.config.port),
+            _SbomRequestHandler,
+            command=self,
+        )
+
+    def _gen_unix_server(self) -> '_PooledUnixServer':
+        ### a socket left by a previous run would make bind() fail
+        if self.config.unix_socket.is_socket():
+            _remove_stale_socket(self.config.unix_socket)
+        elif self.config.unix_socket.exists():
+            raise FileExistsError(f"File '{self.config.unix_socket}' exists and is not a unix socket")
+        return _PooledUnixServer(
+            str(self.config.unix_socket),
+            _SbomRequestHandler,
+            command=self,
+        )
+
+    def _address_str(self) -> str:
+        if self.config.unix_socket:
+            return f'unix:{self.config.unix_socket}'
+        return f'http://{self.config.host}:{self.config.port}'
+
+    def _warm_up(self) -> None:
+        """Load what every request needs before the first one comes"""
+        from alma_sbom.formats import document_factory
+        from alma_sbom.data.collectors.licenses import get_licensing
+
+        for record_type in SbomRecordType:
+            document_factory(record_type, stream=self.config.stream)
+        get_licensing()
+        self.collector_factory.get_immudb_cache()
+        self.collector_factory.get_notarized_filter()
+        self.collector_factory.get_albs_cache()
+        self.collector_factory.get_albs_session()
+
+    def generate(self, path: str, query: dict[str, str]) -> tuple[bytes, str]:
+        """Return the rendered document and its content type for a request.
+
+        Raises KeyError for unknown paths and ValueError for bad queries.
+        """
+        command_name, object_key = self.ROUTES[path]
+        if object_key not in query:
+            raise ValueError(f'{object_key} must be specified')
+        file_format = query.get('file_format')
+        sbom_type = SbomType.from_str(file_format) if file_format else self._base.sbom_type
+        content_type = self.CONTENT_TYPES[sbom_type.file_format_type]
+
+        key = (command_name, query[object_key], repr(sbom_type))
+        document = self._documents.get(key)
+        if document is not None:
+            _logger.debug(f'Serving {key} from the document cache')
+            return document, content_type
+
+        with tempfile.TemporaryDirectory(prefix='alma-sbom-') as tmp_dir:
+            target = BatchTarget.from_dict({
+                object_key: query[object_key],
+                'output_file': Path(tmp_dir, 'sbom'),
+                'file_format': file_format,
+            })
+            command_class = self.TARGET_COMMAND_CLASSES[target.command]
+            command = command_class(target.to_config(self._base), self.collector_factory)
+            if command.run() != 0:
+                raise RuntimeError(f'Invalid document has been generated for {key}')
+            document = target.output_file.read_bytes()
+
+        if command.is_final():
+            self._documents.put(key, document)
+        else:
+            _logger.debug(f'Not caching {key}, which may change')
+        return document, content_type
+
+class DocumentCache:
+    """LRU of rendered documents shared by the request handlers"""
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._documents: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+            return document
+
+    def put(self, key: tuple, document: bytes) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+class _PooledServerMixIn:
+    """Handle requests on a fixed pool of config.jobs threads.
+
+    Unlike socketserver.ThreadingMixIn, the threads live as long as the
+    server, so the collectors owned by each thread (the immudb connection
+    and the rpm TransactionSet) are reused by the following requests.
+    """
+    command: ServeCommand
+    executor: ThreadPoolExecutor
+
+    def __init__(self, *args, command: ServeCommand, **kwargs) -> None:
+        self.command = command
+        self.executor = ThreadPoolExecutor(
+            max_workers=command.config.jobs,
+            thread_name_prefix='alma-sbom-serve',
+        )
+        super().__init__(*args, **kwargs)
+
+    def process_request(self, request, client_address) -> None:
+        self.executor.submit(self._process_request_in_worker, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+class _PooledHTTPServer(_PooledServerMixIn, HTTPServer):
+    pass
+
+class _PooledUnixServer(_PooledServerMixIn, socketserver.UnixStreamServer):
+    bound_stat: os.stat_result
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        self.bound_stat = os.lstat(self.server_address)
+
+    def remove_socket(self) -> None:
+        """Remove the socket file, unless it has been replaced since this server bound it"""
+        try:
+            st = os.lstat(self.server_address)
+        except FileNotFoundError:
+            return
+        if stat.S_ISSOCK(st.st_mode) and _file_id(st) == _file_id(self.bound_stat):
+            os.unlink(self.server_address)
+
+def _file_id(st: os.stat_result) -> tuple[int, int, int]:
+    ### inode numbers are reused at once on some file systems such as tmpfs
+    return st.st_dev, st.st_ino, st.st_ctime_ns
+
+def _remove_stale_socket(path: Path) -> None:
+    """Remove a socket nobody listens on any more, raise if a server still does"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except ConnectionRefusedError:
+            _logger.debug(f'Removing the stale socket {path}')
+            path.unlink(missing_ok=True)
+            return
+    raise FileExistsError(f"Socket '{path}' is used by another server")
+
+class _SbomRequestHandler(BaseHTTPRequestHandler):
+    server: _PooledServerMixIn
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            document, content_type = self.server.command.generate(url.path, query)
+        except KeyError as e:
+            self._send_error(HTTPStatus.NOT_FOUND, str(e))
+        except (ValueError, argparse.ArgumentTypeError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            _logger.error(f'Failed to serve {self.path}: {e}')
+            _logger.debug('Traceback of the failure', exc_info=True)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+        else:
+            self._send_body(HTTPStatus.OK, content_type, document)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_body(status, 'text/plain', f'{message}\n'.encode())
+
+    def _send_body(self, status: HTTPStatus, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        ### client_address of a unix socket is an empty string
+        return str(self.client_address[0]) if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        _logger.debug(f'{self.address_string()} - {format % args}')
@@ -5,6 +5,12 @@ from .commands import (
     PackageConfig,
     BuildConfig,
     IsoConfig,
+    BatchConfig,
+    BatchTarget,
+    ServeConfig,
+    CollectConfig,
+    RenderConfig,
+    NotarizedFilterConfig,
     setup_subparsers,
 )
 
@@ -5,11 +5,21 @@ from alma_sbom.cli.config import CommonConfig
 from .package import PackageConfig
 from .build import BuildConfig
 from .iso import IsoConfig
+from .batch import BatchConfig, BatchTarget
+from .serve import ServeConfig
+from .collect import CollectConfig
+from .render import RenderConfig
+from .notarized_filter import NotarizedFilterConfig
 
 subconfig_classes: dict[str, type[CommonConfig]] = {
     'package': PackageConfig,
     'build': BuildConfig,
     'iso': IsoConfig,
+    'batch': BatchConfig,
+    'serve': ServeConfig,
+    'collect': CollectConfig,
+    'render': RenderConfig,
+    'notarized-filter': NotarizedFilterConfig,
 }
 
 def setup_subparsers(subparsers: argparse._SubParsersAction) -> None:
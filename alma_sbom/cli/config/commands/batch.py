@@ -0,0 +1,151 @@
+import argparse
+import csv
+import json
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from alma_sbom.cli.config import CommonConfig
+from alma_sbom.type import SbomType
+
+from .package import PackageConfig
+from .build import BuildConfig
+from .iso import IsoConfig
+
+@dataclass
+class BatchTarget:
+    """One line of a batch manifest"""
+    ### Keys of a manifest, exactly one of the object keys must be given
+    OBJECT_KEYS: ClassVar[tuple[str, ...]] = ('rpm_package_hash', 'rpm_package', 'build_id', 'iso_image')
+    OPTION_KEYS: ClassVar[tuple[str, ...]] = ('output_file', 'file_format')
+
+    output_file: Path
+    file_format: Optional[str] = None
+    rpm_package_hash: Optional[str] = None
+    rpm_package: Optional[Path] = None
+    build_id: Optional[str] = None
+    iso_image: Optional[Path] = None
+
+    @classmethod
+    def from_dict(cls, record: dict) -> 'BatchTarget':
+        ### empty CSV cells are treated as absent
+        record = {key: value for key, value in record.items() if value not in (None, '')}
+        unknown_keys = set(record) - set(cls.OBJECT_KEYS) - set(cls.OPTION_KEYS)
+        if unknown_keys:
+            raise ValueError(f'Unknown keys in manifest: {sorted(unknown_keys)}')
+        object_keys = [key for key in cls.OBJECT_KEYS if key in record]
+        if len(object_keys) != 1:
+            raise ValueError(f'Exactly one of {", ".join(cls.OBJECT_KEYS)} must be specified')
+        if 'output_file' not in record:
+            raise ValueError('output_file must be specified')
+        return cls(
+            output_file=Path(record['output_file']),
+            file_format=record.get('file_format'),
+            rpm_package_hash=record.get('rpm_package_hash'),
+            rpm_package=record.get('rpm_package') and Path(record['rpm_package']),
+            build_id=record.get('build_id') and str(record['build_id']),
+            iso_image=record.get('iso_image') and Path(record['iso_image']),
+        )
+
+    @property
+    def command(self) -> str:
+        if self.rpm_package_hash or self.rpm_package:
+            return 'package'
+        if self.build_id:
+            return 'build'
+        return 'iso'
+
+    def to_config(self, base: CommonConfig) -> CommonConfig:
+        """Return the config of the subcommand which generates this target"""
+        base = replace(
+            base,
+            output_file=self.output_file,
+            sbom_type=SbomType.from_str(self.file_format) if self.file_format else base.sbom_type,
+            formats=(),
+        )
+        if self.command == 'package':
+            return PackageConfig.from_base(base, self.rpm_package_hash, self.rpm_package)
+        if self.command == 'build':
+            return BuildConfig.from_base(base, self.build_id)
+        return IsoConfig.from_base(base, self.iso_image)
+
+@dataclass
+class BatchConfig(CommonConfig):
+    MANIFEST_FORMATS: ClassVar[tuple[str, ...]] = ('jsonl', 'csv')
+
+    manifest: Path = None
+    ### jsonl or csv, guessed from the suffix of manifest if not given
+    manifest_format: str = None
+
+    def __post_init__(self) -> None:
+        self._validate()
+        super().__post_init__()
+
+    def _validate(self) -> None:
+        if not self.manifest:
+            raise ValueError(
+                'Unexpected situation has occurred. '
+                'manifest must not be empty'
+            )
+        if not self.manifest.exists():
+            raise FileNotFoundError(f"File '{self.manifest}' not found")
+        if self.manifest_format is None:
+            self.manifest_format = 'csv' if self.manifest.suffix == '.csv' else 'jsonl'
+        if self.manifest_format not in self.MANIFEST_FORMATS:
+            raise ValueError(f'Unsupported manifest format: {self.manifest_format}')
+
+    @classmethod
+    def from_base(cls, base: CommonConfig, manifest: Path, manifest_format: str = None) -> 'BatchConfig':
+        base_fields = vars(base)
+        return cls(**base_fields, manifest=manifest, manifest_format=manifest_format)
+
+    @classmethod
+    def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'BatchConfig':
+        return cls.from_base(
+            base,
+            manifest=Path(args.manifest),
+            manifest_format=args.manifest_format,
+        )
+
+    def read_manifest(self) -> list[BatchTarget]:
+        with open(self.manifest, newline='') as fd:
+            if self.manifest_format == 'csv':
+                records = list(csv.DictReader(fd))
+            else:
+                records = [json.loads(line) for line in fd if line.strip()]
+
+        targets = []
+        for num, record in enumerate(records, start=1):
+            try:
+                targets.append(BatchTarget.from_dict(record))
+            except ValueError as e:
+                raise ValueError(f'Invalid target #{num} in {self.manifest}: {e}') from e
+        return targets
+
+    @staticmethod
+    def add_arguments(parser: argparse._SubParsersAction) -> None:
+        batch_parser = parser.add_parser(
+            'batch',
+            help='Generate SBOMs of the targets listed in a manifest',
+        )
+        batch_parser.add_argument(
+            '--manifest',
+            type=str,
+            help=(
+                'Path to a manifest of targets in JSON lines or CSV. Each '
+                'target has one of rpm_package_hash, rpm_package, build_id '
+                'or iso_image, output_file and optionally file_format'
+            ),
+            required=True,
+        )
+        batch_parser.add_argument(
+            '--manifest-format',
+            choices=BatchConfig.MANIFEST_FORMATS,
+            type=str,
+            help=(
+                'Format of the manifest, guessed from its suffix if not '
+                'specified (.csv is csv, otherwise jsonl)'
+            ),
+            required=False,
+            default=None,
+        )
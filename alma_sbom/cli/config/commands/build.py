@@ -1,39 +1,168 @@
 import argparse
 from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import ClassVar, Optional
 
 from alma_sbom.cli.config import CommonConfig
+from alma_sbom.compact import fromisoformat_utc, to_naive_utc
 
 @dataclass
 class BuildConfig(CommonConfig):
+    ### placeholders of output_template are build_id, record_type and file_format
+    DEF_OUTPUT_TEMPLATE: ClassVar[str] = 'build-{build_id}.{record_type}.{file_format}'
+
+    ### a single build, written to output_file
     build_id: str = None
 
+    ### several builds, each written to output_dir
+    ### ids or ranges of ids such as 12000-12500
+    build_ids: tuple[str, ...] = ()
+    ### builds created in [created_after, created_before), in naive UTC
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    output_dir: Optional[Path] = None
+    output_template: str = DEF_OUTPUT_TEMPLATE
+
     def __post_init__(self) -> None:
+        if self.created_after is not None:
+            self.created_after = to_naive_utc(self.created_after)
+        if self.created_before is not None:
+            self.created_before = to_naive_utc(self.created_before)
         self._validate()
         super().__post_init__()
 
     def _validate(self) -> None:
-        if not self.build_id:
+        if sum([bool(self.build_id), bool(self.build_ids), self.created_after is not None]) != 1:
             raise ValueError(
-                'Unexpected situation has occurred'
-                'build_id must not be empty'
+                'Unexpected situation has occurred. '
+                'Exactly one of build_id, build_ids and created_after must be specified'
+            )
+        if self.created_before is not None and self.created_after is None:
+            raise ValueError('created_before must be specified with created_after')
+        if not self.is_multi():
+            return
+        if not self.output_dir:
+            raise ValueError('output_dir must be specified to generate SBOMs of several builds')
+        if self.formats:
+            raise ValueError('formats cannot be used to generate SBOMs of several builds')
+        self.get_output_file('0')
+        self.parse_build_ids(self.build_ids)
+
+    def is_multi(self) -> bool:
+        """Return whether SBOMs of several builds are generated into output_dir"""
+        return not self.build_id
+
+    def get_output_file(self, build_id: str) -> Path:
+        """Return the output file of build_id in output_dir"""
+        try:
+            file_name = self.output_template.format(
+                build_id=build_id,
+                record_type=self.sbom_type.record_type.value,
+                file_format=self.sbom_type.file_format_type.value,
             )
+        except (KeyError, IndexError) as e:
+            raise ValueError(f'Invalid output template: {self.output_template}') from e
+        return self.output_dir / file_name
+
+    @staticmethod
+    def parse_build_ids(build_ids: tuple[str, ...]) -> list[str]:
+        """Expand ranges such as 12000-12500 (both ends included) into build ids"""
+        expanded = {}
+        for build_id in build_ids:
+            first, sep, last = build_id.partition('-')
+            if not first.isdigit() or (sep and not last.isdigit()):
+                raise ValueError(f'Invalid build id or range of build ids: {build_id}')
+            if not sep:
+                expanded[str(int(first))] = None
+                continue
+            if int(first) > int(last):
+                raise ValueError(f'Invalid range of build ids: {build_id}')
+            expanded.update(dict.fromkeys(str(num) for num in range(int(first), int(last) + 1)))
+        return list(expanded)
 
     @classmethod
-    def from_base(cls, base: CommonConfig, build_id: str) -> 'BuildConfig':
+    def from_base(
+        cls,
+        base: CommonConfig,
+        build_id: str = None,
+        build_ids: tuple[str, ...] = (),
+        created_after: datetime = None,
+        created_before: datetime = None,
+        output_dir: Path = None,
+        output_template: str = DEF_OUTPUT_TEMPLATE,
+    ) -> 'BuildConfig':
         base_fields = vars(base)
-        return cls(**base_fields, build_id=build_id)
+        return cls(
+            **base_fields,
+            build_id=build_id,
+            build_ids=build_ids,
+            created_after=created_after,
+            created_before=created_before,
+            output_dir=output_dir,
+            output_template=output_template,
+        )
 
     @classmethod
     def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'BuildConfig':
-        return cls.from_base(base, build_id=args.build_id)
+        build_ids = args.build_id or []
+        ### a single build id without output_dir is written to output_file as before
+        if len(build_ids) == 1 and '-' not in build_ids[0] and not args.output_dir:
+            return cls.from_base(base, build_id=build_ids[0])
+        return cls.from_base(
+            base,
+            build_ids=tuple(build_ids),
+            created_after=args.created_after,
+            created_before=args.created_before,
+            output_dir=args.output_dir and Path(args.output_dir),
+            output_template=args.output_template,
+        )
 
     @staticmethod
     def add_arguments(parser: argparse._SubParsersAction) -> None:
         build_parser = parser.add_parser('build', help='Generate build SBOM')
-        build_parser.add_argument(
+        target_group = build_parser.add_mutually_exclusive_group(required=True)
+        target_group.add_argument(
             '--build-id',
             type=str,
-            help='SHA256 hash of an RPM package',
-            required=True,
+            nargs='+',
+            metavar='ID|FIRST-LAST',
+            help=(
+                'ID of an ALBS build. Several IDs and ranges of IDs such as '
+                '12000-12500 generate an SBOM of each build into --output-dir'
+            ),
+        )
+        target_group.add_argument(
+            '--created-after',
+            type=fromisoformat_utc,
+            help=(
+                'Generate an SBOM of each build created at or after this '
+                'date (e.g. 2024-04-01 or 2024-04-01T09:00+09:00, UTC unless '
+                'an offset is given) into --output-dir'
+            ),
+        )
+        build_parser.add_argument(
+            '--created-before',
+            type=fromisoformat_utc,
+            help='With --created-after, only builds created before this date',
+            required=False,
+            default=None,
+        )
+        build_parser.add_argument(
+            '--output-dir',
+            type=str,
+            help='Directory of the SBOMs of several builds',
+            required=False,
+            default=None,
+        )
+        build_parser.add_argument(
+            '--output-template',
+            type=str,
+            help=(
+                'File name of each SBOM in --output-dir, where {build_id}, '
+                '{record_type} and {file_format} are replaced '
+                '(default: %(default)s)'
+            ),
+            required=False,
+            default=BuildConfig.DEF_OUTPUT_TEMPLATE,
         )
-
@@ -0,0 +1,62 @@
+import argparse
+from dataclasses import dataclass
+from typing import ClassVar
+
+from alma_sbom.cli.config import CommonConfig
+
+from .package import PackageConfig
+from .build import BuildConfig
+from .iso import IsoConfig
+
+@dataclass
+class CollectConfig(CommonConfig):
+    TARGET_CONFIG_CLASSES: ClassVar[dict[str, type[CommonConfig]]] = {
+        'package': PackageConfig,
+        'build': BuildConfig,
+        'iso': IsoConfig,
+    }
+
+    ### subcommand whose data is collected, and its config
+    target_command: str = None
+    target: CommonConfig = None
+
+    def __post_init__(self) -> None:
+        self._validate()
+        super().__post_init__()
+
+    def _validate(self) -> None:
+        if self.target_command not in self.TARGET_CONFIG_CLASSES or self.target is None:
+            raise ValueError(
+                'Unexpected situation has occurred. '
+                f'Unknown target of collect: {self.target_command}'
+            )
+        if isinstance(self.target, BuildConfig) and self.target.is_multi():
+            raise ValueError('A snapshot is collected from a single build')
+
+    @classmethod
+    def from_base(cls, base: CommonConfig, target_command: str, target: CommonConfig) -> 'CollectConfig':
+        base_fields = vars(base)
+        return cls(**base_fields, target_command=target_command, target=target)
+
+    @classmethod
+    def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'CollectConfig':
+        target_config_class = cls.TARGET_CONFIG_CLASSES[args.target_command]
+        return cls.from_base(
+            base,
+            target_command=args.target_command,
+            target=target_config_class.from_base_args(base, args),
+        )
+
+    @staticmethod
+    def add_arguments(parser: argparse._SubParsersAction) -> None:
+        collect_parser = parser.add_parser(
+            'collect',
+            help=(
+                'Collect data of a package, build or ISO image and write it '
+                'to --output-file as a snapshot, which the render subcommand '
+                'generates SBOMs from'
+            ),
+        )
+        target_subparsers = collect_parser.add_subparsers(dest='target_command', required=True)
+        for target_config_class in CollectConfig.TARGET_CONFIG_CLASSES.values():
+            target_config_class.add_arguments(target_subparsers)
@@ -7,6 +7,9 @@ from alma_sbom.cli.config import CommonConfig
 @dataclass
 class IsoConfig(CommonConfig):
     iso_image: Path = None
+    zero_copy: bool = False
+    repodata: bool = False
+    verify_checksums: int = 0
 
     def __post_init__(self) -> None:
         self._validate()
@@ -18,15 +21,38 @@ class IsoConfig(CommonConfig):
                 'Unexpected situation has occurred'
                 'iso_image must not be empty'
             )
+        if self.verify_checksums and not self.repodata:
+            raise ValueError('verify_checksums can only be used with repodata')
+        if self.verify_checksums < 0:
+            raise ValueError(f'verify_checksums must not be negative: {self.verify_checksums}')
 
     @classmethod
-    def from_base(cls, base: CommonConfig, iso_image: Path) -> 'BuildConfig':
+    def from_base(
+        cls,
+        base: CommonConfig,
+        iso_image: Path,
+        zero_copy: bool = False,
+        repodata: bool = False,
+        verify_checksums: int = 0,
+    ) -> 'BuildConfig':
         base_fields = vars(base)
-        return cls(**base_fields, iso_image=iso_image)
+        return cls(
+            **base_fields,
+            iso_image=iso_image,
+            zero_copy=zero_copy,
+            repodata=repodata,
+            verify_checksums=verify_checksums,
+        )
 
     @classmethod
     def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'BuildConfig':
-        return cls.from_base(base, iso_image=Path(args.iso_image))
+        return cls.from_base(
+            base,
+            iso_image=Path(args.iso_image),
+            zero_copy=args.zero_copy,
+            repodata=args.repodata,
+            verify_checksums=args.verify_checksums,
+        )
 
     @staticmethod
     def add_arguments(parser: argparse._SubParsersAction) -> None:
@@ -37,3 +63,31 @@ class IsoConfig(CommonConfig):
             help='Path to AlmaLinux installer ISO9660 image',
             required=True,
         )
+        build_parser.add_argument(
+            '--zero-copy',
+            help=(
+                'Read packages directly from their extents in the mapped ISO '
+                'image instead of extracting each of them first'
+            ),
+            required=False,
+            action='store_true',
+        )
+        build_parser.add_argument(
+            '--repodata',
+            help=(
+                'Make the package list from the repodata in the ISO image '
+                'instead of reading every package'
+            ),
+            required=False,
+            action='store_true',
+        )
+        build_parser.add_argument(
+            '--verify-checksums',
+            type=int,
+            help=(
+                'Number of randomly chosen packages whose checksums are '
+                'verified against the repodata (default: %(default)s)'
+            ),
+            required=False,
+            default=0,
+        )
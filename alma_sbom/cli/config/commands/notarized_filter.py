@@ -0,0 +1,73 @@
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar
+
+from alma_sbom.cli.config import CommonConfig
+
+@dataclass
+class NotarizedFilterConfig(CommonConfig):
+    DEF_FALSE_POSITIVE_RATE: ClassVar[float] = 0.001
+
+    ### text file of notarized hashes, one in each line
+    hashes: Path = None
+    false_positive_rate: float = DEF_FALSE_POSITIVE_RATE
+
+    def __post_init__(self) -> None:
+        self._validate()
+        super().__post_init__()
+
+    def _validate(self) -> None:
+        if not self.hashes:
+            raise ValueError(
+                'Unexpected situation has occurred. '
+                'hashes must not be empty'
+            )
+        if not self.hashes.exists():
+            raise FileNotFoundError(f"File '{self.hashes}' not found")
+        if not 0 < self.false_positive_rate < 1:
+            raise ValueError(f'false_positive_rate must be between 0 and 1: {self.false_positive_rate}')
+
+    @classmethod
+    def from_base(
+        cls,
+        base: CommonConfig,
+        hashes: Path,
+        false_positive_rate: float = DEF_FALSE_POSITIVE_RATE,
+    ) -> 'NotarizedFilterConfig':
+        base_fields = vars(base)
+        return cls(**base_fields, hashes=hashes, false_positive_rate=false_positive_rate)
+
+    @classmethod
+    def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'NotarizedFilterConfig':
+        return cls.from_base(
+            base,
+            hashes=Path(args.hashes),
+            false_positive_rate=args.false_positive_rate,
+        )
+
+    @staticmethod
+    def add_arguments(parser: argparse._SubParsersAction) -> None:
+        filter_parser = parser.add_parser(
+            'notarized-filter',
+            help=(
+                'Make a Bloom filter of notarized hashes for --notarized-filter '
+                'and write it to --output-file'
+            ),
+        )
+        filter_parser.add_argument(
+            '--hashes',
+            type=str,
+            help='Path to a text file of notarized hashes, one in each line',
+            required=True,
+        )
+        filter_parser.add_argument(
+            '--false-positive-rate',
+            type=float,
+            help=(
+                'Rate of absent hashes which are still looked up in immudb '
+                '(default: %(default)s)'
+            ),
+            required=False,
+            default=NotarizedFilterConfig.DEF_FALSE_POSITIVE_RATE,
+        )
@@ -0,0 +1,47 @@
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+
+from alma_sbom.cli.config import CommonConfig
+
+@dataclass
+class RenderConfig(CommonConfig):
+    snapshot: Path = None
+
+    def __post_init__(self) -> None:
+        self._validate()
+        super().__post_init__()
+
+    def _validate(self) -> None:
+        if not self.snapshot:
+            raise ValueError(
+                'Unexpected situation has occurred. '
+                'snapshot must not be empty'
+            )
+        if not self.snapshot.exists():
+            raise FileNotFoundError(f"File '{self.snapshot}' not found")
+
+    @classmethod
+    def from_base(cls, base: CommonConfig, snapshot: Path) -> 'RenderConfig':
+        base_fields = vars(base)
+        return cls(**base_fields, snapshot=snapshot)
+
+    @classmethod
+    def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'RenderConfig':
+        return cls.from_base(base, snapshot=Path(args.snapshot))
+
+    @staticmethod
+    def add_arguments(parser: argparse._SubParsersAction) -> None:
+        render_parser = parser.add_parser(
+            'render',
+            help='Generate SBOM from a snapshot written by the collect subcommand',
+        )
+        render_parser.add_argument(
+            '--snapshot',
+            type=str,
+            help=(
+                'Path to a snapshot. Nothing is read from immudb, ALBS or '
+                'ISO images'
+            ),
+            required=True,
+        )
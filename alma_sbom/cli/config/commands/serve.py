@@ -0,0 +1,97 @@
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from alma_sbom.cli.config import CommonConfig
+
+@dataclass
+class ServeConfig(CommonConfig):
+    DEF_HOST: ClassVar[str] = '127.0.0.1'
+    DEF_PORT: ClassVar[int] = 8880
+    DEF_DOCUMENT_CACHE_SIZE: ClassVar[int] = 256
+
+    host: str = DEF_HOST
+    port: int = DEF_PORT
+    ### listen on this unix socket instead of host and port if given
+    unix_socket: Optional[Path] = None
+    ### max number of rendered documents kept in memory
+    document_cache_size: int = DEF_DOCUMENT_CACHE_SIZE
+
+    def __post_init__(self) -> None:
+        self._validate()
+        super().__post_init__()
+
+    def _validate(self) -> None:
+        if not 0 <= self.port <= 65535:
+            raise ValueError(f'Invalid port number: {self.port}')
+        if self.document_cache_size < 0:
+            raise ValueError(f'document_cache_size must not be negative: {self.document_cache_size}')
+        if self.unix_socket and self.unix_socket.exists() and not self.unix_socket.is_socket():
+            raise FileExistsError(f"File '{self.unix_socket}' exists and is not a unix socket")
+
+    @classmethod
+    def from_base(
+        cls,
+        base: CommonConfig,
+        host: str = DEF_HOST,
+        port: int = DEF_PORT,
+        unix_socket: Optional[Path] = None,
+        document_cache_size: int = DEF_DOCUMENT_CACHE_SIZE,
+    ) -> 'ServeConfig':
+        base_fields = vars(base)
+        return cls(
+            **base_fields,
+            host=host,
+            port=port,
+            unix_socket=unix_socket,
+            document_cache_size=document_cache_size,
+        )
+
+    @classmethod
+    def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'ServeConfig':
+        return cls.from_base(
+            base,
+            host=args.host,
+            port=args.port,
+            unix_socket=args.unix_socket and Path(args.unix_socket),
+            document_cache_size=args.document_cache_size,
+        )
+
+    @staticmethod
+    def add_arguments(parser: argparse._SubParsersAction) -> None:
+        serve_parser = parser.add_parser(
+            'serve',
+            help='Run a local service which generates SBOMs on request',
+        )
+        serve_parser.add_argument(
+            '--host',
+            type=str,
+            help='Address to listen on (default: %(default)s)',
+            required=False,
+            default=ServeConfig.DEF_HOST,
+        )
+        serve_parser.add_argument(
+            '--port',
+            type=int,
+            help='Port to listen on (default: %(default)s)',
+            required=False,
+            default=ServeConfig.DEF_PORT,
+        )
+        serve_parser.add_argument(
+            '--unix-socket',
+            type=str,
+            help='Path of a unix socket to listen on instead of host and port',
+            required=False,
+            default=None,
+        )
+        serve_parser.add_argument(
+            '--document-cache-size',
+            type=int,
+            help=(
+                'Number of rendered documents kept in memory to serve '
+                'repeated requests, 0 disables it (default: %(default)s)'
+            ),
+            required=False,
+            default=ServeConfig.DEF_DOCUMENT_CACHE_SIZE,
+        )
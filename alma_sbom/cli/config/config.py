@@ -1,31 +1,72 @@
 import argparse
 import os
-from dataclasses import dataclass
-from typing import Union, ClassVar
+from dataclasses import dataclass, fields, replace
+from typing import Union, ClassVar, Optional
 from logging import getLogger
 from pathlib import Path
-from immudb_wrapper import ImmudbWrapper
 
-from alma_sbom.type import SbomType
+from alma_sbom.type import SbomType, ValidationMode
 
 _logger = getLogger(__name__)
 
+class _ImmudbDefault:
+    """Default of an immudb setting, resolved on first access.
+
+    The environment variable takes precedence. Otherwise the value comes from
+    ImmudbWrapper, which is imported only at that point, so parsing arguments
+    does not need to load immudb_wrapper.
+    """
+    env: str
+    wrapper_method: Optional[str]
+
+    def __init__(self, env: str, wrapper_method: Optional[str] = None) -> None:
+        self.env = env
+        self.wrapper_method = wrapper_method
+        self._resolved = False
+        self._value = None
+
+    def __get__(self, instance, owner) -> Optional[str]:
+        if not self._resolved:
+            value = os.getenv(self.env)
+            if not value and self.wrapper_method:
+                from immudb_wrapper import ImmudbWrapper
+                value = getattr(ImmudbWrapper, self.wrapper_method)()
+            self._value = value
+            self._resolved = True
+        return self._value
+
 @dataclass
 class CommonConfig:
     ### output related defaults ###
     DEF_OUTPUT: ClassVar[str] = '/dev/stdout'
     DEF_SBOM_TYPE: ClassVar[SbomType] = SbomType()
     DEF_SBOM_TYPE_STR: ClassVar[str] = str(SbomType())
+    DEF_VALIDATION: ClassVar[str] = ValidationMode.FULL.value
 
     ### ALBS defaults ###
     DEF_ALBS_URL: ClassVar[str] = 'https://build.almalinux.org'
 
     ### immudb defaults ###
-    DEF_IMMUDB_USERNAME: ClassVar[str] = os.getenv('IMMUDB_USERNAME') or ImmudbWrapper.read_only_username()
-    DEF_IMMUDB_PASSWORD: ClassVar[str] = os.getenv('IMMUDB_PASSWORD') or ImmudbWrapper.read_only_password()
-    DEF_IMMUDB_DATABASE: ClassVar[str] = os.getenv('IMMUDB_DATABASE') or ImmudbWrapper.almalinux_database_name()
-    DEF_IMMUDB_ADDRESS: ClassVar[str] = os.getenv('IMMUDB_ADDRESS') or ImmudbWrapper.almalinux_database_address()
-    DEF_IMMUDB_PUBLIC_KEY_FILE: ClassVar[str] = os.getenv('IMMUDB_PUBLIC_KEY_FILE')
+    ### NOTE:
+    # These are not annotated, because dataclass reads every annotated class
+    # attribute, which would resolve them while the class is created.
+    DEF_IMMUDB_USERNAME = _ImmudbDefault('IMMUDB_USERNAME', 'read_only_username')
+    DEF_IMMUDB_PASSWORD = _ImmudbDefault('IMMUDB_PASSWORD', 'read_only_password')
+    DEF_IMMUDB_DATABASE = _ImmudbDefault('IMMUDB_DATABASE', 'almalinux_database_name')
+    DEF_IMMUDB_ADDRESS = _ImmudbDefault('IMMUDB_ADDRESS', 'almalinux_database_address')
+    DEF_IMMUDB_PUBLIC_KEY_FILE = _ImmudbDefault('IMMUDB_PUBLIC_KEY_FILE')
+
+    ### processing defaults ###
+    DEF_JOBS: ClassVar[int] = 1
+
+    ### cache defaults ###
+    DEF_CACHE_DIR: ClassVar[str] = os.path.join(
+        os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+        'alma-sbom',
+    )
+    DEF_CACHE_MAX_SIZE: ClassVar[int] = 512
+    DEF_NEGATIVE_CACHE_TTL: ClassVar[int] = 24
+    DEF_ALBS_CACHE_TTL: ClassVar[int] = 168
 
     ### output related settings ###
     output_file: Path
@@ -35,11 +76,35 @@ class CommonConfig:
     albs_url: str
 
     ### immudb settings ###
-    immudb_username: str
-    immudb_password: str
-    immudb_database: str
-    immudb_address: str
-    immudb_public_key_file: str
+    ### None means the default, which is resolved by get_immudb_*() methods.
+    immudb_username: Optional[str]
+    immudb_password: Optional[str]
+    immudb_database: Optional[str]
+    immudb_address: Optional[str]
+    immudb_public_key_file: Optional[str]
+
+    ### output related settings with defaults ###
+    ### pairs of an SBOM type and its output file, which replace
+    ### sbom_type and output_file if given
+    formats: tuple[tuple[SbomType, Path], ...] = ()
+    stream: bool = False
+    validation: ValidationMode = ValidationMode.FULL
+
+    ### processing settings ###
+    jobs: int = DEF_JOBS
+
+    ### cache settings ###
+    use_cache: bool = True
+    refresh_cache: bool = False
+    cache_dir: Path = Path(DEF_CACHE_DIR)
+    ### max size of each cache in MiB
+    cache_max_size: int = DEF_CACHE_MAX_SIZE
+    ### hours during which hashes absent from immudb are not looked up again
+    negative_cache_ttl: int = DEF_NEGATIVE_CACHE_TTL
+    ### hours during which finished builds are used without revalidation
+    albs_cache_ttl: int = DEF_ALBS_CACHE_TTL
+    ### Bloom filter of notarized hashes made by the notarized-filter subcommand
+    notarized_filter: Optional[Path] = None
 
     @classmethod
     def from_str(
@@ -54,6 +119,17 @@ class CommonConfig:
         sbom_type_str: str = None,
         sbom_record_type: str = None,
         sbom_file_format_type: str = None,
+        formats: str = None,
+        stream: bool = False,
+        validation: str = DEF_VALIDATION,
+        jobs: int = DEF_JOBS,
+        use_cache: bool = True,
+        refresh_cache: bool = False,
+        cache_dir: str = DEF_CACHE_DIR,
+        cache_max_size: int = DEF_CACHE_MAX_SIZE,
+        negative_cache_ttl: int = DEF_NEGATIVE_CACHE_TTL,
+        albs_cache_ttl: int = DEF_ALBS_CACHE_TTL,
+        notarized_filter: str = None,
     ) -> 'CommonConfig':
         if sbom_type_str:
             sbom_type = SbomType.from_str(sbom_type_str)
@@ -73,6 +149,17 @@ class CommonConfig:
             immudb_database,
             immudb_address,
             immudb_public_key_file,
+            formats=tuple(cls.parse_format_output(string) for string in formats.split(',')) if formats else (),
+            stream=stream,
+            validation=ValidationMode.from_str(validation),
+            jobs=jobs,
+            use_cache=use_cache,
+            refresh_cache=refresh_cache,
+            cache_dir=Path(cache_dir),
+            cache_max_size=cache_max_size,
+            negative_cache_ttl=negative_cache_ttl,
+            albs_cache_ttl=albs_cache_ttl,
+            notarized_filter=notarized_filter and Path(notarized_filter),
         )
 
     @classmethod
@@ -86,16 +173,88 @@ class CommonConfig:
             args.immudb_address,
             args.immudb_public_key_file,
             sbom_type_str = args.file_format,
+            formats = args.formats,
+            stream = args.stream,
+            validation = args.validation,
+            jobs = args.jobs,
+            use_cache = args.use_cache,
+            refresh_cache = args.refresh_cache,
+            cache_dir = args.cache_dir,
+            cache_max_size = args.cache_max_size,
+            negative_cache_ttl = args.negative_cache_ttl,
+            albs_cache_ttl = args.albs_cache_ttl,
+            notarized_filter = args.notarized_filter,
         )
 
     def __post_init__(self):
-        pass
+        if self.jobs < 1:
+            raise ValueError(f'jobs must be a positive integer: {self.jobs}')
+        if self.cache_max_size < 1:
+            raise ValueError(f'cache_max_size must be a positive integer: {self.cache_max_size}')
+        if self.negative_cache_ttl < 0:
+            raise ValueError(f'negative_cache_ttl must not be negative: {self.negative_cache_ttl}')
+        if self.albs_cache_ttl < 0:
+            raise ValueError(f'albs_cache_ttl must not be negative: {self.albs_cache_ttl}')
+        if self.notarized_filter and not self.notarized_filter.exists():
+            raise FileNotFoundError(f"File '{self.notarized_filter}' not found")
+        output_files = [output_file for _, output_file in self.formats]
+        if len(set(output_files)) != len(output_files):
+            raise ValueError(f'Each format must be written to a different file: {self.formats}')
+
+    @staticmethod
+    def parse_format_output(string: str) -> tuple[SbomType, Path]:
+        """Parse FORMAT=PATH of --formats"""
+        sbom_type_str, sep, output_file = string.partition('=')
+        if not sep or not output_file:
+            raise ValueError(f'Invalid format and output file: {string}. Use "record_type-file_format=path"')
+        return SbomType.from_str(sbom_type_str), Path(output_file)
+
+    @staticmethod
+    def parse_positive_int(string: str) -> int:
+        """Parse a positive integer argument such as --jobs"""
+        try:
+            value = int(string)
+        except ValueError:
+            value = 0
+        if value < 1:
+            raise argparse.ArgumentTypeError(f'must be a positive integer: {string}')
+        return value
+
+    def get_output_configs(self) -> list['CommonConfig']:
+        """Return a config of each output, which has a single sbom_type and output_file"""
+        if not self.formats:
+            return [self]
+        return [
+            replace(self, sbom_type=sbom_type, output_file=output_file, formats=())
+            for sbom_type, output_file in self.formats
+        ]
+
+    def get_base(self) -> 'CommonConfig':
+        """Return only the common options of this config, e.g. to make configs of other subcommands"""
+        return CommonConfig(**{f.name: getattr(self, f.name) for f in fields(CommonConfig)})
+
+    def get_immudb_username(self) -> str:
+        return self.immudb_username or self.DEF_IMMUDB_USERNAME
+
+    def get_immudb_password(self) -> str:
+        return self.immudb_password or self.DEF_IMMUDB_PASSWORD
+
+    def get_immudb_database(self) -> str:
+        return self.immudb_database or self.DEF_IMMUDB_DATABASE
+
+    def get_immudb_address(self) -> str:
+        return self.immudb_address or self.DEF_IMMUDB_ADDRESS
+
+    def get_immudb_public_key_file(self) -> Optional[str]:
+        return self.immudb_public_key_file or self.DEF_IMMUDB_PUBLIC_KEY_FILE
 
     @classmethod
     def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
         cls._add_output_arguments(parser)
         cls._add_albs_arguments(parser)
         cls._add_immudb_arguments(parser)
+        cls._add_processing_arguments(parser)
+        cls._add_cache_arguments(parser)
 
     @classmethod
     def _add_output_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -116,6 +275,45 @@ class CommonConfig:
             type=str,
             help='Generate SBOM in one of format mode (default: %(default)s)',
         )
+        parser.add_argument(
+            '--formats',
+            type=str,
+            metavar='FORMAT=PATH[,FORMAT=PATH...]',
+            help=(
+                'Generate SBOMs in several formats from a single collection, '
+                'each written to its own file, e.g. spdx-json=sbom.spdx.json,'
+                'cyclonedx-json=sbom.cdx.json. Formats are rendered in '
+                'parallel. Replaces --file-format and --output-file, and is '
+                'not used by the batch and serve subcommands'
+            ),
+            required=False,
+            default=None,
+        )
+        parser.add_argument(
+            '--stream',
+            help=(
+                'Write each component to the output file as soon as it is '
+                'generated, instead of building the whole document in memory. '
+                'Only JSON file formats are supported'
+            ),
+            required=False,
+            action='store_true',
+        )
+        parser.add_argument(
+            '--validate',
+            choices=ValidationMode.choices(),
+            type=str,
+            help=(
+                'How SPDX documents are validated. full: validate with '
+                'spdx-tools before writing, fast: validate the fields alma-sbom '
+                'generates in linear time, off: do not validate, async: '
+                'validate on a separate thread while writing '
+                '(default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_VALIDATION,
+            dest='validation',
+        )
 
     @classmethod
     def _add_albs_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -136,7 +334,7 @@ class CommonConfig:
                 'an environmental variable'
             ),
             required=False,
-            default=cls.DEF_IMMUDB_USERNAME
+            default=None,
         )
         parser.add_argument(
             '--immudb-password',
@@ -146,7 +344,7 @@ class CommonConfig:
                 'an environmental variable'
             ),
             required=False,
-            default=cls.DEF_IMMUDB_PASSWORD
+            default=None,
         )
         parser.add_argument(
             '--immudb-database',
@@ -156,7 +354,7 @@ class CommonConfig:
                 'an environmental variable'
             ),
             required=False,
-            default=cls.DEF_IMMUDB_DATABASE
+            default=None,
         )
         parser.add_argument(
             '--immudb-address',
@@ -166,7 +364,7 @@ class CommonConfig:
                 'an environmental variable'
             ),
             required=False,
-            default=cls.DEF_IMMUDB_ADDRESS
+            default=None,
         )
         parser.add_argument(
             '--immudb-public-key-file',
@@ -176,7 +374,92 @@ class CommonConfig:
                 'an environmental variable'
             ),
             required=False,
-            default=cls.DEF_IMMUDB_PUBLIC_KEY_FILE
+            default=None,
+        )
+
+    @classmethod
+    def _add_processing_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            '--jobs',
+            type=cls.parse_positive_int,
+            help=(
+                'Number of workers used to collect package data '
+                'concurrently (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_JOBS,
+        )
+
+    @classmethod
+    def _add_cache_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        cache_mode_group = parser.add_mutually_exclusive_group()
+        cache_mode_group.add_argument(
+            '--no-cache',
+            help=(
+                'Do not read nor write the local caches of immudb records '
+                'and ALBS builds'
+            ),
+            required=False,
+            action='store_false', dest='use_cache',
+        )
+        cache_mode_group.add_argument(
+            '--refresh-cache',
+            help=(
+                'Ignore cached immudb records and ALBS builds and store '
+                'the freshly retrieved ones'
+            ),
+            required=False,
+            action='store_true',
+        )
+        parser.add_argument(
+            '--cache-dir',
+            type=str,
+            help='Directory of the local cache (default: %(default)s)',
+            required=False,
+            default=cls.DEF_CACHE_DIR,
+        )
+        parser.add_argument(
+            '--cache-max-size',
+            type=int,
+            help=(
+                'Max size of the local cache in MiB. Least recently used '
+                'records are evicted beyond this size (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_CACHE_MAX_SIZE,
+        )
+        parser.add_argument(
+            '--negative-cache-ttl',
+            type=int,
+            help=(
+                'Hours during which hashes found absent from immudb are not '
+                'looked up again by the package and iso subcommands, which '
+                'fall back to the package data. 0 disables it (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_NEGATIVE_CACHE_TTL,
+        )
+        parser.add_argument(
+            '--albs-cache-ttl',
+            type=int,
+            help=(
+                'Hours during which cached finished ALBS builds are used '
+                'without asking ALBS. Older ones are revalidated with a '
+                'conditional request. 0 always revalidates (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_ALBS_CACHE_TTL,
+        )
+        parser.add_argument(
+            '--notarized-filter',
+            type=str,
+            help=(
+                'Bloom filter of notarized hashes made by the '
+                'notarized-filter subcommand. Hashes not in it are not '
+                'looked up in immudb by the package and iso subcommands'
+            ),
+            required=False,
+            default=None,
         )
 
     # TODO: Implement creator options, see: https://github.com/AlmaLinux/alma-sbom/issues/52
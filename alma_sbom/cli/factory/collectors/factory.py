@@ -1,34 +1,137 @@
+import threading
+from typing import TYPE_CHECKING
+
 from alma_sbom.cli.config import CommonConfig
-from alma_sbom.data import (
-    ImmudbCollector,
-    AlbsCollector,
-    RpmCollector,
-    IsoCollector,
-)
+
+### NOTE:
+# Collectors are imported when they are generated, so that a subcommand
+# only loads the modules of the collectors it uses.
+if TYPE_CHECKING:
+    from alma_sbom.data import (
+        ImmudbCollector,
+        AlbsCollector,
+        RpmCollector,
+        IsoCollector,
+    )
+    from alma_sbom.data.collectors.immudb.bloom import BloomFilter
+    from alma_sbom.data.collectors.immudb.cache import ImmudbCache
+    from alma_sbom.data.collectors.albs import AlbsCache
+    from requests import Session
 
 class CollectorFactory:
     config: CommonConfig
+    _thread_local: threading.local
+    _immudb_cache: 'ImmudbCache'
+    _notarized_filter: 'BloomFilter'
+    _albs_cache: 'AlbsCache'
+    _albs_session: 'Session'
 
     def __init__(self, config: CommonConfig):
         self.config = config
+        self._thread_local = threading.local()
+        self._immudb_cache = None
+        self._notarized_filter = None
+        self._albs_cache = None
+        self._albs_session = None
+        self._lock = threading.Lock()
 
-    def gen_immudb_collector(self) -> ImmudbCollector:
+    def gen_immudb_collector(self) -> 'ImmudbCollector':
+        from alma_sbom.data.collectors.immudb import ImmudbCollector
         return ImmudbCollector(
-             username=self.config.immudb_username,
-             password=self.config.immudb_password,
-             database=self.config.immudb_database,
-             immudb_address=self.config.immudb_address,
-             public_key_file=self.config.immudb_public_key_file,
+             username=self.config.get_immudb_username(),
+             password=self.config.get_immudb_password(),
+             database=self.config.get_immudb_database(),
+             immudb_address=self.config.get_immudb_address(),
+             public_key_file=self.config.get_immudb_public_key_file(),
+             cache=self.get_immudb_cache(),
+             notarized_filter=self.get_notarized_filter(),
         )
 
-    def gen_albs_collector(self) -> AlbsCollector:
+    def get_immudb_cache(self) -> 'ImmudbCache':
+        """Return the immudb cache shared by all collectors, None if disabled"""
+        from alma_sbom.data.collectors.immudb.cache import ImmudbCache
+        if not self.config.use_cache:
+            return None
+        with self._lock:
+            if self._immudb_cache is None:
+                self._immudb_cache = ImmudbCache(
+                    cache_dir=self.config.cache_dir,
+                    max_size=self.config.cache_max_size * 1024 * 1024,
+                    refresh=self.config.refresh_cache,
+                    negative_ttl=self.config.negative_cache_ttl * 3600,
+                )
+        return self._immudb_cache
+
+    def get_notarized_filter(self) -> 'BloomFilter':
+        """Return the filter of notarized hashes shared by all collectors, None if not given"""
+        from alma_sbom.data.collectors.immudb.bloom import BloomFilter
+        if not self.config.notarized_filter:
+            return None
+        with self._lock:
+            if self._notarized_filter is None:
+                self._notarized_filter = BloomFilter.read(self.config.notarized_filter)
+        return self._notarized_filter
+
+    def get_thread_immudb_collector(self) -> 'ImmudbCollector':
+        """Return the immudb collector owned by the calling thread.
+
+        ImmudbWrapper keeps client side verification state, so worker threads
+        must not share a single collector. Each thread gets its own collector
+        on first use and reuses it afterwards.
+        """
+        collector = getattr(self._thread_local, 'immudb_collector', None)
+        if collector is None:
+            collector = self.gen_immudb_collector()
+            self._thread_local.immudb_collector = collector
+        return collector
+
+    def gen_albs_collector(self) -> 'AlbsCollector':
+        from alma_sbom.data.collectors.albs import AlbsCollector
         return AlbsCollector(
             albs_url=self.config.albs_url,
+            session=self.get_albs_session(),
+            cache=self.get_albs_cache(),
         )
 
-    def gen_rpm_collector(self) -> RpmCollector:
+    def get_albs_session(self) -> 'Session':
+        """Return the HTTP session shared by all ALBS collectors, keeping connections alive"""
+        from alma_sbom.data.collectors.albs import gen_albs_session
+        with self._lock:
+            if self._albs_session is None:
+                self._albs_session = gen_albs_session(pool_size=self.config.jobs)
+        return self._albs_session
+
+    def get_albs_cache(self) -> 'AlbsCache':
+        """Return the ALBS cache shared by all collectors, None if disabled"""
+        from alma_sbom.data.collectors.albs import AlbsCache
+        if not self.config.use_cache:
+            return None
+        with self._lock:
+            if self._albs_cache is None:
+                self._albs_cache = AlbsCache(
+                    cache_dir=self.config.cache_dir,
+                    max_size=self.config.cache_max_size * 1024 * 1024,
+                    refresh=self.config.refresh_cache,
+                    finished_ttl=self.config.albs_cache_ttl * 3600,
+                )
+        return self._albs_cache
+
+    def gen_rpm_collector(self) -> 'RpmCollector':
+        from alma_sbom.data.collectors.rpm import RpmCollector
         return RpmCollector()
 
-    def gen_iso_collector(self) -> IsoCollector:
-        return IsoCollector()
+    def get_thread_rpm_collector(self) -> 'RpmCollector':
+        """Return the rpm collector owned by the calling thread.
+
+        Its rpm TransactionSet is kept open and reused by later calls.
+        """
+        collector = getattr(self._thread_local, 'rpm_collector', None)
+        if collector is None:
+            collector = self.gen_rpm_collector()
+            self._thread_local.rpm_collector = collector
+        return collector
+
+    def gen_iso_collector(self, zero_copy: bool = False) -> 'IsoCollector':
+        from alma_sbom.data.collectors.iso import IsoCollector
+        return IsoCollector(zero_copy=zero_copy)
 
@@ -1,25 +1,52 @@
 from typing import Any
+from logging import getLogger
 
 from alma_sbom.cli.config import CommonConfig
+from alma_sbom.type import SbomFileFormatType, ValidationMode
 from alma_sbom.formats import (
     document_factory,
     Document,
 )
 
+_logger = getLogger(__name__)
+
 class DocumentFactory:
     config: CommonConfig
     document_class: type[Document]
+    validation: ValidationMode
 
     def __init__(self, config: CommonConfig):
         self.config = config
-        self.document_class = document_factory(self.config.sbom_type.record_type)
+        self.document_class = self._select_document_class()
+        self.validation = self.config.validation
+
+    def _select_document_class(self) -> type[Document]:
+        record_type = self.config.sbom_type.record_type
+        if self.config.stream:
+            stream_document_class = document_factory(record_type, stream=True)
+            if (
+                stream_document_class and
+                self.config.sbom_type.file_format_type == SbomFileFormatType.JSON
+            ):
+                return stream_document_class
+            _logger.warning(
+                f'Streaming output is not supported for {self.config.sbom_type}, '
+                'the whole document is generated in memory'
+            )
+        return document_factory(record_type)
 
     def gen_from_package(self, package: Any) -> Document:
-        return self.document_class.from_package(package, self.config.sbom_type.file_format_type)
+        doc = self.document_class.from_package(package, self.config.sbom_type.file_format_type)
+        doc.validation = self.validation
+        return doc
 
     def gen_from_build(self, build: Any) -> Document:
-        return self.document_class.from_build(build, self.config.sbom_type.file_format_type)
+        doc = self.document_class.from_build(build, self.config.sbom_type.file_format_type)
+        doc.validation = self.validation
+        return doc
 
     def gen_from_iso(self, iso: Any) -> Document:
-        return self.document_class.from_iso(iso, self.config.sbom_type.file_format_type)
+        doc = self.document_class.from_iso(iso, self.config.sbom_type.file_format_type)
+        doc.validation = self.validation
+        return doc
 
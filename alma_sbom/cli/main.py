@@ -1,10 +1,12 @@
 import argparse
 import sys
 from logging import getLogger
+from pathlib import Path
 
 from alma_sbom.type import SbomType
 
 from .logging import Logging, add_logging_arguments
+from .profiling import Profiling, add_profiling_arguments
 from .commands import SubCommand, command_factory
 from .config import CommonConfig, add_config_arguments
 
@@ -14,22 +16,29 @@ class Main:
     command: SubCommand
     args: argparse.Namespace
     config: CommonConfig
+    profiling: Profiling
 
     def __init__(self, args: list[str]) -> None:
         parser = self.create_parser()
         self.args = parser.parse_args(args)
         logging = Logging(loglevel=self.args.loglevel)
+        self.profiling = Profiling(
+            profile=self.args.profile,
+            profile_dump=self.args.profile_dump and Path(self.args.profile_dump),
+        )
         self.config = CommonConfig.from_args(self.args)
         self.command = command_factory(self.config, self.args)
 
     def run(self) -> int:
-        return self.command.run()
+        with self.profiling:
+            return self.command.run()
 
     @staticmethod
     def create_parser() -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser(description='alma-sbom')
         add_config_arguments(parser)
         add_logging_arguments(parser)
+        add_profiling_arguments(parser)
         return parser
 
 def cli_main():
@@ -0,0 +1,64 @@
+import argparse
+import cProfile
+import sys
+from logging import getLogger
+from pathlib import Path
+from typing import Optional
+
+from alma_sbom.profiling import stage_timer
+
+_logger = getLogger(__name__)
+
+class Profiling():
+    profile: bool
+    profile_dump: Optional[Path]
+
+    def __init__(self, profile: bool = False, profile_dump: Optional[Path] = None) -> None:
+        self.profile = profile
+        self.profile_dump = profile_dump
+        self._profiler = None
+
+    def __enter__(self) -> 'Profiling':
+        if self.profile:
+            stage_timer.reset()
+            stage_timer.enabled = True
+        if self.profile_dump:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._profiler:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_dump)
+            _logger.info(f'Profile data has been written to {self.profile_dump}')
+            self._profiler = None
+        if self.profile:
+            stage_timer.enabled = False
+            ### stdout may be the generated SBOM
+            print(stage_timer.format_summary(), file=sys.stderr)
+
+    @staticmethod
+    def add_arguments(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            '--profile',
+            help=(
+                'Print the count, total, p50, p95 and max time of each stage '
+                '(albs, immudb, iso, rpm, licenses, write, ...) to stderr at exit'
+            ),
+            required=False,
+            action='store_true',
+        )
+        parser.add_argument(
+            '--profile-dump',
+            type=str,
+            help=(
+                'Run under cProfile and write the stats of the main thread to '
+                'this path, to be read with pstats'
+            ),
+            required=False,
+            default=None,
+        )
+
+def add_profiling_arguments(parser: argparse.ArgumentParser) -> None:
+    Profiling.add_arguments(parser)
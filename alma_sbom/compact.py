@@ -0,0 +1,62 @@
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Optional, TypeVar
+
+_T = TypeVar('_T')
+
+def slotted_dataclass(cls: type[_T] = None, **kwargs) -> type[_T]:
+    """dataclass whose instances have __slots__ instead of __dict__.
+
+    Same as dataclass(slots=True) of Python 3.10, which is not available on
+    3.9. The class is created again with __slots__, so methods of it must
+    not use zero-argument super(), which still refers to the original class.
+    Every base class must define __slots__ as well, or instances keep a
+    __dict__ anyway.
+    """
+    def wrap(cls: type[_T]) -> type[_T]:
+        return _add_slots(dataclass(cls, **kwargs))
+
+    if cls is None:
+        return wrap
+    return wrap(cls)
+
+def _add_slots(cls: type[_T]) -> type[_T]:
+    cls_dict = dict(cls.__dict__)
+    field_names = [f.name for f in fields(cls)]
+    inherited_slots = {
+        name
+        for base in cls.__mro__[1:-1]
+        for name in base.__dict__.get('__slots__', ())
+    }
+    cls_dict['__slots__'] = tuple(name for name in field_names if name not in inherited_slots)
+    ### defaults of fields are kept by the generated __init__
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+def intern_str(value: Optional[str]) -> Optional[str]:
+    """Intern low cardinality strings such as arch, so that equal values share one object"""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+def fromisoformat_utc(value: str) -> datetime:
+    """datetime.fromisoformat() which accepts a Z suffix like on Python 3.11, returning naive UTC"""
+    if value[-1:] in ('Z', 'z'):
+        value = value[:-1] + '+00:00'
+    return to_naive_utc(datetime.fromisoformat(value))
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Convert an offset aware datetime to naive UTC, so that it compares with naive ones.
+
+    Naive datetimes are taken as UTC already and returned as they are.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -1,4 +1,4 @@
-from immudb_wrapper import ImmudbWrapper
+from functools import lru_cache
 
 from alma_sbom._version import __version__
 
@@ -6,20 +6,33 @@ ALMAOS_VENDOR = 'AlmaLinux OS Foundation'
 ALMAOS_SBOMLICENSE = 'CC0-1.0'
 ALMAOS_NAMESPACE = 'https://security.almalinux.org'
 
-TOOLS = [
-    {
-        "vendor": ALMAOS_VENDOR,
-        "name": "AlmaLinux Build System",
-        "version": "0.1",  # Shall we start versioning ALBS?
-    },
-    {
-        "vendor": ALMAOS_VENDOR,
-        "name": "alma-sbom",
-        "version": __version__,
-    },
-    {
-        "vendor": ALMAOS_VENDOR,
-        "name": "Immudb Wrapper",
-        "version": ImmudbWrapper.get_version(),
-    },
-]
+@lru_cache(maxsize=None)
+def get_tools() -> list[dict]:
+    ### NOTE:
+    # immudb_wrapper is imported here rather than at module level, so that
+    # it is loaded only when a document is actually generated.
+    from immudb_wrapper import ImmudbWrapper
+
+    return [
+        {
+            "vendor": ALMAOS_VENDOR,
+            "name": "AlmaLinux Build System",
+            "version": "0.1",  # Shall we start versioning ALBS?
+        },
+        {
+            "vendor": ALMAOS_VENDOR,
+            "name": "alma-sbom",
+            "version": __version__,
+        },
+        {
+            "vendor": ALMAOS_VENDOR,
+            "name": "Immudb Wrapper",
+            "version": ImmudbWrapper.get_version(),
+        },
+    ]
+
+def __getattr__(name: str):
+    ### TOOLS is resolved on first access, see PEP 562
+    if name == 'TOOLS':
+        return get_tools()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,3 +1,13 @@
 from .models import Package, NullPackage, Build, PackageNevra, Iso
-from .collectors import ImmudbCollector, AlbsCollector, RpmCollector, IsoCollector
 from .attributes import Property
+
+### NOTE:
+# Collectors depend on immudb_wrapper, rpm, pycdlib and requests, which are
+# slow to import. They are imported on first access instead, see PEP 562.
+_COLLECTORS = ('ImmudbCollector', 'AlbsCollector', 'RpmCollector', 'IsoCollector')
+
+def __getattr__(name: str):
+    if name in _COLLECTORS:
+        from . import collectors
+        return getattr(collectors, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
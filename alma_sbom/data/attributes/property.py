@@ -1,13 +1,15 @@
-from dataclasses import dataclass
 from typing import ClassVar
 
-@dataclass
+from alma_sbom.compact import slotted_dataclass, intern_str
+
+@slotted_dataclass
 class Property:
     name: str
     value: str
 
 class PropertyMixin:
     """Mixin for providing common functionality for property conversion"""
+    __slots__ = ()
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {}
 
     def _create_properties(self) -> list[Property]:
@@ -18,7 +20,7 @@ class PropertyMixin:
             if getattr(self, attr) is not None
         ]
 
-@dataclass
+@slotted_dataclass
 class BuildSourceProperties(PropertyMixin):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         "source_type": "almalinux:albs:build:source:type"
@@ -29,7 +31,7 @@ class BuildSourceProperties(PropertyMixin):
     def to_properties(self) -> list[Property]:
         return self._create_properties()
 
-@dataclass
+@slotted_dataclass
 class GitSourceProperties(BuildSourceProperties):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         **BuildSourceProperties.PROPERTY_KEYS,
@@ -45,8 +47,10 @@ class GitSourceProperties(BuildSourceProperties):
     git_commit_immudb_hash: str
 
     def __init__(self, git_url: str, git_commit: str, git_ref: str, git_commit_immudb_hash: str):
-        super().__init__(source_type="git")
-        self.git_url = git_url
+        ### NOTE:
+        # super() can not be used in slotted dataclasses, see slotted_dataclass
+        self.source_type = "git"
+        self.git_url = intern_str(git_url)
         self.git_commit = git_commit
         self.git_ref = git_ref
         self.git_commit_immudb_hash = git_commit_immudb_hash
@@ -54,7 +58,7 @@ class GitSourceProperties(BuildSourceProperties):
     def to_properties(self) -> list[Property]:
         return self._create_properties()
 
-@dataclass
+@slotted_dataclass
 class SrpmSourceProperties(BuildSourceProperties):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         **BuildSourceProperties.PROPERTY_KEYS,
@@ -68,7 +72,7 @@ class SrpmSourceProperties(BuildSourceProperties):
     srpm_nevra: str
 
     def __init__(self, srpm_url: str, srpm_checksum: str, srpm_nevra: str):
-        super().__init__(source_type="srpm")
+        self.source_type = "srpm"
         self.srpm_url = srpm_url
         self.srpm_checksum = srpm_checksum
         self.srpm_nevra = srpm_nevra
@@ -76,7 +80,7 @@ class SrpmSourceProperties(BuildSourceProperties):
     def to_properties(self) -> list[Property]:
         return self._create_properties()
 
-@dataclass
+@slotted_dataclass
 class BuildPropertiesBase(PropertyMixin):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         "build_id": "almalinux:albs:build:ID",
@@ -89,24 +93,36 @@ class BuildPropertiesBase(PropertyMixin):
     def to_properties(self) -> list[Property]:
         return self._create_properties()
 
-@dataclass
+@slotted_dataclass
 class BuildPropertiesForPackage(BuildPropertiesBase):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         **BuildPropertiesBase.PROPERTY_KEYS,
         "author": "almalinux:albs:build:author",
         "package_type": "almalinux:albs:build:packageType",
-        "target_arch": "almalinux:albs:build:targetArch"
+        "target_arch": "almalinux:albs:build:targetArch",
+        "task_ids": "almalinux:albs:build:taskIDs",
+        "task_arches": "almalinux:albs:build:taskArches"
     }
 
     author: str
     package_type: str
     target_arch: str
     source: BuildSourceProperties
+    ### comma separated build tasks which produced the package, set by
+    ### the build subcommand
+    task_ids: str = None
+    task_arches: str = None
+
+    def __post_init__(self) -> None:
+        self.author = intern_str(self.author)
+        self.package_type = intern_str(self.package_type)
+        self.target_arch = intern_str(self.target_arch)
+        self.task_arches = intern_str(self.task_arches)
 
     def to_properties(self) -> list[Property]:
         return self._create_properties() + (self.source.to_properties() if self.source is not None else [])
 
-@dataclass
+@slotted_dataclass
 class BuildPropertiesForBuild(BuildPropertiesBase):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         **BuildPropertiesBase.PROPERTY_KEYS,
@@ -118,7 +134,7 @@ class BuildPropertiesForBuild(BuildPropertiesBase):
     def to_properties(self) -> list[Property]:
         return self._create_properties()
 
-@dataclass
+@slotted_dataclass
 class PackageProperties(PropertyMixin):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         "arch": "almalinux:package:arch",
@@ -138,10 +154,14 @@ class PackageProperties(PropertyMixin):
     sourcerpm: str
     timestamp: str
 
+    def __post_init__(self) -> None:
+        self.arch = intern_str(self.arch)
+        self.buildhost = intern_str(self.buildhost)
+
     def to_properties(self) -> list[Property]:
         return self._create_properties()
 
-@dataclass
+@slotted_dataclass
 class SBOMProperties(PropertyMixin):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
         "immudb_hash": "almalinux:sbom:immudbHash"
@@ -1,4 +1,15 @@
-from .immudb import ImmudbCollector
-from .albs import AlbsCollector
-from .rpm import RpmCollector
-from .iso import IsoCollector
+import importlib
+
+### Each collector is imported on first access, see PEP 562
+_COLLECTOR_MODULES = {
+    'ImmudbCollector': '.immudb',
+    'AlbsCollector': '.albs',
+    'RpmCollector': '.rpm',
+    'IsoCollector': '.iso',
+}
+
+def __getattr__(name: str):
+    if name in _COLLECTOR_MODULES:
+        module = importlib.import_module(_COLLECTOR_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
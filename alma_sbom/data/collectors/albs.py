@@ -1,19 +1,99 @@
+import json
 import requests
+import time
+from dataclasses import field
+from datetime import datetime
+from http import HTTPStatus
+from itertools import count
 from logging import getLogger
-from typing import ClassVar, Iterator
+from pathlib import Path
+from typing import ClassVar, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
 
 from alma_sbom.data import Build
 from alma_sbom.data.attributes.property import BuildPropertiesForBuild as BuildProperties
+from alma_sbom.compact import slotted_dataclass, intern_str, fromisoformat_utc, to_naive_utc
+from alma_sbom.data.collectors.cache import SqliteCache
 
 _logger = getLogger(__name__)
 
+class AlbsCache(SqliteCache):
+    """Cache of build JSON retrieved from ALBS, keyed by the URL of the build.
+
+    Each entry keeps the ETag and Last-Modified headers of the response, so
+    that unfinished builds are revalidated with a conditional request.
+    Finished builds are used without asking ALBS for finished_ttl seconds
+    after they were cached or last revalidated, then revalidated like the
+    unfinished ones, so that builds changed afterwards are picked up.
+    """
+    DB_NAME: ClassVar[str] = 'albs.sqlite3'
+    finished_ttl: float
+
+    def __init__(self, cache_dir: Path, max_size: int, refresh: bool = False, finished_ttl: float = 0) -> None:
+        super().__init__(cache_dir, max_size, refresh)
+        self.finished_ttl = finished_ttl
+
+    def is_fresh(self, cached: dict) -> bool:
+        """Return whether cached was stored within finished_ttl seconds"""
+        return time.time() - cached.get('cached_at', 0) < self.finished_ttl
+
+    def get(self, url: str) -> Optional[dict]:
+        value = self.get_raw(url)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def put(self, url: str, build_info: dict, etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.put_raw(url, json.dumps({
+            'build': build_info,
+            'etag': etag,
+            'last_modified': last_modified,
+            'cached_at': time.time(),
+        }, separators=(',', ':')))
+
+def gen_albs_session(pool_size: int = 1) -> requests.Session:
+    """Return a session keeping up to pool_size connections to ALBS alive"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@slotted_dataclass
+class AlbsArtifact:
+    """rpm artifact of a build and the build tasks which produced it.
+
+    Multi-arch builds list the same noarch artifact under each arch task.
+    """
+    cas_hash: str
+    task_ids: list[str] = field(default_factory=list)
+    arches: list[str] = field(default_factory=list)
+
+    def add_task(self, task_id: Optional[str], arch: Optional[str]) -> None:
+        if task_id is not None and task_id not in self.task_ids:
+            self.task_ids.append(task_id)
+        if arch is not None and arch not in self.arches:
+            self.arches.append(intern_str(arch))
+
 class AlbsCollector:
     albs_url: str
+    ### unique hashes of rpm artifacts in the order they appear in the build
     package_hash_list: list[str]
+    artifacts: dict[str, AlbsArtifact]
+    ### whether the last collected build has finished, so it does not change
+    build_finished: bool
+    session: requests.Session
+    cache: Optional[AlbsCache]
 
-    def __init__(self, albs_url) -> None:
+    def __init__(self, albs_url, session: requests.Session = None, cache: AlbsCache = None) -> None:
         self.albs_url = albs_url
         self.package_hash_list = None
+        self.artifacts = {}
+        self.build_finished = False
+        ### session and cache are given when they are shared among collectors
+        self.session = session or gen_albs_session()
+        self.cache = cache
 
     def collect_build_by_id(self, build_id: str) -> Build:
         build_info = self._extract_build_info_by_id(build_id)
@@ -30,15 +110,16 @@ class AlbsCollector:
             build_properties = self._make_BuildProperties_from_build_info(build_info),
         )
 
-        self.package_hash_list = list()
-        for task in build_info['tasks']:
-            for artifact in task['artifacts']:
-                if artifact['type'] != 'rpm':
-                    continue
-                self.package_hash_list.append(artifact['cas_hash'])
+        self.artifacts = self._index_artifacts(build_info)
+        self.package_hash_list = list(self.artifacts)
+        self.build_finished = self._is_finished(build_info)
 
         return build
 
+    def get_artifact(self, pkg_hash: str) -> AlbsArtifact:
+        """Return the artifact of pkg_hash in the build collected last"""
+        return self.artifacts[pkg_hash]
+
     def iter_package_hash(self) -> Iterator[str]:
         try:
             for pkg_hash in self.package_hash_list:
@@ -50,12 +131,78 @@ class AlbsCollector:
                 'prior to call AlbsCollector.iter_package_hash()'
             )
 
+    def iter_build_id_by_created_at(self, created_after: datetime, created_before: datetime = None) -> Iterator[str]:
+        """Yield ids of builds created in [created_after, created_before), newest first.
+
+        Pages of the build list of ALBS are sorted from the newest build, so
+        pages are requested until a build older than created_after is found.
+        Naive datetimes are taken as UTC.
+        """
+        created_after = to_naive_utc(created_after)
+        created_before = created_before and to_naive_utc(created_before)
+        for page_number in count(1):
+            response = self.session.get(
+                url=f'{self._get_albs_builds_endpoint()}/',
+                params={'pageNumber': page_number},
+            )
+            response.raise_for_status()
+            builds = response.json()['builds']
+            if not builds:
+                return
+            for build_info in builds:
+                created_at = fromisoformat_utc(build_info['created_at'])
+                if created_at < created_after:
+                    return
+                if created_before is None or created_at < created_before:
+                    yield str(build_info['id'])
+
     def _extract_build_info_by_id(self, build_id: str) -> dict:
-        response = requests.get(
-            url=f'{self._get_albs_builds_endpoint()}/{build_id}',
-        )
+        url = f'{self._get_albs_builds_endpoint()}/{build_id}'
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self._is_finished(cached['build']) and self.cache.is_fresh(cached):
+            return cached['build']
+
+        headers = {}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+        response = self.session.get(url=url, headers=headers)
+        if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+            _logger.debug(f'Build {build_id} has not been modified since cached')
+            if self._is_finished(cached['build']):
+                ### trusted for another finished_ttl
+                self.cache.put(url, cached['build'], etag=cached['etag'], last_modified=cached['last_modified'])
+            return cached['build']
         response.raise_for_status()
-        return response.json()
+
+        build_info = response.json()
+        if self.cache:
+            self.cache.put(
+                url,
+                build_info,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
+        return build_info
+
+    @staticmethod
+    def _index_artifacts(build_info: dict) -> dict[str, AlbsArtifact]:
+        artifacts = {}
+        for task in build_info['tasks']:
+            task_id = task.get('id')
+            for artifact in task['artifacts']:
+                if artifact['type'] != 'rpm':
+                    continue
+                cas_hash = artifact['cas_hash']
+                if cas_hash not in artifacts:
+                    artifacts[cas_hash] = AlbsArtifact(cas_hash)
+                artifacts[cas_hash].add_task(task_id and str(task_id), task.get('arch'))
+        return artifacts
+
+    @staticmethod
+    def _is_finished(build_info: dict) -> bool:
+        return bool(build_info.get('finished_at'))
 
     def _make_BuildProperties_from_build_info(self, build_info: dict) -> BuildProperties:
         return BuildProperties(
@@ -0,0 +1,143 @@
+import atexit
+import sqlite3
+import threading
+import time
+from logging import getLogger
+from pathlib import Path
+from typing import ClassVar, Optional
+
+_logger = getLogger(__name__)
+
+class SqliteCache:
+    """Persistent key/value cache stored in a SQLite database under cache_dir.
+
+    Entries are evicted in least recently used order once the total size of
+    the stored values exceeds max_size bytes. When refresh is set, lookups
+    always miss but new values are still stored, so the cache is rebuilt
+    from fresh data.
+    """
+    DB_NAME: ClassVar[str]
+    ### eviction frees space down to this ratio of max_size, so that it is
+    ### not needed again by the following puts
+    EVICT_TARGET_RATIO: ClassVar[float] = 0.9
+    ### access times of hits are written at once by this number
+    ACCESS_BATCH_SIZE: ClassVar[int] = 256
+    SCHEMA: ClassVar[list[str]] = [
+        'CREATE TABLE IF NOT EXISTS entries ('
+        '    key TEXT PRIMARY KEY,'
+        '    value TEXT NOT NULL,'
+        '    size INTEGER NOT NULL,'
+        '    accessed_at REAL NOT NULL'
+        ')',
+        'CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)',
+    ]
+
+    db_path: Path
+    max_size: int
+    refresh: bool
+    hits: int
+    misses: int
+
+    def __init__(self, cache_dir: Path, max_size: int, refresh: bool = False) -> None:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / self.DB_NAME
+        self.max_size = max_size
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending_accesses: dict[str, float] = {}
+        self._closed = False
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            self._total_size = self._query_total_size()
+        atexit.register(self.flush)
+
+    def get_raw(self, key: str) -> Optional[str]:
+        with self._lock:
+            if self.refresh:
+                self.misses += 1
+                return None
+            row = self._conn.execute(
+                'SELECT value FROM entries WHERE key = ?', (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            ### NOTE:
+            # Access times are written in batches, so that a hit is only a
+            # read and not a write transaction of its own.
+            self._pending_accesses[key] = time.time()
+            if len(self._pending_accesses) >= self.ACCESS_BATCH_SIZE:
+                with self._conn:
+                    self._write_accesses()
+        return row[0]
+
+    def put_raw(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            row = self._conn.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, accessed_at) '
+                'VALUES (?, ?, ?, ?)',
+                (key, value, len(value), time.time()),
+            )
+            self._pending_accesses.pop(key, None)
+            self._total_size += len(value) - (row[0] if row else 0)
+            self._write_accesses()
+            if self._total_size > self.max_size:
+                self._evict()
+
+    def flush(self) -> None:
+        """Write the access times of the hits which are not written yet"""
+        with self._lock:
+            if self._closed or not self._pending_accesses:
+                return
+            with self._conn:
+                self._write_accesses()
+
+    def close(self) -> None:
+        self.flush()
+        _logger.debug(f'{self.db_path}: {self.hits} hits, {self.misses} misses')
+        with self._lock:
+            self._closed = True
+            self._conn.close()
+        atexit.unregister(self.flush)
+
+    def _write_accesses(self) -> None:
+        if not self._pending_accesses:
+            return
+        self._conn.executemany(
+            'UPDATE entries SET accessed_at = ? WHERE key = ?',
+            [(accessed_at, key) for key, accessed_at in self._pending_accesses.items()],
+        )
+        self._pending_accesses.clear()
+
+    def _query_total_size(self) -> int:
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def _evict(self) -> None:
+        ### NOTE:
+        # _total_size only counts the puts of this instance, while other
+        # processes may share the database, so the total is read again
+        # before evicting. The least recently used entries are dropped
+        # until the total is below EVICT_TARGET_RATIO of max_size.
+        self._total_size = self._query_total_size()
+        excess = self._total_size - int(self.max_size * self.EVICT_TARGET_RATIO)
+        if self._total_size <= self.max_size or excess <= 0:
+            return
+        keys = []
+        cur = self._conn.execute('SELECT key, size FROM entries ORDER BY accessed_at')
+        for key, size in cur:
+            if excess <= 0:
+                break
+            keys.append((key,))
+            excess -= size
+            self._total_size -= size
+        cur.close()
+        self._conn.executemany('DELETE FROM entries WHERE key = ?', keys)
+        _logger.debug(f'{self.db_path}: evicted {len(keys)} entries')
@@ -0,0 +1,81 @@
+import hashlib
+import math
+import struct
+from pathlib import Path
+from typing import ClassVar, Iterable
+
+class BloomFilter:
+    """Bloom filter of package hashes, stored in a file.
+
+    A hash which is not in the filter has never been added, so a filter of
+    the notarized hashes tells which packages are certainly absent from
+    immudb. A hash in the filter may still be absent, at the rate of false
+    positives given when the filter is made.
+    """
+    MAGIC: ClassVar[bytes] = b'ASBF'
+    VERSION: ClassVar[int] = 1
+    ### magic, version, number of hash functions and number of bits
+    HEADER: ClassVar[struct.Struct] = struct.Struct('>4sBBQ')
+
+    num_bits: int
+    num_hashes: int
+    bits: bytearray
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: bytearray = None) -> None:
+        if num_bits < 1 or num_hashes < 1:
+            raise ValueError(f'Invalid size of Bloom filter: {num_bits} bits, {num_hashes} hashes')
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> 'BloomFilter':
+        """Return an empty filter sized for capacity hashes"""
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f'false_positive_rate must be between 0 and 1: {false_positive_rate}')
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def from_hashes(cls, hashes: Iterable[str], false_positive_rate: float) -> 'BloomFilter':
+        hashes = list(hashes)
+        bloom_filter = cls.for_capacity(len(hashes), false_positive_rate)
+        for hash in hashes:
+            bloom_filter.add(hash)
+        return bloom_filter
+
+    @classmethod
+    def read(cls, path: Path) -> 'BloomFilter':
+        data = Path(path).read_bytes()
+        try:
+            magic, version, num_hashes, num_bits = cls.HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ValueError(f'{path} is not a Bloom filter of alma-sbom') from e
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f'{path} is not a Bloom filter of alma-sbom version {cls.VERSION}')
+        bits = bytearray(data[cls.HEADER.size:])
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError(f'{path} is truncated')
+        return cls(num_bits, num_hashes, bits)
+
+    def write(self, path: Path) -> None:
+        with open(path, 'wb') as fd:
+            fd.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.num_hashes, self.num_bits))
+            fd.write(self.bits)
+
+    def add(self, hash: str) -> None:
+        for index in self._indexes(hash):
+            self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, hash: str) -> bool:
+        return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(hash))
+
+    def _indexes(self, hash: str) -> Iterable[int]:
+        ### NOTE:
+        # Two 64 bit halves of one digest make all the indexes, see
+        # Kirsch and Mitzenmacher, "Less Hashing, Same Performance".
+        digest = hashlib.blake2b(hash.strip().lower().encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack('>QQ', digest)
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
@@ -0,0 +1,47 @@
+import json
+import time
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from alma_sbom.data.collectors.cache import SqliteCache
+
+class ImmudbCache(SqliteCache):
+    """Content addressed cache of notarized immudb records.
+
+    Notarized records never change, so the raw 'value' dict of a record,
+    together with its 'timestamp', is stored under the package hash and
+    reused by later runs instead of asking immudb again.
+
+    Hashes absent from immudb are stored as well, with the time they were
+    looked up, so that later runs skip them until negative_ttl seconds
+    have passed. They may be notarized later, so they are not kept forever.
+    """
+    DB_NAME: ClassVar[str] = 'immudb.sqlite3'
+    ### prefix of the keys of absent hashes, which never clashes with a hash
+    MISSING_KEY_PREFIX: ClassVar[str] = 'missing:'
+
+    negative_ttl: float
+
+    def __init__(self, cache_dir: Path, max_size: int, refresh: bool = False, negative_ttl: float = 0) -> None:
+        super().__init__(cache_dir, max_size, refresh)
+        self.negative_ttl = negative_ttl
+
+    def get(self, hash: str) -> Optional[dict]:
+        value = self.get_raw(hash)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def put(self, hash: str, immudb_info: dict) -> None:
+        self.put_raw(hash, json.dumps(immudb_info, separators=(',', ':')))
+
+    def is_missing(self, hash: str) -> bool:
+        """Return whether hash was absent from immudb within negative_ttl seconds"""
+        if self.negative_ttl <= 0:
+            return False
+        value = self.get_raw(f'{self.MISSING_KEY_PREFIX}{hash}')
+        return value is not None and time.time() - float(value) < self.negative_ttl
+
+    def put_missing(self, hash: str) -> None:
+        if self.negative_ttl > 0:
+            self.put_raw(f'{self.MISSING_KEY_PREFIX}{hash}', str(time.time()))
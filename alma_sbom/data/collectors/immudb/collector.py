@@ -4,14 +4,23 @@ from logging import getLogger
 from pathlib import Path
 
 from alma_sbom.data import Package, PackageNevra
+from alma_sbom.data.collectors.utils import hash_file
 
+from .bloom import BloomFilter
+from .cache import ImmudbCache
 from .processor import DataProcessor, processor_factory
 
 _logger = getLogger(__name__)
 
+### error of ImmudbWrapper.authenticate() for hashes which are not notarized
+NOT_FOUND_ERROR = 'key not found'
+
 class ImmudbCollector:
     client: ImmudbWrapper
     processor: DataProcessor
+    cache: ImmudbCache
+    ### hashes known to be notarized, the others are not looked up
+    notarized_filter: BloomFilter
 
     def __init__(
          self,
@@ -20,6 +29,8 @@ class ImmudbCollector:
          database: str,
          immudb_address: str,
          public_key_file: str,
+         cache: ImmudbCache = None,
+         notarized_filter: BloomFilter = None,
      ):
          self.client = ImmudbWrapper(
              username=username,
@@ -29,30 +40,73 @@ class ImmudbCollector:
              public_key_file=public_key_file,
          )
          self.processor = None
+         self.cache = cache
+         self.notarized_filter = notarized_filter
+
+    def collect_package_by_hash(self, hash: str, allow_negative: bool = False) -> Package:
+        """Return the package notarized with hash, or raise KeyError.
 
-    def collect_package_by_hash(self, hash: str) -> Package:
-        immudb_info = self._extract_immudb_info_about_package(hash=hash)
+        With allow_negative, hashes known to be absent by notarized_filter or
+        by the negative cache are not looked up. Only callers which fall back
+        to the package data, like the iso subcommand, should allow it, since
+        artifacts of a build may be notarized after they were found absent.
+        """
+        immudb_info = self._extract_immudb_info_about_package(hash=hash, allow_negative=allow_negative)
         self.processor = processor_factory(immudb_info, hash)
         return self.processor.get_package()
 
-    def collect_package_by_package(self, rpm_package: Path) -> Package:
-        immudb_info = self._extract_immudb_info_about_package(rpm_package=str(rpm_package))
+    def collect_package_by_package(self, rpm_package: Path, allow_negative: bool = False) -> Package:
+        immudb_info = self._extract_immudb_info_about_package(rpm_package=str(rpm_package), allow_negative=allow_negative)
         self.processor = processor_factory(immudb_info, hash=None)
         return self.processor.get_package()
 
-    def _extract_immudb_info_about_package(self, hash: str = None, rpm_package: str = None) -> dict:
-        response = {}
-        if hash != None :
-            response = self.client.authenticate(hash)
-        elif rpm_package != None :
-            response = self.client.authenticate_file(rpm_package)
-        else:
+    def _extract_immudb_info_about_package(
+        self,
+        hash: str = None,
+        rpm_package: str = None,
+        allow_negative: bool = False,
+    ) -> dict:
+        ### NOTE:
+        # ImmudbWrapper.authenticate_file() only hashes the file and then
+        # authenticates that hash. We hash it here instead, so that records
+        # looked up by file can be served from the cache as well.
+        if hash is None and rpm_package is not None:
+            hash = hash_file(rpm_package)
+        if hash is None:
             raise RuntimeError(
                 'Unexpected situation has occurred. '
                 'Required info to to extract immudb info has not been provided.'
             )
 
+        if self.cache is not None:
+            cached = self.cache.get(hash)
+            if cached is not None:
+                return cached
+
+        ### NOTE:
+        # Hashes known to be absent are answered like immudb answers them,
+        # without Metadata, so that callers fall back the same way.
+        if allow_negative and self.notarized_filter is not None and hash not in self.notarized_filter:
+            _logger.debug(f'{hash} is not in the filter of notarized hashes')
+            return {'timestamp': None}
+        if allow_negative and self.cache is not None and self.cache.is_missing(hash):
+            _logger.debug(f'{hash} has been recently found absent from immudb')
+            return {'timestamp': None}
+
+        response = self.client.authenticate(hash)
         result = response.get('value', {})
         result['timestamp'] = response.get('timestamp')
+
+        ### NOTE:
+        # Only notarized records are immutable. Absent hashes may be
+        # notarized later, so they are stored for the negative TTL only,
+        # and other lookup failures are never stored.
+        if self.cache is not None and 'Metadata' in result:
+            self.cache.put(hash, result)
+        elif self.cache is not None and self._is_not_found(response):
+            self.cache.put_missing(hash)
         return result
 
+    @staticmethod
+    def _is_not_found(response: dict) -> bool:
+        return 'error' not in response or NOT_FOUND_ERROR in str(response['error'])
@@ -1,28 +1,46 @@
 import configparser
 import io
+import mmap
 import os
 import pycdlib
+import random
 import tempfile
+from contextlib import contextmanager
+from logging import getLogger
 from pathlib import Path
 from typing import ClassVar, Iterator
 
-from alma_sbom.data import Iso
+from pycdlib.dr import DirectoryRecord
+from pycdlib.inode import Inode
+
+from alma_sbom.data import Iso, Package
+
+from .repodata import get_primary_location, open_metadata, iter_packages_from_primary
+from .utils import FileWindow, hash_file, hash_window
+
+_logger = getLogger(__name__)
 
 class IsoCollector:
     PATH_TO_TREEINFO: ClassVar[str] = Path('/.treeinfo')
     DVD_REPO_LIST: ClassVar[list[str]] = ['AppStream', 'BaseOS']
     MINIMAL_REPO_LIST: ClassVar[list[str]] = ['Minimal']
+    PATH_TO_REPOMD: ClassVar[Path] = Path('repodata/repomd.xml')
 
     iso: pycdlib.PyCdlib
     config: configparser.ConfigParser
+    memfd: int
     memfd_path: Path
     repositories_info: dict
+    zero_copy: bool
 
-    def __init__(self):
+    def __init__(self, zero_copy: bool = False):
         self.iso = pycdlib.PyCdlib()
         self.config = configparser.ConfigParser()
-        memfd = os.memfd_create('package', flags=0)
-        self.memfd_path = Path(f'/proc/self/fd/{memfd}')
+        self.memfd = os.memfd_create('package', flags=0)
+        self.memfd_path = Path(f'/proc/self/fd/{self.memfd}')
+        self.zero_copy = zero_copy
+        self._image_fd = None
+        self._image_mmap = None
 
     def collect_iso_by_file(self, iso_image: Path) -> Iso:
         self._read_iso(iso_image)
@@ -47,8 +65,79 @@ class IsoCollector:
             for _ in self._iter_packages_per_repo(variant_packages_repo):
                 yield
 
+    def iter_package_paths(self) -> Iterator[Path]:
+        """Yield the Rock Ridge path of each package in the same order as iter_packages()"""
+        for variant_packages_repo in self.repositories_info.values():
+            for _, full_rr_path in self._iter_package_records(variant_packages_repo):
+                yield full_rr_path
+
+    def extract_package(self, full_rr_path: Path) -> Path:
+        """Extract the package at full_rr_path into the memfd and return the memfd path"""
+        self._extract_package(full_rr_path)
+        return self.memfd_path
+
+    @contextmanager
+    def open_package_window(self, full_rr_path: Path) -> Iterator[FileWindow]:
+        """Provide a zero copy window over the package at full_rr_path"""
+        if not self.zero_copy:
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                'IsoCollector must be created with zero_copy=True '
+                'to call IsoCollector.open_package_window()'
+            )
+        record = self.iso.get_record(rr_path=str(full_rr_path))
+        window = self._get_package_window(record, full_rr_path)
+        try:
+            yield window
+        finally:
+            window.release()
+
+    def iter_package_windows(self) -> Iterator[FileWindow]:
+        """Yield a zero copy window over each package stored in the ISO image.
+
+        Each package is resolved to the extent holding its data, and the window
+        is a slice of a mmap of the image, so nothing is copied out of the
+        image. Packages that are not stored as one extent of the image fall
+        back to being extracted into the memfd. Windows are only valid until
+        the next package is requested.
+        """
+        if not self.zero_copy:
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                'IsoCollector must be created with zero_copy=True '
+                'to call IsoCollector.iter_package_windows()'
+            )
+        for variant_packages_repo in self.repositories_info.values():
+            for record, rr_path in self._iter_package_records(variant_packages_repo):
+                window = self._get_package_window(record, rr_path)
+                try:
+                    yield window
+                finally:
+                    window.release()
+
+    def collect_packages_from_repodata(self, verify_count: int = 0) -> list[Package]:
+        """Make the package list from the repodata of each repository in the ISO image.
+
+        No package is read, except verify_count randomly chosen packages whose
+        checksums are compared with the ones in repodata.
+        """
+        packages = []
+        locations = []
+        for repository in self._get_repositories_path().values():
+            for pkg, location in self._iter_packages_from_repodata(repository):
+                packages.append(pkg)
+                locations.append(repository / location)
+
+        for index in random.sample(range(len(packages)), min(verify_count, len(packages))):
+            self._verify_package_checksum(locations[index], packages[index].hashs[0].value)
+
+        return packages
+
     def _read_iso(self, iso_image: Path) -> None:
         self.iso.open(iso_image)
+        if self.zero_copy:
+            self._image_fd = os.open(iso_image, os.O_RDONLY)
+            self._image_mmap = mmap.mmap(self._image_fd, 0, access=mmap.ACCESS_READ)
         with tempfile.NamedTemporaryFile(delete=True) as tmp:
             self.iso.get_file_from_iso(local_path=tmp.name, rr_path=str(self.PATH_TO_TREEINFO))
             self.config.read(tmp.name)
@@ -77,6 +166,40 @@ class IsoCollector:
                 raise RuntimeError('Unexpected situation has occurred')
         return variant_packages
 
+    def _get_repositories_path(self) -> dict[str, Path]:
+        repositories_path = {}
+        for variant in self.repositories_info:
+            section_name = f'variant-{variant}'
+            if 'repository' not in self.config[section_name]:
+                raise KeyError(f'Can not get repository path of {variant} variant.')
+            repositories_path[variant] = Path('/') / self.config[section_name]['repository']
+        return repositories_path
+
+    def _iter_packages_from_repodata(self, repository: Path) -> Iterator[tuple[Package, str]]:
+        repomd = self._read_file_from_iso(repository / self.PATH_TO_REPOMD)
+        primary_location = get_primary_location(io.BytesIO(repomd))
+        primary = self._read_file_from_iso(repository / primary_location)
+        with open_metadata(primary, primary_location) as fd:
+            yield from iter_packages_from_primary(fd)
+
+    def _read_file_from_iso(self, full_rr_path: Path) -> bytes:
+        with io.BytesIO() as fd:
+            self.iso.get_file_from_iso_fp(fd, rr_path=str(full_rr_path))
+            return fd.getvalue()
+
+    def _verify_package_checksum(self, full_rr_path: Path, expected_hash: str) -> None:
+        if self.zero_copy:
+            with self.open_package_window(full_rr_path) as window:
+                actual_hash = hash_window(window)
+        else:
+            actual_hash = hash_file(self.extract_package(full_rr_path))
+        if actual_hash != expected_hash:
+            raise ValueError(
+                f'Checksum of {full_rr_path} does not match repodata. '
+                f'repodata: {expected_hash}, actual: {actual_hash}'
+            )
+        _logger.debug(f'Checksum of {full_rr_path} matches repodata')
+
     def _get_releasever(self) -> str:
         if 'general' in self.config and 'version' in self.config['general']:
             return self.config['general']['version']
@@ -91,15 +214,52 @@ class IsoCollector:
         raise KeyError('Cat not detect image type.')
 
     def _iter_packages_per_repo(self, variant_packages_repo: str) -> Iterator[None]:
+        for _, full_rr_path in self._iter_package_records(variant_packages_repo):
+            self._extract_package(full_rr_path)
+            yield
+
+    def _iter_package_records(self, variant_packages_repo: str) -> Iterator[tuple[DirectoryRecord, Path]]:
         variant_path = Path('/') / variant_packages_repo
         variant_entry = self.iso.get_record(iso_path=str(variant_path))
         for child in variant_entry.children:
             pkg_name = child.rock_ridge.name().decode('utf8')
             if pkg_name.endswith('.rpm'):
-                full_rr_path = variant_path / pkg_name
-                self.iso.get_file_from_iso(
-                    local_path=self.memfd_path,
-                    rr_path=str(full_rr_path),
-                )
-                yield
+                yield child, variant_path / pkg_name
+
+    def _extract_package(self, full_rr_path: Path) -> None:
+        self.iso.get_file_from_iso(
+            local_path=self.memfd_path,
+            rr_path=str(full_rr_path),
+        )
+
+    def _get_package_window(self, record: DirectoryRecord, full_rr_path: Path) -> FileWindow:
+        ino = record.inode
+        if (
+            ino is not None
+            and ino.original_data_location == Inode.DATA_ON_ORIGINAL_ISO
+            and ino.boot_info_table is None
+            and record.data_continuation is None
+        ):
+            offset = ino.fp_offset
+            length = record.get_data_length()
+            return FileWindow(
+                fileno=self._image_fd,
+                offset=offset,
+                length=length,
+                data=memoryview(self._image_mmap)[offset:offset + length],
+            )
+
+        _logger.debug(f'{full_rr_path} is not stored in one extent, extracting it')
+        self._extract_package(full_rr_path)
+        length = os.fstat(self.memfd).st_size
+        ### NOTE:
+        # The memfd is rewritten for every package, so it is mapped per window
+        # and the mapping is released with the window.
+        memfd_mmap = mmap.mmap(self.memfd, length, access=mmap.ACCESS_READ)
+        return FileWindow(
+            fileno=self.memfd,
+            offset=0,
+            length=length,
+            data=memoryview(memfd_mmap),
+        )
 
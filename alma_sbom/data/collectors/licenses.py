@@ -0,0 +1,37 @@
+from functools import lru_cache
+from license_expression import get_spdx_licensing, ExpressionError, Licensing
+
+from alma_sbom.profiling import stage
+from alma_sbom.type import Licenses
+
+### NOTE:
+# An ISO image has thousands of packages but only a few hundred distinct
+# license strings, so this bound keeps every one of them cached.
+LICENSES_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=None)
+def get_licensing() -> Licensing:
+    """Return the process wide SPDX licensing, loading the license index on first use"""
+    return get_spdx_licensing()
+
+def parse_licenses(licenses_str: str) -> Licenses:
+    """Make Licenses from a license string such as the RPMTAG_LICENSE value"""
+    ### NOTE:
+    # Licenses is mutable, so each package gets its own instance built from
+    # the cached ids.
+    with stage('licenses'):
+        ids = _parse_license_ids(licenses_str)
+    return Licenses(ids=list(ids), expression=licenses_str)
+
+def licenses_cache_info():
+    """Return hits, misses, maxsize and currsize of the license cache"""
+    return _parse_license_ids.cache_info()
+
+@lru_cache(maxsize=LICENSES_CACHE_SIZE)
+def _parse_license_ids(licenses_str: str) -> tuple[str, ...]:
+    licensing = get_licensing()
+    try:
+        parsed = licensing.parse(licenses_str, validate=True)
+    except ExpressionError as err:
+        return ()
+    return tuple(str(sym) for sym in licensing.license_symbols(parsed))
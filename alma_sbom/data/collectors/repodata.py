@@ -0,0 +1,92 @@
+import bz2
+import gzip
+import io
+import lzma
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterator
+
+from alma_sbom.type import Hash
+from alma_sbom.data.models import Package, PackageNevra
+
+from .licenses import parse_licenses
+
+REPO_NS = 'http://linux.duke.edu/metadata/repo'
+COMMON_NS = 'http://linux.duke.edu/metadata/common'
+RPM_NS = 'http://linux.duke.edu/metadata/rpm'
+
+def get_primary_location(repomd: BinaryIO) -> str:
+    """Return the location of primary metadata, relative to the repository, from repomd.xml"""
+    root = ET.parse(repomd).getroot()
+    for data in root.iterfind(f'{{{REPO_NS}}}data'):
+        if data.get('type') == 'primary':
+            return data.find(f'{{{REPO_NS}}}location').get('href')
+    raise KeyError('repomd.xml does not have primary metadata')
+
+def open_metadata(data: bytes, location: str) -> BinaryIO:
+    """Open repository metadata, decompressing it according to its location suffix"""
+    fileobj = io.BytesIO(data)
+    if location.endswith('.gz'):
+        return gzip.GzipFile(fileobj=fileobj)
+    if location.endswith('.xz'):
+        return lzma.LZMAFile(fileobj)
+    if location.endswith('.bz2'):
+        return bz2.BZ2File(fileobj)
+    if location.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError(
+                f'zstandard module is required to read {location}'
+            ) from e
+        return zstandard.ZstdDecompressor().stream_reader(fileobj)
+    return fileobj
+
+def iter_packages_from_primary(primary: BinaryIO) -> Iterator[tuple[Package, str]]:
+    """Yield each package in primary.xml with its location relative to the repository.
+
+    The metadata is parsed incrementally, and each package element is
+    discarded once it has been converted into a Package.
+    """
+    package_tag = f'{{{COMMON_NS}}}package'
+    for _, elem in ET.iterparse(primary, events=('end',)):
+        if elem.tag != package_tag:
+            continue
+        if elem.get('type') == 'rpm':
+            yield _package_from_element(elem), elem.find(f'{{{COMMON_NS}}}location').get('href')
+        elem.clear()
+
+def _package_from_element(elem: ET.Element) -> Package:
+    def common(tag: str) -> ET.Element:
+        return elem.find(f'{{{COMMON_NS}}}{tag}')
+
+    def rpm_format(tag: str) -> str:
+        return elem.findtext(f'{{{COMMON_NS}}}format/{{{RPM_NS}}}{tag}')
+
+    version = common('version')
+    checksum = common('checksum')
+    if checksum.get('type') != 'sha256':
+        raise ValueError(f"Unsupported checksum type in repodata: {checksum.get('type')}")
+
+    package_nevra = PackageNevra(
+        ### NOTE:
+        # Repodata always has an epoch, and an absent epoch is written as 0,
+        # which is how alma-sbom represents null epoch as well.
+        epoch = int(version.get('epoch') or 0),
+        name = common('name').text,
+        version = version.get('ver'),
+        release = version.get('rel'),
+        arch = common('arch').text,
+    )
+    pkg = Package(
+        package_nevra = package_nevra,
+        source_rpm = rpm_format('sourcerpm') or None,
+        hashs = [Hash(value=checksum.text)],
+    )
+
+    licenses_str = rpm_format('license')
+    if licenses_str:
+        pkg.licenses = parse_licenses(licenses_str)
+    pkg.summary = common('summary').text
+    pkg.description = common('description').text
+
+    return pkg
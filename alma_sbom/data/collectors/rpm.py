@@ -1,12 +1,14 @@
-import hashlib
+import os
 import rpm
-from license_expression import get_spdx_licensing, ExpressionError
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Union
 
-from alma_sbom.type import Hash, Licenses
+from alma_sbom.type import Hash
 from alma_sbom.data.models import Package, PackageNevra
 
+from .licenses import parse_licenses
+from .utils import FileWindow, hash_file, hash_window, map_file
+
 class RpmCollector:
     ts: rpm.TransactionSet
 
@@ -14,9 +16,28 @@ class RpmCollector:
         self.ts = rpm.TransactionSet()
 
     def collect_package_from_file(self, rpm_package: Path) -> Package:
+        ### NOTE:
+        # The file is mapped and handled as a window of itself, so the
+        # checksum is computed from the mapping in one pass while rpm reads
+        # only the header through the same descriptor. Callers can use the
+        # checksum in Package.hashs to look the package up in immudb without
+        # hashing the file again.
+        with ExitStack() as stack:
+            try:
+                window = stack.enter_context(map_file(rpm_package))
+            except OSError as e:
+                e.args = (f'Error opening RPM package: {str(e)}',) + e.args[1:]
+                raise
+            return self.collect_package_from_window(window)
+
+    def collect_package_from_window(self, window: FileWindow) -> Package:
+        """Collect a package stored in a window of a larger file, e.g. an ISO image"""
+        ### NOTE:
+        # rpm reads the header sequentially from the current offset of the
+        # descriptor, so it only reads the header region of the window.
         try:
-            with open(rpm_package) as fd:
-                hdr = self.ts.hdrFromFdno(fd)
+            os.lseek(window.fileno, window.offset, os.SEEK_SET)
+            hdr = self.ts.hdrFromFdno(window.fileno)
         except (OSError, rpm.error) as e:
             e.args = (f'Error opening RPM package: {str(e)}',) + e.args[1:]
             raise
@@ -24,6 +45,9 @@ class RpmCollector:
             e.args = (f'Unknown error while processing RPM package: {str(e)}',) + e.args[1:]
             raise
 
+        return self._package_from_header(hdr, hash_window(window))
+
+    def _package_from_header(self, hdr: rpm.hdr, pkg_hash: str) -> Package:
         package_nevra = PackageNevra(
             ### NOTE:
             # In alma-sbom, null epoch is represented as 0
@@ -37,7 +61,7 @@ class RpmCollector:
         pkg = Package(
             package_nevra = package_nevra,
             source_rpm = hdr[rpm.RPMTAG_SOURCERPM],
-            hashs = [Hash(value=hash_file(rpm_package))],
+            hashs = [Hash(value=pkg_hash)],
             ### NOTE:
             ##  There are little bit difference of buildtime between immudb_metadata & rpm_package.
             ##  So, now we don't set buildtime using rpm_package info.
@@ -53,48 +77,8 @@ class RpmCollector:
             #sbom_properties = None,
         )
 
-        pkg.licenses = _proc_licenses(hdr[rpm.RPMTAG_LICENSE])
+        pkg.licenses = parse_licenses(hdr[rpm.RPMTAG_LICENSE])
         pkg.summary = hdr[rpm.RPMTAG_SUMMARY]
         pkg.description = hdr[rpm.RPMTAG_DESCRIPTION]
 
         return pkg
-
-def _proc_licenses(licenses_str: str) -> Licenses:
-    licensing = get_spdx_licensing()
-    licenses = Licenses(ids=[], expression=licenses_str)
-    try:
-        parsed = licensing.parse(licenses_str, validate=True)
-    except ExpressionError as err:
-        pass
-    else:
-        symbols = licensing.license_symbols(parsed)
-        for sym in symbols:
-            licenses.ids.append(str(sym))
-    return licenses
-
-def hash_file(file_path: Union[str, Path], buff_size: int = 1048576) -> str:
-    """
-    Returns SHA256 checksum (hexadecimal digest) of the file.
-
-    Parameters
-    ----------
-    file_path : str
-        File path to hash.
-    buff_size : int
-        Number of bytes to read at once.
-
-    Returns
-    -------
-    str
-        Checksum (hexadecimal digest) of the file.
-    """
-    hasher = hashlib.sha256()
-
-    with open(file_path, 'rb') as fd:
-        buff = fd.read(buff_size)
-        while len(buff):
-            hasher.update(buff)
-            buff = fd.read(buff_size)
-
-    return hasher.hexdigest()
-
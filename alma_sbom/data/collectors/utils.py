@@ -0,0 +1,93 @@
+import hashlib
+import os
+import mmap
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, Union
+
+@dataclass
+class FileWindow:
+    """Zero copy view of the length bytes at offset of an opened file.
+
+    data is a memoryview of a mmap of the file, so reading it does not copy
+    the bytes into user space buffers. fileno is the opened file, which can
+    be handed to APIs that only read from file descriptors.
+    """
+    fileno: int
+    offset: int
+    length: int
+    data: memoryview
+
+    def release(self) -> None:
+        self.data.release()
+
+@contextmanager
+def map_file(file_path: Union[str, Path]) -> Iterator[FileWindow]:
+    """Open file_path and yield a FileWindow of the whole file"""
+    with open(file_path, 'rb') as fd:
+        length = os.fstat(fd.fileno()).st_size
+        ### NOTE:
+        # An empty file cannot be mapped, so it is an empty window, which
+        # the readers of the window reject as they do for any short file.
+        file_mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) if length else None
+        window = FileWindow(
+            fileno=fd.fileno(),
+            offset=0,
+            length=length,
+            data=memoryview(file_mmap if file_mmap is not None else b''),
+        )
+        try:
+            yield window
+        finally:
+            window.release()
+            if file_mmap is not None:
+                file_mmap.close()
+
+def hash_file(file_path: Union[str, Path], buff_size: int = 1048576) -> str:
+    """
+    Returns SHA256 checksum (hexadecimal digest) of the file.
+
+    Parameters
+    ----------
+    file_path : str
+        File path to hash.
+    buff_size : int
+        Number of bytes to read at once.
+
+    Returns
+    -------
+    str
+        Checksum (hexadecimal digest) of the file.
+    """
+    with open(file_path, 'rb') as fd:
+        return hash_fileobj(fd, buff_size)
+
+def hash_fileobj(fd: BinaryIO, buff_size: int = 1048576) -> str:
+    """
+    Returns SHA256 checksum (hexadecimal digest) of the rest of an opened file.
+
+    Parameters
+    ----------
+    fd : BinaryIO
+        File object opened in binary mode, read from its current position.
+    buff_size : int
+        Number of bytes to read at once.
+
+    Returns
+    -------
+    str
+        Checksum (hexadecimal digest) of the file.
+    """
+    hasher = hashlib.sha256()
+
+    buff = fd.read(buff_size)
+    while len(buff):
+        hasher.update(buff)
+        buff = fd.read(buff_size)
+
+    return hasher.hexdigest()
+
+def hash_window(window: FileWindow) -> str:
+    """Returns SHA256 checksum (hexadecimal digest) of the data in window"""
+    return hashlib.sha256(window.data).hexdigest()
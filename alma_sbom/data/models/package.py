@@ -1,7 +1,7 @@
-from dataclasses import dataclass
 from enum import Enum
 from logging import getLogger
 
+from alma_sbom.compact import slotted_dataclass
 from alma_sbom.type import Hash, PackageNevra, Licenses
 from alma_sbom.data.attributes.property import (
     Property,
@@ -12,7 +12,7 @@ from alma_sbom.data.attributes.property import (
 
 _logger = getLogger(__name__)
 
-@dataclass
+@slotted_dataclass
 class Package:
     ### info as package component of SBOM
     package_nevra: PackageNevra = None
@@ -45,6 +45,12 @@ class Package:
 
         return f'{base_part}{qualifier_part}'
 
+    def get_purl_qualifiers(self) -> dict[str, str]:
+        qualifiers = self.package_nevra.get_purl_qualifiers()
+        if self.source_rpm:
+            qualifiers['upstream'] = self.source_rpm
+        return qualifiers
+
     def get_properties(self) -> list[Property]:
         return (self.package_properties.to_properties() if self.package_properties is not None else []) + \
                (self.build_properties.to_properties() if self.build_properties is not None else []) + \
@@ -0,0 +1,146 @@
+import gzip
+import json
+import typing
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Iterator, Union
+
+from alma_sbom._version import __version__
+from alma_sbom.data.attributes.property import (
+    BuildSourceProperties,
+    GitSourceProperties,
+    SrpmSourceProperties,
+)
+
+from .models import Package, Build, Iso
+
+### NOTE:
+# A snapshot is NDJSON. The first line is a header with the kind of the
+# collected object and its fields except packages, and each following line
+# is a package. Packages are read one line at a time, so an SBOM can be
+# rendered from a snapshot without holding all of them in memory.
+# Snapshots whose name ends with .gz are compressed with gzip.
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_KINDS: dict[str, type] = {
+    'package': Package,
+    'build': Build,
+    'iso': Iso,
+}
+
+SOURCE_PROPERTIES_CLASSES: dict[str, type[BuildSourceProperties]] = {
+    'git': GitSourceProperties,
+    'srpm': SrpmSourceProperties,
+}
+
+Collected = Union[Package, Build, Iso]
+
+def write_snapshot(output_file: Path, obj: Collected) -> None:
+    """Write obj to output_file. Packages of obj may be an iterator, which is consumed"""
+    kind = get_kind(obj)
+    if kind == 'package':
+        header_fields, packages = {}, [obj]
+    else:
+        header_fields = {f.name: _to_dict(getattr(obj, f.name)) for f in fields(obj) if f.name != 'packages'}
+        packages = obj.packages
+
+    with _open(output_file, 'w') as fd:
+        _write_line(fd, {
+            'version': SNAPSHOT_VERSION,
+            'alma_sbom_version': __version__,
+            'kind': kind,
+            kind: header_fields,
+        })
+        for pkg in packages:
+            _write_line(fd, _to_dict(pkg))
+
+def get_kind(obj: Collected) -> str:
+    """Return the kind of snapshot of obj, which is the subcommand collecting it"""
+    for kind, cls in SNAPSHOT_KINDS.items():
+        if isinstance(obj, cls):
+            return kind
+    raise TypeError(f'Unexpected type of collected data: {type(obj).__name__}')
+
+def read_snapshot(snapshot: Path, stream: bool = False) -> Collected:
+    """Read the object written by write_snapshot().
+
+    With stream, packages of a build or an ISO are an iterator reading the
+    snapshot while they are consumed, instead of a list.
+    """
+    fd = _open(snapshot, 'r')
+    try:
+        header = json.loads(fd.readline())
+        if header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f'Unsupported snapshot version of {snapshot}: {header.get("version")}')
+        kind = header['kind']
+        if kind not in SNAPSHOT_KINDS:
+            raise ValueError(f'Unknown kind of snapshot {snapshot}: {kind}')
+    except BaseException:
+        fd.close()
+        raise
+
+    packages = _iter_packages(fd)
+    if kind == 'package':
+        pkg = next(packages)
+        packages.close()
+        return pkg
+    obj = _from_dict(SNAPSHOT_KINDS[kind], header[kind])
+    obj.packages = packages if stream else list(packages)
+    return obj
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == '.gz':
+        return gzip.open(path, f'{mode}t', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def _write_line(fd: IO[str], value: dict) -> None:
+    fd.write(json.dumps(value, separators=(',', ':')))
+    fd.write('\n')
+
+def _iter_packages(fd: IO[str]) -> Iterator[Package]:
+    with fd:
+        for line in fd:
+            if line.strip():
+                yield _from_dict(Package, json.loads(line))
+
+def _to_dict(value: Any) -> Any:
+    if is_dataclass(value):
+        ### None is omitted to keep snapshots compact
+        return {
+            f.name: _to_dict(getattr(value, f.name))
+            for f in fields(value)
+            if getattr(value, f.name) is not None
+        }
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return [_to_dict(item) for item in value]
+    return value
+
+def _from_dict(hint: Any, value: Any) -> Any:
+    """Make an instance of the annotated type hint from what _to_dict() returned"""
+    if value is None:
+        return None
+    if typing.get_origin(hint) is Union:
+        hint = next(arg for arg in typing.get_args(hint) if arg is not type(None))
+    if typing.get_origin(hint) is list:
+        item_hint = typing.get_args(hint)[0]
+        return [_from_dict(item_hint, item) for item in value]
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return hint(value)
+    if isinstance(hint, type) and is_dataclass(hint):
+        if hint is BuildSourceProperties:
+            hint = SOURCE_PROPERTIES_CLASSES[value['source_type']]
+        return hint(**{name: _from_dict(item_hint, value.get(name)) for name, item_hint in _init_fields(hint)})
+    return value
+
+@lru_cache(maxsize=None)
+def _init_fields(cls: type) -> tuple[tuple[str, Any], ...]:
+    """Return names and type hints of the arguments of __init__() of a dataclass"""
+    hints = typing.get_type_hints(cls)
+    if issubclass(cls, BuildSourceProperties) and cls is not BuildSourceProperties:
+        ### source_type is set by __init__() of each subclass
+        return tuple((f.name, hints[f.name]) for f in fields(cls) if f.name != 'source_type')
+    return tuple((f.name, hints[f.name]) for f in fields(cls) if f.init)
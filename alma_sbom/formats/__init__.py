@@ -1,14 +1,27 @@
+import importlib
 
 from alma_sbom.type import SbomRecordType
 from .document import Document
-from .spdx.document import SPDXDocument
-from .cyclonedx.document import CDXDocument
 
-document_classes: dict[SbomRecordType, type[Document]] = {
-    SbomRecordType.SPDX: SPDXDocument,
-    SbomRecordType.CYCLONEDX: CDXDocument,
+### NOTE:
+# Document classes are given by their import paths, so that only the
+# backend (spdx_tools or cyclonedx-python-lib) of the selected record type
+# is imported.
+document_classes: dict[SbomRecordType, str] = {
+    SbomRecordType.SPDX: 'alma_sbom.formats.spdx.document.SPDXDocument',
+    SbomRecordType.CYCLONEDX: 'alma_sbom.formats.cyclonedx.document.CDXDocument',
 }
 
-def document_factory(format: SbomRecordType) -> type[Document]:
-    return document_classes.get(format)
+### Document classes which write JSON documents while generating them
+stream_document_classes: dict[SbomRecordType, str] = {
+    SbomRecordType.SPDX: 'alma_sbom.formats.spdx.stream.SPDXJsonStreamDocument',
+    SbomRecordType.CYCLONEDX: 'alma_sbom.formats.cyclonedx.stream.CDXJsonStreamDocument',
+}
 
+def document_factory(format: SbomRecordType, stream: bool = False) -> type[Document]:
+    classes = stream_document_classes if stream else document_classes
+    class_path = classes.get(format)
+    if class_path is None:
+        return None
+    module_name, class_name = class_path.rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), class_name)
@@ -20,7 +20,7 @@ def component_from_package(package: Package) -> Component:
         publisher=constants.ALMAOS_VENDOR,
         hashes=[_make_hash(h) for h in package.hashs],
         cpe=package.get_cpe23(),
-        purl=PackageURL.from_string(package.get_purl()),
+        purl=_make_purl(package),
         properties=[
             _make_property(prop) for prop in package.get_properties()
         ],
@@ -30,6 +30,18 @@ def component_from_package(package: Package) -> Component:
             if package.description else None ,
     )
 
+def _make_purl(package: Package) -> PackageURL:
+    ### Same as PackageURL.from_string(package.get_purl()), without parsing
+    ### the string which is made from these parts just before.
+    nevra = package.package_nevra
+    return PackageURL(
+        type='rpm',
+        namespace='almalinux',
+        name=nevra.name,
+        version=f'{nevra.version}-{nevra.release}',
+        qualifiers=package.get_purl_qualifiers(),
+    )
+
 def component_from_build(build: Build) -> Component:
     return Component(
         type=ComponentType.FRAMEWORK,
@@ -1,14 +1,20 @@
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, ClassVar
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from itertools import chain
+from typing import TYPE_CHECKING, ClassVar, Iterable, Iterator, Optional
 from logging import getLogger
 from pathlib import Path
 
 from cyclonedx.builder.this import this_component as cdx_lib_component
 from cyclonedx.model.bom import Bom
 from cyclonedx.model.component import Component
+from cyclonedx.model.dependency import Dependable, Dependency
 from cyclonedx.output import make_outputter
 from cyclonedx.schema import OutputFormat, SchemaVersion
+from sortedcontainers import SortedSet
 
 if TYPE_CHECKING:
     from cyclonedx.output import BaseOutput
@@ -22,6 +28,12 @@ from .component import component_from_package, component_from_build, component_f
 
 _logger = getLogger(__name__)
 
+### NOTE:
+# add_components() and _indexed_dependency_registration() depend on the
+# internals of this version of cyclonedx-python-lib, which is pinned in
+# setup.py. With any other version, the public API of Bom is used instead.
+CDX_LIB_PINNED_VERSION = '9.0.0'
+
 
 @dataclass
 class CDXFormatter:
@@ -44,7 +56,8 @@ class CDXFormatter:
             self.output_format_type,
             self.SCHEMA_VERSION,
         )
-        output = outputter.output_as_string(indent=4)
+        with _indexed_dependency_registration(bom):
+            output = outputter.output_as_string(indent=4)
         return output
 
 @dataclass
@@ -81,8 +94,7 @@ class CDXDocument(AlmasbomDocument):
     def from_build(cls, build: Build, file_format_type: SbomFileFormatType) -> 'CDXDocument':
         doc = cls._construct(file_format_type)
         doc.bom.metadata.component = component_from_build(build)
-        for pkg in build.packages:
-            doc.bom.components.add(component_from_package(pkg))
+        add_components(doc.bom, (component_from_package(pkg) for pkg in build.packages))
 
         return doc
 
@@ -90,8 +102,7 @@ class CDXDocument(AlmasbomDocument):
     def from_iso(cls, iso: Iso, file_format_type: SbomFileFormatType) -> 'CDXDocument':
         doc = cls._construct(file_format_type)
         doc.bom.metadata.component = component_from_iso(iso)
-        for pkg in iso.packages:
-            doc.bom.components.add(component_from_package(pkg))
+        add_components(doc.bom, (component_from_package(pkg) for pkg in iso.packages))
 
         return doc
 
@@ -100,3 +111,73 @@ class CDXDocument(AlmasbomDocument):
         with open(output_file, 'w') as fd:
             fd.write(pretty_output)
 
+
+def add_components(bom: Bom, components: Iterable[Component]) -> None:
+    """Add components to bom at once, sorted by a key computed once per component.
+
+    Each comparison of Components in the sorted set of a Bom builds tuples of
+    all their attributes, so adding them one by one gets slow with thousands
+    of packages. Components made from packages have the same type and no
+    group, so the key sorts them like the comparison of Components does,
+    except that components of the same name and version, e.g. multilib
+    packages, are ordered by the qualifiers of their purl before their
+    bom-refs.
+    """
+    if not _uses_pinned_cdx_lib():
+        bom.components.update(components)
+        return
+    ### NOTE:
+    # The setter of Bom.components makes a SortedSet without the key from
+    # what is given, so the keyed set is assigned to the attribute behind it.
+    bom._components = SortedSet(chain(bom.components, components), key=_component_sort_key)
+
+def _component_sort_key(component: Component) -> tuple:
+    purl_qualifiers = sorted(component.purl.qualifiers.items()) if component.purl else []
+    return component.name, component.version or '', purl_qualifiers, component.bom_ref.value or ''
+
+@contextmanager
+def _indexed_dependency_registration(bom: Bom) -> Iterator[None]:
+    """Make Bom.register_dependency() look up registered targets in a set.
+
+    Bom.validate(), which is called by the outputters, registers every
+    component with Bom.register_dependency(), which scans all dependencies
+    of the Bom for each of them.
+    """
+    if not _uses_pinned_cdx_lib():
+        yield
+        return
+    ### NOTE:
+    # BomRef hashes by its value as it compares by its value, and refs without
+    # a value are only equal to themselves, so the set finds what the scan of
+    # Bom.register_dependency() finds.
+    registered = {dependency.ref for dependency in bom.dependencies}
+
+    def register_dependency(target: Dependable, depends_on: Optional[Iterable[Dependable]] = None) -> None:
+        if depends_on:
+            depends_on = list(depends_on)
+            Bom.register_dependency(bom, target, depends_on)
+            registered.update(dependable.bom_ref for dependable in depends_on)
+        elif target.bom_ref not in registered:
+            bom.dependencies.add(Dependency(ref=target.bom_ref))
+        registered.add(target.bom_ref)
+
+    bom.register_dependency = register_dependency
+    try:
+        yield
+    finally:
+        del bom.register_dependency
+
+@lru_cache(maxsize=None)
+def _uses_pinned_cdx_lib() -> bool:
+    try:
+        installed_version = version('cyclonedx-python-lib')
+    except PackageNotFoundError:
+        ### e.g. the library is vendored without its distribution metadata
+        installed_version = 'unknown version'
+    if installed_version != CDX_LIB_PINNED_VERSION:
+        _logger.warning(
+            f'cyclonedx-python-lib {installed_version} is installed instead of '
+            f'{CDX_LIB_PINNED_VERSION}, CycloneDX SBOMs of many packages are written slowly'
+        )
+        return False
+    return True
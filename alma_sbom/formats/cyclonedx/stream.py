@@ -0,0 +1,89 @@
+import json
+from dataclasses import dataclass
+from typing import ClassVar, Iterable, Iterator
+from logging import getLogger
+from pathlib import Path
+
+from cyclonedx.model.bom import Bom
+from cyclonedx.schema.schema import SCHEMA_VERSIONS
+
+from alma_sbom.data.models import Package, Build, Iso
+from alma_sbom.type import SbomFileFormatType
+from alma_sbom.formats.document import Document as AlmasbomDocument
+from alma_sbom.formats.stream import JsonStreamWriter, open_atomic
+
+from .component import component_from_package, component_from_build, component_from_iso
+from .document import CDXDocument, CDXFormatter
+
+_logger = getLogger(__name__)
+
+
+@dataclass
+class CDXJsonStreamDocument(AlmasbomDocument):
+    """CycloneDX JSON document that writes each component as soon as it is made.
+
+    Only the metadata is kept in a Bom. Components are made from packages
+    while the document is written, so memory usage does not grow with the
+    number of components. Components are written in the order of packages
+    instead of the order of the sorted set of a Bom.
+    """
+    BOM_REF_PREFIX: ClassVar[str] = 'BomRef.component'
+
+    bom: Bom
+    packages: Iterable[Package]
+
+    @classmethod
+    def _construct(cls, file_format_type: SbomFileFormatType, packages: Iterable[Package]) -> 'CDXJsonStreamDocument':
+        if file_format_type != SbomFileFormatType.JSON:
+            raise ValueError(f'Streaming is not supported for {file_format_type.value} file format')
+        return cls(
+            bom=CDXDocument._construct(file_format_type).bom,
+            packages=packages,
+        )
+
+    @classmethod
+    def from_package(cls, package: Package, file_format_type: SbomFileFormatType) -> 'CDXJsonStreamDocument':
+        doc = cls._construct(file_format_type, packages=[])
+        doc.bom.metadata.component = component_from_package(package)
+        return doc
+
+    @classmethod
+    def from_build(cls, build: Build, file_format_type: SbomFileFormatType) -> 'CDXJsonStreamDocument':
+        doc = cls._construct(file_format_type, packages=build.packages)
+        doc.bom.metadata.component = component_from_build(build)
+        return doc
+
+    @classmethod
+    def from_iso(cls, iso: Iso, file_format_type: SbomFileFormatType) -> 'CDXJsonStreamDocument':
+        doc = cls._construct(file_format_type, packages=iso.packages)
+        doc.bom.metadata.component = component_from_iso(iso)
+        return doc
+
+    def write(self, output_file: Path) -> None:
+        ### NOTE:
+        # Everything except components and their dependencies is rendered by
+        # cyclonedx-python-lib from the metadata only Bom, so those parts are
+        # identical to the output of CDXDocument.
+        skeleton = json.loads(CDXFormatter.from_format_type(SbomFileFormatType.JSON).write(self.bom))
+        root_dependencies = skeleton.pop('dependencies', [])
+
+        with open_atomic(output_file) as fd, JsonStreamWriter(fd) as writer:
+            count = writer.write_array('components', self._iter_components())
+            writer.write_array('dependencies', self._iter_dependencies(root_dependencies, count))
+            for key, value in skeleton.items():
+                writer.write_member(key, value)
+
+    def _iter_components(self) -> Iterator[dict]:
+        view = SCHEMA_VERSIONS[CDXFormatter.SCHEMA_VERSION]
+        for index, pkg in enumerate(self.packages):
+            component = component_from_package(pkg)
+            component.bom_ref.value = self._get_bom_ref(index)
+            yield json.loads(component.as_json(view_=view))
+
+    def _iter_dependencies(self, root_dependencies: list, count: int) -> Iterator[dict]:
+        yield from root_dependencies
+        for index in range(count):
+            yield {'ref': self._get_bom_ref(index)}
+
+    def _get_bom_ref(self, index: int) -> str:
+        return f'{self.BOM_REF_PREFIX}.{index}'
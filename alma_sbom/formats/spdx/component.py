@@ -38,17 +38,24 @@ def set_package_component(document: Document, package: Package, pkgid: int) -> N
     pkg, rel = component_from_package(package, pkgid)
     document.packages += [pkg]
     document.relationships += [rel]
-
-    for prop in package.get_properties():
-        if prop is not None and prop.value is not None:
-            note = _make_annotation(prop, pkgid)
-            document.annotations += [note]
+    document.annotations += annotations_from_package(package, pkgid)
 
 def set_build_component(document: Document, build: Build, pkgid: int) -> None:
-    for prop in build.get_properties():
-        if prop is not None and prop.value is not None:
-            note = _make_annotation(prop, pkgid)
-            document.annotations += [note]
+    document.annotations += annotations_from_build(build, pkgid)
+
+def annotations_from_package(package: Package, pkgid: int) -> list[Annotation]:
+    return [
+        _make_annotation(prop, pkgid)
+        for prop in package.get_properties()
+        if prop is not None and prop.value is not None
+    ]
+
+def annotations_from_build(build: Build, pkgid: int) -> list[Annotation]:
+    return [
+        _make_annotation(prop, pkgid)
+        for prop in build.get_properties()
+        if prop is not None and prop.value is not None
+    ]
 
 def set_iso_component(document: Document, iso: Iso, pkgid: int) -> None:
     pass
@@ -59,11 +66,7 @@ def component_from_package(package: Package, pkgid: int) -> tuple[PackageCompone
         name=package.package_nevra.name,
         download_location=SpdxNoAssertion(),
     )
-    rel = Relationship(
-        spdx_element_id="SPDXRef-DOCUMENT",
-        relationship_type=RelationshipType.DESCRIBES,
-        related_spdx_element_id=pkgid,
-    )
+    rel = relationship_from_package_id(pkgid)
 
     pkg.checksums = [_make_hash(h) for h in package.hashs]
     pkg.version = package.package_nevra.get_EVR()
@@ -109,6 +112,13 @@ def component_from_package(package: Package, pkgid: int) -> tuple[PackageCompone
 
     return pkg, rel
 
+def relationship_from_package_id(pkgid: int) -> Relationship:
+    return Relationship(
+        spdx_element_id="SPDXRef-DOCUMENT",
+        relationship_type=RelationshipType.DESCRIBES,
+        related_spdx_element_id=pkgid,
+    )
+
 def _make_comment_from_property(prop: Property) -> str:
     return f'{prop.name}={prop.value}'
 
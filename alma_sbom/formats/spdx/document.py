@@ -2,7 +2,7 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Callable, ClassVar
+from typing import Callable, ClassVar, Optional
 from logging import getLogger
 from pathlib import Path
 from spdx_tools.spdx.model import (
@@ -15,11 +15,12 @@ from spdx_tools.spdx.writer.xml import xml_writer
 from spdx_tools.spdx.writer.yaml import yaml_writer
 from spdx_tools.spdx.writer.rdf import rdf_writer
 
-from alma_sbom.type import SbomFileFormatType
+from alma_sbom.type import SbomFileFormatType, ValidationMode
 from alma_sbom.data.models import Package, Build, Iso
 from alma_sbom.formats.document import Document as AlmasbomDocument
 
 from . import constants as spdx_consts
+from .validation import DocumentValidation, raise_if_invalid, validate_document_fast
 from .component import set_package_component, set_build_component, set_iso_component
 
 _logger = getLogger(__name__)
@@ -35,10 +36,11 @@ class SPDXFormatter:
         SbomFileFormatType.RDF: rdf_writer,
     }
     formatter: Callable
+    file_format_type: SbomFileFormatType = SbomFileFormatType.JSON
 
     @classmethod
     def from_format_type(cls, file_format: SbomFileFormatType) -> 'SPDXFormatter':
-        return cls(formatter=cls.FORMATTERS[file_format])
+        return cls(formatter=cls.FORMATTERS[file_format], file_format_type=file_format)
 
 @dataclass
 class SPDXDocument(AlmasbomDocument):
@@ -47,6 +49,7 @@ class SPDXDocument(AlmasbomDocument):
     doc_name: str
     doc_uuid: str
     _next_id: int = 0
+    _validation: Optional[DocumentValidation] = None
 
     @classmethod
     def _construct(cls, file_format_type: SbomFileFormatType, doc_name: str) -> 'CDXDocument':
@@ -102,12 +105,23 @@ class SPDXDocument(AlmasbomDocument):
         return doc
 
     def write(self, output_file: Path) -> None:
+        if self.validation == ValidationMode.FAST:
+            raise_if_invalid(validate_document_fast(self.document))
+        elif self.validation == ValidationMode.ASYNC:
+            ### spdx_tools writers do not change the document they write
+            self._validation = DocumentValidation()
+            self._validation.submit(self.document)
         self.formatter.formatter.write_document_to_file(
             self.document,
             output_file,
-            validate=True,
+            validate=(self.validation == ValidationMode.FULL),
         )
 
+    def wait_validation(self) -> bool:
+        if self._validation is None:
+            return True
+        return self._validation.wait()
+
     @staticmethod
     def _make_document_namespace(doc_name, doc_uuid) -> str:
         return f"{spdx_consts.SPDX_ALMAOS_NAMESPACE}-{doc_name}-{doc_uuid}"
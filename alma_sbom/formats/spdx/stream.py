@@ -0,0 +1,132 @@
+import itertools
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+from logging import getLogger
+from pathlib import Path
+from spdx_tools.spdx.document_utils import create_document_without_duplicates
+from spdx_tools.spdx.jsonschema.document_converter import DocumentConverter
+from spdx_tools.spdx.model import Document
+from spdx_tools.spdx.validation.annotation_validator import validate_annotations
+from spdx_tools.spdx.validation.creation_info_validator import validate_creation_info
+from spdx_tools.spdx.validation.document_validator import validate_full_spdx_document
+
+from alma_sbom.type import SbomFileFormatType, ValidationMode
+from alma_sbom.data.models import Package, Build, Iso
+from alma_sbom.formats.document import Document as AlmasbomDocument
+from alma_sbom.formats.stream import JsonStreamWriter, open_atomic
+
+from .component import (
+    annotations_from_package,
+    component_from_package,
+    relationship_from_package_id,
+    set_build_component,
+    set_iso_component,
+)
+from .document import SPDXDocument
+from .validation import DocumentValidation, raise_if_invalid, validate_document_fast
+
+_logger = getLogger(__name__)
+
+
+@dataclass
+class SPDXJsonStreamDocument(AlmasbomDocument):
+    """SPDX JSON document that writes each package as soon as it is made.
+
+    The spdx_tools Document only holds the creation info and the annotations
+    of the document itself. Each package is validated and converted together
+    with its relationship and annotations in a document of its own, which
+    gives the same JSON as converting the whole document at once.
+    """
+    document: Document
+    packages: Iterable[Package]
+    _validation: Optional[DocumentValidation] = None
+
+    @classmethod
+    def _construct(cls, file_format_type: SbomFileFormatType, doc_name: str, packages: Iterable[Package]) -> 'SPDXJsonStreamDocument':
+        if file_format_type != SbomFileFormatType.JSON:
+            raise ValueError(f'Streaming is not supported for {file_format_type.value} file format')
+        return cls(
+            document=SPDXDocument._construct(file_format_type, doc_name).document,
+            packages=packages,
+        )
+
+    @classmethod
+    def from_package(cls, package: Package, file_format_type: SbomFileFormatType) -> 'SPDXJsonStreamDocument':
+        return cls._construct(file_format_type, package.get_doc_name(), packages=[package])
+
+    @classmethod
+    def from_build(cls, build: Build, file_format_type: SbomFileFormatType) -> 'SPDXJsonStreamDocument':
+        doc = cls._construct(file_format_type, build.get_doc_name(), packages=build.packages)
+        set_build_component(doc.document, build, doc.document.creation_info.spdx_id)
+        return doc
+
+    @classmethod
+    def from_iso(cls, iso: Iso, file_format_type: SbomFileFormatType) -> 'SPDXJsonStreamDocument':
+        doc = cls._construct(file_format_type, iso.get_doc_name(), packages=iso.packages)
+        set_iso_component(doc.document, iso, doc.document.creation_info.spdx_id)
+        return doc
+
+    def write(self, output_file: Path) -> None:
+        if self.validation == ValidationMode.ASYNC:
+            self._validation = DocumentValidation()
+        converter = DocumentConverter()
+        packages = iter(self.packages)
+        first_package = next(packages, None)
+        if first_package is None:
+            ### A document without packages does not DESCRIBES anything,
+            ### let the validation report it like SPDXDocument does.
+            self._validate(self.document)
+        else:
+            if self.validation in (ValidationMode.FULL, ValidationMode.FAST):
+                raise_if_invalid(
+                    validate_creation_info(self.document.creation_info, self.document.creation_info.spdx_version)
+                    + validate_annotations(self.document.annotations, self.document)
+                )
+            packages = itertools.chain([first_package], packages)
+
+        ### NOTE:
+        # The members of the document itself precede packages and
+        # relationships in the JSON written by spdx_tools.
+        skeleton = converter.convert(create_document_without_duplicates(self.document))
+
+        with open_atomic(output_file) as fd, JsonStreamWriter(fd) as writer:
+            for key, value in skeleton.items():
+                writer.write_member(key, value)
+            count = writer.write_array('packages', self._iter_packages(converter, packages))
+            writer.write_array('relationships', (
+                converter.relationship_converter.convert(
+                    relationship_from_package_id(self._get_package_id(index))
+                ) for index in range(count)
+            ))
+
+    def wait_validation(self) -> bool:
+        if self._validation is None:
+            return True
+        return self._validation.wait()
+
+    def _iter_packages(self, converter: DocumentConverter, packages: Iterator[Package]) -> Iterator[dict]:
+        for index, package in enumerate(packages):
+            pkgid = self._get_package_id(index)
+            pkg, rel = component_from_package(package, pkgid)
+            document = Document(
+                self.document.creation_info,
+                packages=[pkg],
+                relationships=[rel],
+                annotations=annotations_from_package(package, pkgid),
+            )
+            self._validate(document)
+            document = create_document_without_duplicates(document)
+            yield converter.package_converter.convert(document.packages[0], document)
+
+    @staticmethod
+    def _get_package_id(index: int) -> str:
+        ### Same as SPDXDocument._get_next_package_id()
+        return f"SPDXRef-{index}"
+
+    def _validate(self, document: Document) -> None:
+        if self.validation == ValidationMode.FULL:
+            raise_if_invalid(validate_full_spdx_document(document))
+        elif self.validation == ValidationMode.FAST:
+            raise_if_invalid(validate_document_fast(document))
+        elif self.validation == ValidationMode.ASYNC:
+            self._validation.submit(document)
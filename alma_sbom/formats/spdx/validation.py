@@ -0,0 +1,135 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import ClassVar
+from spdx_tools.spdx.model import Document, RelationshipType
+from spdx_tools.spdx.validation.actor_validator import validate_actor
+from spdx_tools.spdx.validation.creation_info_validator import validate_creation_info
+from spdx_tools.spdx.validation.document_validator import validate_full_spdx_document
+from spdx_tools.spdx.validation.package_validator import validate_package
+from spdx_tools.spdx.validation.spdx_id_validators import is_valid_internal_spdx_id
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+_logger = getLogger(__name__)
+
+def raise_if_invalid(validation_messages: list[ValidationMessage]) -> None:
+    """Raise the same error as spdx_tools writers do for an invalid document"""
+    if validation_messages:
+        raise ValueError(f"Document is not valid. The following errors were detected: {validation_messages}")
+
+def validate_document_fast(document: Document) -> list[ValidationMessage]:
+    """Validate the elements alma-sbom puts in a document in linear time.
+
+    This checks what validate_full_spdx_document checks for creation info,
+    packages, relationships and annotations, but looks SPDX ids up in a set
+    instead of scanning the whole document for each element. License
+    expressions are not validated, as alma-sbom only concludes NOASSERTION.
+    """
+    creation_info = document.creation_info
+    document_id = creation_info.spdx_id
+    validation_messages = validate_creation_info(creation_info, creation_info.spdx_version)
+
+    spdx_ids = {document_id}
+    for package in document.packages:
+        context = ValidationContext(
+            spdx_id=package.spdx_id,
+            parent_id=document_id,
+            element_type=SpdxElementType.PACKAGE,
+            full_element=package,
+        )
+        if not is_valid_internal_spdx_id(package.spdx_id):
+            validation_messages.append(ValidationMessage(
+                f'spdx_id must only contain letters, numbers, "." and "-" and must begin with "SPDXRef-", '
+                f'but is: {package.spdx_id}',
+                context,
+            ))
+        if package.spdx_id in spdx_ids:
+            validation_messages.append(ValidationMessage(
+                f'every spdx_id must be unique within the document, but found a duplicate: {package.spdx_id}',
+                context,
+            ))
+        spdx_ids.add(package.spdx_id)
+        if package.license_info_from_files and not package.files_analyzed:
+            validation_messages.append(ValidationMessage(
+                f'license_info_from_files must be None if files_analyzed is False, but is: '
+                f'{package.license_info_from_files}',
+                context,
+            ))
+        validation_messages.extend(validate_package(package, creation_info.spdx_version, context))
+
+    has_describes = False
+    for relationship in document.relationships:
+        context = ValidationContext(element_type=SpdxElementType.RELATIONSHIP, full_element=relationship)
+        for spdx_id in (relationship.spdx_element_id, relationship.related_spdx_element_id):
+            ### related_spdx_element_id may be NONE or NOASSERTION
+            if isinstance(spdx_id, str) and spdx_id not in spdx_ids:
+                validation_messages.append(ValidationMessage(
+                    f'did not find the referenced spdx_id {spdx_id} in the SPDX document',
+                    context,
+                ))
+        if (
+            relationship.relationship_type == RelationshipType.DESCRIBES and
+            relationship.spdx_element_id == document_id
+        ):
+            has_describes = True
+
+    for annotation in document.annotations:
+        context = ValidationContext(element_type=SpdxElementType.ANNOTATION, full_element=annotation)
+        validation_messages.extend(validate_actor(annotation.annotator, 'annotation'))
+        if annotation.spdx_id not in spdx_ids:
+            validation_messages.append(ValidationMessage(
+                f'did not find the referenced spdx_id {annotation.spdx_id} in the SPDX document',
+                context,
+            ))
+
+    if len(document.packages) != 1 and not has_describes:
+        validation_messages.append(ValidationMessage(
+            f'there must be at least one relationship "{document_id} DESCRIBES ..." '
+            f'when there is not only a single package present',
+            ValidationContext(spdx_id=document_id, element_type=SpdxElementType.DOCUMENT),
+        ))
+
+    return validation_messages
+
+class DocumentValidation:
+    """Full validation of in-memory documents on a separate thread.
+
+    Documents are validated while the output is being written, so the
+    output is in place before the validation has finished. Validation and
+    writing share the interpreter, so this is not faster than validating
+    before writing in total, but nothing is parsed again from the output.
+    """
+    MAX_PENDING: ClassVar[int] = 64
+    _executor: ThreadPoolExecutor
+    _pending: deque
+    _validation_messages: list[ValidationMessage]
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = deque()
+        self._validation_messages = []
+
+    def submit(self, document: Document) -> None:
+        """Validate document, which must not be changed until it is validated"""
+        self._pending.append(self._executor.submit(validate_full_spdx_document, document))
+        ### documents are not held without bound when written faster than validated
+        while len(self._pending) > self.MAX_PENDING:
+            self._validation_messages.extend(self._pending.popleft().result())
+
+    def wait(self) -> bool:
+        """Wait for the validation, log its errors and return whether the documents are valid"""
+        try:
+            while self._pending:
+                self._validation_messages.extend(self._pending.popleft().result())
+        except Exception as e:
+            _logger.error(f'Failed to validate the written document: {e}')
+            return False
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+        for message in self._validation_messages:
+            _logger.error(f'Document is not valid: {message}')
+        return not self._validation_messages
@@ -0,0 +1,96 @@
+import json
+import os
+import secrets
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO
+
+
+@contextmanager
+def open_atomic(output_file: Path) -> Iterator[TextIO]:
+    """Open output_file for writing through a temporary file in the same directory.
+
+    The temporary file replaces output_file only when the block succeeds and
+    is removed otherwise, so that a failure in the middle of a stream does not
+    leave a truncated document behind. Outputs which already exist as a
+    symlink or as something other than a regular file, such as /dev/stdout,
+    are written directly.
+    """
+    output_file = Path(output_file)
+    if output_file.is_symlink() or (output_file.exists() and not output_file.is_file()):
+        with open(output_file, 'w') as fd:
+            yield fd
+        return
+
+    ### NOTE:
+    # open() with 'x' creates the file with the permissions of open() with
+    # 'w' unlike tempfile.mkstemp(), which always makes it private.
+    tmp_file = output_file.with_name(f'.{output_file.name}.{secrets.token_hex(4)}.tmp')
+    try:
+        with open(tmp_file, 'x') as fd:
+            yield fd
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+class JsonStreamWriter:
+    """Write the members of a root JSON object one by one.
+
+    The output is formatted the same as json.dump(obj, fd, indent=4), so
+    streaming documents are identical to the ones dumped at once. The root
+    object is not closed when an exception is raised while writing, so an
+    interrupted output is never valid JSON.
+    """
+    INDENT = 4
+
+    fd: TextIO
+    _members: int
+
+    def __init__(self, fd: TextIO) -> None:
+        self.fd = fd
+        self._members = 0
+
+    def __enter__(self) -> 'JsonStreamWriter':
+        self.fd.write('{')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            return
+        self.fd.write('\n}' if self._members else '}')
+
+    def write_member(self, key: str, value: Any) -> None:
+        self._write_key(key)
+        self.fd.write(self._dumps(value, 1))
+
+    def write_array(self, key: str, items: Iterable[Any]) -> int:
+        """Write items as an array member as they are produced, return number of items.
+
+        The member is omitted if there is no item.
+        """
+        count = 0
+        for item in items:
+            if count == 0:
+                self._write_key(key)
+                self.fd.write('[')
+            else:
+                self.fd.write(',')
+            self.fd.write(f'\n{self._indent(2)}{self._dumps(item, 2)}')
+            count += 1
+        if count:
+            self.fd.write(f'\n{self._indent(1)}]')
+        return count
+
+    def _write_key(self, key: str) -> None:
+        if self._members:
+            self.fd.write(',')
+        self.fd.write(f'\n{self._indent(1)}{json.dumps(key)}: ')
+        self._members += 1
+
+    def _dumps(self, value: Any, depth: int) -> str:
+        return json.dumps(value, indent=self.INDENT).replace('\n', f'\n{self._indent(depth)}')
+
+    def _indent(self, depth: int) -> str:
+        return ' ' * (self.INDENT * depth)
@@ -0,0 +1,106 @@
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import ContextManager, Iterable, Iterator, TypeVar
+
+_T = TypeVar('_T')
+
+_NULL_CONTEXT = nullcontext()
+
+@dataclass
+class StageSummary:
+    name: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+    max: float
+
+class StageTimer:
+    """Collects the durations of the stages of SBOM generation.
+
+    It is disabled by default, and then stage() costs a single check so
+    the timers can stay in the hot paths.
+    """
+    enabled: bool
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._durations: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Time the enclosed block as one call of the stage"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._time(name)
+
+    def iter_stage(self, name: str, items: Iterable[_T]) -> Iterator[_T]:
+        """Yield items, timing each step of the iterator as one call of the stage"""
+        if not self.enabled:
+            yield from items
+            return
+        iterator = iter(items)
+        while True:
+            with self._time(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def record(self, name: str, duration: float) -> None:
+        with self._lock:
+            self._durations.setdefault(name, []).append(duration)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+
+    def summary(self) -> list[StageSummary]:
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self._durations.items()}
+        return [
+            StageSummary(
+                name=name,
+                count=len(values),
+                total=sum(values),
+                p50=_percentile(values, 50),
+                p95=_percentile(values, 95),
+                max=values[-1],
+            )
+            for name, values in durations.items()
+        ]
+
+    def format_summary(self) -> str:
+        lines = [f"{'stage':<12} {'count':>8} {'total(s)':>10} {'p50(ms)':>10} {'p95(ms)':>10} {'max(ms)':>10}"]
+        for stage in self.summary():
+            lines.append(
+                f'{stage.name:<12} {stage.count:>8} {stage.total:>10.3f} '
+                f'{stage.p50 * 1000:>10.3f} {stage.p95 * 1000:>10.3f} {stage.max * 1000:>10.3f}'
+            )
+        return '\n'.join(lines)
+
+    @contextmanager
+    def _time(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    """Nearest-rank percentile of non-empty sorted values"""
+    rank = max(1, math.ceil(len(sorted_values) * percent / 100))
+    return sorted_values[rank - 1]
+
+### The process wide timer, enabled by the --profile option
+stage_timer = StageTimer()
+
+def stage(name: str) -> ContextManager[None]:
+    return stage_timer.stage(name)
+
+def iter_stage(name: str, items: Iterable[_T]) -> Iterator[_T]:
+    return stage_timer.iter_stage(name, items)
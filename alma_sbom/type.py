@@ -1,9 +1,11 @@
 import argparse
 import re
-from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
+from alma_sbom.compact import slotted_dataclass, intern_str
+
 class SbomRecordType(Enum):
     SPDX = 'spdx'
     CYCLONEDX = 'cyclonedx'
@@ -29,6 +31,23 @@ class SbomFileFormatType(Enum):
                 return record_format
         raise ValueError('Invalid SbomFileFormatType string')
 
+class ValidationMode(Enum):
+    FULL = 'full'
+    FAST = 'fast'
+    OFF = 'off'
+    ASYNC = 'async'
+
+    @classmethod
+    def from_str(cls, string: str) -> 'ValidationMode':
+        for mode in cls:
+            if string == mode.value:
+                return mode
+        raise ValueError('Invalid ValidationMode string')
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        return [mode.value for mode in cls]
+
 class SbomType:
     VALID_SBOM_TYPE: dict[SbomRecordType, list[SbomFileFormatType]] = {
         SbomRecordType.SPDX: [
@@ -117,12 +136,12 @@ class Algorithms(Enum):
                 return alg
         raise ValueError(f'Invalid Algorithms string: {string}')
 
-@dataclass
+@slotted_dataclass
 class Hash:
     value: str
     algorithm: Algorithms = Algorithms.SHA_256
 
-@dataclass
+@slotted_dataclass
 class PackageNevra:
     name: str
     epoch: Optional[int]
@@ -130,6 +149,9 @@ class PackageNevra:
     release: str
     arch: str
 
+    def __post_init__(self) -> None:
+        self.arch = intern_str(self.arch)
+
     def __repr__(self):
         if self.epoch is not None:
             return (
@@ -153,35 +175,15 @@ class PackageNevra:
         return f'{self.version}-{self.release}'
 
     def get_cpe23(self) -> str:
-        cpe_version = '2.3'
-        cpe_epoch_part = f'{self.epoch if self.epoch else ""}'
-        cpe_epoch_part += '\\:' if cpe_epoch_part else ""
-        cpe = (
-            f'cpe:{cpe_version}:a:almalinux:'
-            f'{self._escape_encode_cpe_part(self.name)}:{cpe_epoch_part}'
-            f'{self._escape_encode_cpe_part(self.version)}-'
-            f'{self._escape_encode_cpe_part(self.release)}:*:*:*:*:*:*:*'
-        )
-        return cpe
+        return _cpe23(self.name, self.epoch, self.version, self.release)
 
     def get_purl(self) -> str:
         # https://github.com/AlmaLinux/build-system-rfes/commit/a132ececa1d7901fe42348022ce954d475578920
-        if self.epoch:
-            purl_epoch_part = f'&epoch={self.epoch}'
-        else:
-            purl_epoch_part = ''
-
-        major_ver = self.get_major_version()
-        if major_ver:
-            purl_distro_part = f'&distro=almalinux-{major_ver}'
-        else:
-            purl_distro_part = ''
-
-        purl = (
-            f'pkg:rpm/almalinux/{self.name}@{self.version}-'
-            f'{self.release}?arch={self.arch}{purl_epoch_part}{purl_distro_part}'
-        )
-        return purl
+        return _purl(self.name, self.epoch, self.version, self.release, self.arch)
+
+    def get_purl_qualifiers(self) -> dict[str, str]:
+        """Return the qualifiers of the purl in the order they appear in get_purl()"""
+        return dict(_purl_qualifiers(self.arch, self.epoch, self.release))
 
     @classmethod
     def from_str_has_epoch(package_name: str) -> 'PackageNevra':
@@ -207,25 +209,71 @@ class PackageNevra:
     @staticmethod
     def _escape_encode_cpe_part(cpe: str) -> str:
         """Escape special characters in cpe each part in accordance with the spdx-tools validation"""
-        allowed_chars = r'a-zA-Z0-9\-\._'
-        escape_chars = r'\\*?!"#$%&\'()+,/:;<=>@[]^`{|}~'
-
-        def encode_char(match):
-            char = match.group(0)
-            if char in escape_chars:
-                return '\\' + char
-
-        return re.sub(f'[^{allowed_chars}]', encode_char, cpe)
+        return _escape_encode_cpe_part(cpe)
 
     def get_major_version(self) -> Optional[int]:
         if self.release:
-            match = re.search(r'el(\d+)', self.release.lower())
-            if match:
-                return int(match.group(1))
+            return _major_version(self.release)
         return None
 
-@dataclass
+### NOTE:
+# Identifiers are made for every package of every document, and names,
+# versions and releases repeat a lot among packages and documents, so
+# they are memoized by value. PackageNevra is mutable, so nothing is
+# cached on the instances.
+IDENTIFIER_CACHE_SIZE = 16384
+
+_CPE_DISALLOWED_CHAR_RE = re.compile(r'[^a-zA-Z0-9\-\._]')
+_CPE_ESCAPE_CHARS = r'\\*?!"#$%&\'()+,/:;<=>@[]^`{|}~'
+_EL_MAJOR_VERSION_RE = re.compile(r'el(\d+)')
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
+def _cpe23(name: str, epoch: Optional[int], version: str, release: str) -> str:
+    cpe_epoch_part = f'{epoch}\\:' if epoch else ''
+    return (
+        'cpe:2.3:a:almalinux:'
+        f'{_escape_encode_cpe_part(name)}:{cpe_epoch_part}'
+        f'{_escape_encode_cpe_part(version)}-'
+        f'{_escape_encode_cpe_part(release)}:*:*:*:*:*:*:*'
+    )
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
+def _purl(name: str, epoch: Optional[int], version: str, release: str, arch: str) -> str:
+    qualifier_part = '&'.join(f'{key}={value}' for key, value in _purl_qualifiers(arch, epoch, release))
+    return f'pkg:rpm/almalinux/{name}@{version}-{release}?{qualifier_part}'
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
+def _purl_qualifiers(arch: str, epoch: Optional[int], release: str) -> tuple[tuple[str, str], ...]:
+    qualifiers = [('arch', arch)]
+    if epoch:
+        qualifiers.append(('epoch', str(epoch)))
+    major_ver = _major_version(release) if release else None
+    if major_ver:
+        qualifiers.append(('distro', f'almalinux-{major_ver}'))
+    return tuple(qualifiers)
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
+def _escape_encode_cpe_part(cpe: str) -> str:
+    return _CPE_DISALLOWED_CHAR_RE.sub(_encode_cpe_char, cpe)
+
+def _encode_cpe_char(match: re.Match) -> str:
+    ### other disallowed characters are dropped
+    char = match.group(0)
+    return '\\' + char if char in _CPE_ESCAPE_CHARS else ''
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
+def _major_version(release: str) -> Optional[int]:
+    match = _EL_MAJOR_VERSION_RE.search(release.lower())
+    if match:
+        return int(match.group(1))
+    return None
+
+@slotted_dataclass
 class Licenses:
     ids: list[str]
     expression: str
 
+    def __post_init__(self) -> None:
+        ### a few hundred distinct license strings are shared by all packages
+        self.expression = intern_str(self.expression)
+
@@ -7,6 +7,7 @@ def get_install_requires():
     requires=[
         'requests>=2.20.0',
         'cyclonedx-python-lib==9.0.0',
+        'sortedcontainers>=2.4.0,<3.0.0',
         'spdx-tools==0.8',
         'urllib3<2.0',
         'packageurl-python==0.16.0',
@@ -0,0 +1,208 @@
+import json
+import platform
+import time
+import tracemalloc
+import pytest
+from pathlib import Path
+from typing import Callable
+
+from alma_sbom._version import __version__
+from alma_sbom.type import SbomRecordType, ValidationMode
+
+from stubs import AlbsStubServer, FakeImmudbWrapper
+from synthetic import SyntheticPackage, gen_packages, make_iso
+
+_results_key = pytest.StashKey[list]()
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('alma-sbom benchmark')
+    group.addoption(
+        '--sbom-bench-sizes', default='10,1000,10000',
+        help='Comma separated numbers of packages to benchmark with (default: %(default)s)',
+    )
+    group.addoption(
+        '--sbom-bench-json', default=None,
+        help='Write the results to this JSON file',
+    )
+    group.addoption(
+        '--sbom-bench-baseline', default=None,
+        help='JSON file of previous results to compare with',
+    )
+    group.addoption(
+        '--sbom-bench-threshold', type=float, default=0.2,
+        help=(
+            'Fail a benchmark whose throughput is lower than the baseline by '
+            'more than this fraction (default: %(default)s)'
+        ),
+    )
+    group.addoption(
+        '--sbom-bench-min-time', type=float, default=1.0,
+        help='Repeat each benchmark for at least this many seconds and keep the best round (default: %(default)s)',
+    )
+    group.addoption(
+        '--sbom-bench-jobs', type=int, default=1,
+        help='--jobs given to alma-sbom (default: %(default)s)',
+    )
+    group.addoption(
+        '--sbom-bench-validation', choices=ValidationMode.choices(), default=ValidationMode.FAST.value,
+        help=(
+            '--validate given to alma-sbom. full validation of SPDX grows '
+            'quadratically and hides the rest at large sizes (default: %(default)s)'
+        ),
+    )
+    group.addoption(
+        '--sbom-bench-immudb-latency', type=float, default=0.0,
+        help='Milliseconds the fake immudb sleeps per lookup (default: %(default)s)',
+    )
+    group.addoption(
+        '--sbom-bench-albs-latency', type=float, default=0.0,
+        help='Milliseconds the ALBS stub sleeps per request (default: %(default)s)',
+    )
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[_results_key] = []
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if 'package_count' in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption('sbom_bench_sizes').split(',')]
+        metafunc.parametrize('package_count', sizes, scope='session')
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    output = session.config.getoption('sbom_bench_json')
+    results = session.config.stash[_results_key]
+    if not output or not results:
+        return
+    with open(output, 'w') as fd:
+        json.dump({
+            'meta': {
+                'alma_sbom_version': __version__,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'jobs': session.config.getoption('sbom_bench_jobs'),
+                'validation': session.config.getoption('sbom_bench_validation'),
+                'immudb_latency_ms': session.config.getoption('sbom_bench_immudb_latency'),
+                'albs_latency_ms': session.config.getoption('sbom_bench_albs_latency'),
+            },
+            'results': results,
+        }, fd, indent=4)
+
+@pytest.fixture(scope='session')
+def synthetic_packages(package_count: int) -> list[SyntheticPackage]:
+    packages = gen_packages(package_count)
+    FakeImmudbWrapper.register(packages, build_id=package_count)
+    return packages
+
+@pytest.fixture(scope='session')
+def synthetic_package_files(synthetic_packages: list[SyntheticPackage], tmp_path_factory: pytest.TempPathFactory) -> list[Path]:
+    packages_dir = tmp_path_factory.mktemp('packages')
+    paths = []
+    for pkg in synthetic_packages:
+        path = packages_dir / pkg.file_name
+        path.write_bytes(pkg.data)
+        paths.append(path)
+    return paths
+
+@pytest.fixture(scope='session')
+def synthetic_iso(synthetic_packages: list[SyntheticPackage], tmp_path_factory: pytest.TempPathFactory) -> Path:
+    iso_image = tmp_path_factory.mktemp('iso') / 'synthetic.iso'
+    make_iso(iso_image, synthetic_packages)
+    return iso_image
+
+@pytest.fixture(scope='session', autouse=True)
+def warm_up() -> None:
+    """Load the format backends and the license index before the first benchmark"""
+    from alma_sbom.formats import document_factory
+    from alma_sbom.data.collectors.licenses import get_licensing
+    for record_type in SbomRecordType:
+        document_factory(record_type)
+    get_licensing()
+
+@pytest.fixture(scope='session', autouse=True)
+def fake_immudb(pytestconfig: pytest.Config):
+    FakeImmudbWrapper.latency = pytestconfig.getoption('sbom_bench_immudb_latency') / 1000
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('alma_sbom.data.collectors.immudb.collector.ImmudbWrapper', FakeImmudbWrapper)
+        yield FakeImmudbWrapper
+
+@pytest.fixture(scope='session')
+def albs_stub(pytestconfig: pytest.Config):
+    with AlbsStubServer(latency=pytestconfig.getoption('sbom_bench_albs_latency') / 1000) as stub:
+        yield stub
+
+class Benchmark:
+    """Measures runs of alma-sbom and records their throughput or memory usage"""
+    def __init__(self, config: pytest.Config, baseline: dict[tuple, dict]) -> None:
+        self.config = config
+        self.baseline = baseline
+
+    def __call__(self, func: Callable[[], None], command: str, sbom_type: str, packages: int) -> dict:
+        min_time = self.config.getoption('sbom_bench_min_time')
+        rounds = []
+        started = time.perf_counter()
+        while not rounds or time.perf_counter() - started < min_time:
+            start = time.perf_counter()
+            func()
+            rounds.append(time.perf_counter() - start)
+
+        result = {
+            'command': command,
+            'sbom_type': sbom_type,
+            'packages': packages,
+            'rounds': len(rounds),
+            'seconds': min(rounds),
+            'packages_per_second': packages / min(rounds),
+        }
+        self._record(result, 'packages_per_second', higher_is_better=True)
+        return result
+
+    def memory(self, func: Callable[[], object], command: str, packages: int) -> dict:
+        """Measure the memory held by what func returns"""
+        tracemalloc.start()
+        try:
+            kept = func()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del kept
+
+        result = {
+            'command': command,
+            'sbom_type': None,
+            'packages': packages,
+            'bytes': current,
+            'peak_bytes': peak,
+            'bytes_per_package': current / packages,
+        }
+        self._record(result, 'bytes_per_package', higher_is_better=False)
+        return result
+
+    def _record(self, result: dict, metric: str, higher_is_better: bool) -> None:
+        self.config.stash[_results_key].append(result)
+        expected = self.baseline.get(_result_key(result))
+        if expected is None or metric not in expected:
+            return
+        threshold = self.config.getoption('sbom_bench_threshold')
+        if higher_is_better:
+            regressed = result[metric] < expected[metric] * (1 - threshold)
+        else:
+            regressed = result[metric] > expected[metric] * (1 + threshold)
+        if regressed:
+            pytest.fail(
+                f'{metric} regressed: {result[metric]:.1f}, '
+                f'baseline {expected[metric]:.1f} (threshold {threshold:.0%})'
+            )
+
+def _result_key(result: dict) -> tuple:
+    return result['command'], result['sbom_type'], result['packages']
+
+@pytest.fixture(scope='session')
+def sbom_bench_baseline(pytestconfig: pytest.Config) -> dict[tuple, dict]:
+    path = pytestconfig.getoption('sbom_bench_baseline')
+    if not path:
+        return {}
+    with open(path) as fd:
+        return {_result_key(result): result for result in json.load(fd)['results']}
+
+@pytest.fixture
+def sbom_benchmark(pytestconfig: pytest.Config, sbom_bench_baseline: dict[tuple, dict]) -> Benchmark:
+    return Benchmark(pytestconfig, sbom_bench_baseline)
@@ -0,0 +1,96 @@
+import copy
+import json
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+from synthetic import SyntheticPackage
+
+class FakeImmudbWrapper:
+    """In-process stand-in for ImmudbWrapper, answering from a dict of records.
+
+    latency seconds are slept per lookup to simulate the round trip to immudb.
+    """
+    records: ClassVar[dict[str, dict]] = {}
+    latency: ClassVar[float] = 0.0
+
+    def __init__(self, **kwargs) -> None:
+        pass
+
+    @classmethod
+    def register(cls, packages: list[SyntheticPackage], build_id: int) -> None:
+        for pkg in packages:
+            cls.records[pkg.hash] = pkg.immudb_response(build_id)
+
+    def authenticate(self, hash: str) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        ### unknown hashes are answered without Metadata like the real one,
+        ### and records are copied since the collector modifies them
+        return copy.deepcopy(self.records.get(hash, {'value': {}}))
+
+class AlbsStubServer:
+    """Local HTTP server answering /api/v1/builds/{id} of ALBS"""
+    BUILD_PATH: ClassVar[re.Pattern] = re.compile(r'^/api/v1/builds/(\d+)$')
+
+    builds: dict[str, dict]
+    latency: float
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.builds = {}
+        self.latency = latency
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._gen_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def add_build(self, build_id: int, packages: list[SyntheticPackage]) -> None:
+        self.builds[str(build_id)] = {
+            'id': build_id,
+            'created_at': '2024-04-30T14:02:23.231308',
+            'owner': {'username': 'benchmark', 'email': 'benchmark@almalinux.org'},
+            'tasks': [{
+                'artifacts': [
+                    {'type': 'rpm', 'name': pkg.file_name, 'cas_hash': pkg.hash}
+                    for pkg in packages
+                ] + [{'type': 'build_log', 'name': 'build.log', 'cas_hash': None}],
+            }],
+        }
+
+    def __enter__(self) -> 'AlbsStubServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _gen_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                match = stub.BUILD_PATH.match(self.path)
+                build = match and stub.builds.get(match.group(1))
+                if build is None:
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                    return
+                body = json.dumps(build).encode()
+                self.send_response(HTTPStatus.OK)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
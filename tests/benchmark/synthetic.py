@@ -0,0 +1,213 @@
+import gzip
+import hashlib
+import io
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+import pycdlib
+
+from alma_sbom.type import PackageNevra
+
+### rpm tags and types used by the synthetic packages, see rpmtag.h
+RPMTAG_HEADERSIGNATURES = 62
+RPMTAG_HEADERIMMUTABLE = 63
+RPMSIGTAG_SHA256 = 273
+RPMSIGTAG_SIZE = 1000
+RPMTAG_NAME = 1000
+RPMTAG_VERSION = 1001
+RPMTAG_RELEASE = 1002
+RPMTAG_EPOCH = 1003
+RPMTAG_SUMMARY = 1004
+RPMTAG_DESCRIPTION = 1005
+RPMTAG_BUILDTIME = 1006
+RPMTAG_BUILDHOST = 1007
+RPMTAG_LICENSE = 1014
+RPMTAG_OS = 1021
+RPMTAG_ARCH = 1022
+RPMTAG_SOURCERPM = 1044
+RPMTAG_PAYLOADFORMAT = 1124
+RPMTAG_PAYLOADCOMPRESSOR = 1125
+
+RPM_INT32_TYPE = 4
+RPM_STRING_TYPE = 6
+RPM_BIN_TYPE = 7
+
+HEADER_MAGIC = b'\x8e\xad\xe8\x01\x00\x00\x00\x00'
+LEAD_MAGIC = b'\xed\xab\xee\xdb'
+
+### a few license strings, so that the license cache sees hits and misses
+LICENSES = ['MIT', 'GPLv3+', 'GPL-2.0-or-later AND LGPL-2.1-or-later', 'BSD-3-Clause OR Apache-2.0']
+
+TREEINFO = (
+    b'[general]\n'
+    b'family = AlmaLinux\n'
+    b'version = 9\n'
+    b'variants = Minimal\n'
+    b'[variant-Minimal]\n'
+    b'packages = Minimal/Packages\n'
+    b'repository = Minimal\n'
+)
+
+@dataclass
+class SyntheticPackage:
+    nevra: PackageNevra
+    license: str
+    data: bytes
+
+    @property
+    def file_name(self) -> str:
+        return f'{self.nevra.name}-{self.nevra.version}-{self.nevra.release}.{self.nevra.arch}.rpm'
+
+    @property
+    def source_rpm(self) -> str:
+        return f'{self.nevra.name}-{self.nevra.version}-{self.nevra.release}.src.rpm'
+
+    @property
+    def hash(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    def immudb_response(self, build_id: int) -> dict:
+        """Return what ImmudbWrapper.authenticate() returns for this package"""
+        return {
+            'value': {
+                'Name': self.file_name,
+                'Kind': 'file',
+                'Hash': self.hash,
+                'Signer': 'sbom_signer_almalinux',
+                'Metadata': {
+                    'sbom_api_ver': '0.2',
+                    'build_id': build_id,
+                    'build_host': 'x64-builder01.almalinux.org',
+                    'build_arch': self.nevra.arch,
+                    'built_by': 'benchmark <benchmark@almalinux.org>',
+                    'alma_commit_sbom_hash': hashlib.sha1(self.nevra.name.encode()).hexdigest(),
+                    'source_type': 'git',
+                    'git_url': f'https://git.almalinux.org/rpms/{self.nevra.name}.git',
+                    'git_ref': f'imports/c9/{self.nevra.name}-{self.nevra.version}-{self.nevra.release}',
+                    'git_commit': hashlib.sha1(self.nevra.name.encode()).hexdigest(),
+                    'name': self.nevra.name,
+                    'epoch': self.nevra.epoch,
+                    'version': self.nevra.version,
+                    'release': self.nevra.release,
+                    'arch': self.nevra.arch,
+                    'sourcerpm': self.source_rpm,
+                },
+            },
+            'timestamp': 1714500330,
+        }
+
+def gen_packages(count: int, payload_size: int = 4096) -> list[SyntheticPackage]:
+    """Return count distinct packages, the same ones on every call"""
+    packages = []
+    for num in range(count):
+        nevra = PackageNevra(
+            epoch=None if num % 3 else 1,
+            name=f'bench-{num:05d}',
+            version=f'1.{num % 10}.{num % 7}',
+            release='1.el9',
+            arch='x86_64' if num % 4 else 'noarch',
+        )
+        license = LICENSES[num % len(LICENSES)]
+        packages.append(SyntheticPackage(nevra, license, make_rpm(nevra, license, payload_size)))
+    return packages
+
+def make_rpm(nevra: PackageNevra, license: str, payload_size: int) -> bytes:
+    """Make a binary rpm with the given header and a payload of filler bytes.
+
+    The payload is not a valid archive, only its headers are meant to be read.
+    """
+    header = _make_header(RPMTAG_HEADERIMMUTABLE, [
+        (RPMTAG_NAME, RPM_STRING_TYPE, nevra.name),
+        (RPMTAG_VERSION, RPM_STRING_TYPE, nevra.version),
+        (RPMTAG_RELEASE, RPM_STRING_TYPE, nevra.release),
+        *([(RPMTAG_EPOCH, RPM_INT32_TYPE, nevra.epoch)] if nevra.epoch is not None else []),
+        (RPMTAG_SUMMARY, RPM_STRING_TYPE, f'Synthetic package {nevra.name}'),
+        (RPMTAG_DESCRIPTION, RPM_STRING_TYPE, f'Synthetic package {nevra.name} for benchmarks.'),
+        (RPMTAG_BUILDTIME, RPM_INT32_TYPE, 1714500330),
+        (RPMTAG_BUILDHOST, RPM_STRING_TYPE, 'x64-builder01.almalinux.org'),
+        (RPMTAG_LICENSE, RPM_STRING_TYPE, license),
+        (RPMTAG_OS, RPM_STRING_TYPE, 'linux'),
+        (RPMTAG_ARCH, RPM_STRING_TYPE, nevra.arch),
+        (RPMTAG_SOURCERPM, RPM_STRING_TYPE, f'{nevra.name}-{nevra.version}-{nevra.release}.src.rpm'),
+        (RPMTAG_PAYLOADFORMAT, RPM_STRING_TYPE, 'cpio'),
+        (RPMTAG_PAYLOADCOMPRESSOR, RPM_STRING_TYPE, 'gzip'),
+    ])
+    payload = (nevra.name.encode() * (payload_size // len(nevra.name) + 1))[:payload_size]
+    signature = _make_header(RPMTAG_HEADERSIGNATURES, [
+        (RPMSIGTAG_SHA256, RPM_STRING_TYPE, hashlib.sha256(header).hexdigest()),
+        (RPMSIGTAG_SIZE, RPM_INT32_TYPE, len(header) + len(payload)),
+    ])
+    ### the signature header is padded to 8 bytes
+    signature += b'\0' * (-len(signature) % 8)
+    return _make_lead(nevra) + signature + header + payload
+
+def _make_lead(nevra: PackageNevra) -> bytes:
+    name = f'{nevra.name}-{nevra.version}-{nevra.release}'.encode()[:65]
+    ### major 3, minor 0, binary, archnum 1, osnum 1, header style signature
+    return struct.pack('>4sBBhh66shh16x', LEAD_MAGIC, 3, 0, 0, 1, name, 1, 5)
+
+def _make_header(region_tag: int, entries: list[tuple[int, int, object]]) -> bytes:
+    index = []
+    store = b''
+    for tag, tag_type, value in sorted(entries, key=lambda entry: entry[0]):
+        if tag_type == RPM_INT32_TYPE:
+            store += b'\0' * (-len(store) % 4)
+            data = struct.pack('>i', value)
+        else:
+            data = value.encode() + b'\0'
+        index.append(struct.pack('>iiii', tag, tag_type, len(store), 1))
+        store += data
+
+    ### The immutable region: its entry comes first and points at a trailer
+    ### at the end of the store, whose offset is minus the size of the index.
+    count = len(index) + 1
+    region = struct.pack('>iiii', region_tag, RPM_BIN_TYPE, len(store), 16)
+    store += struct.pack('>iiii', region_tag, RPM_BIN_TYPE, -count * 16, 16)
+    return HEADER_MAGIC + struct.pack('>ii', count, len(store)) + region + b''.join(index) + store
+
+def make_iso(iso_image: Path, packages: list[SyntheticPackage]) -> None:
+    """Make a Minimal AlmaLinux ISO image holding the packages and their repodata"""
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', interchange_level=4)
+    iso.add_fp(io.BytesIO(TREEINFO), len(TREEINFO), '/.treeinfo', rr_name='.treeinfo')
+    iso.add_directory('/Minimal', rr_name='Minimal')
+    iso.add_directory('/Minimal/Packages', rr_name='Packages')
+    for pkg in packages:
+        iso.add_fp(
+            io.BytesIO(pkg.data), len(pkg.data),
+            f'/Minimal/Packages/{pkg.file_name}', rr_name=pkg.file_name,
+        )
+    iso.add_directory('/Minimal/repodata', rr_name='repodata')
+    repomd = (
+        b'<repomd xmlns="http://linux.duke.edu/metadata/repo">'
+        b'<data type="primary"><location href="repodata/primary.xml.gz"/></data>'
+        b'</repomd>'
+    )
+    iso.add_fp(io.BytesIO(repomd), len(repomd), '/Minimal/repodata/repomd.xml', rr_name='repomd.xml')
+    primary = gzip.compress(_make_primary(packages))
+    iso.add_fp(io.BytesIO(primary), len(primary), '/Minimal/repodata/primary.xml.gz', rr_name='primary.xml.gz')
+    iso.write(str(iso_image))
+    iso.close()
+
+def _make_primary(packages: list[SyntheticPackage]) -> bytes:
+    primary = [
+        '<metadata xmlns="http://linux.duke.edu/metadata/common" '
+        'xmlns:rpm="http://linux.duke.edu/metadata/rpm">'
+    ]
+    for pkg in packages:
+        nevra = pkg.nevra
+        primary.append(
+            '<package type="rpm">'
+            f'<name>{nevra.name}</name><arch>{nevra.arch}</arch>'
+            f'<version epoch="{nevra.epoch or 0}" ver="{nevra.version}" rel="{nevra.release}"/>'
+            f'<checksum type="sha256" pkgid="YES">{pkg.hash}</checksum>'
+            f'<summary>Synthetic package {nevra.name}</summary>'
+            f'<description>Synthetic package {nevra.name} for benchmarks.</description>'
+            f'<location href="Packages/{pkg.file_name}"/>'
+            f'<format><rpm:license>{pkg.license}</rpm:license>'
+            f'<rpm:sourcerpm>{pkg.source_rpm}</rpm:sourcerpm></format>'
+            '</package>'
+        )
+    primary.append('</metadata>')
+    return ''.join(primary).encode('utf-8')
@@ -0,0 +1,37 @@
+import pytest
+from pathlib import Path
+
+from alma_sbom.data import Iso
+from alma_sbom.formats.cyclonedx.document import CDXDocument
+from alma_sbom.type import SbomFileFormatType
+
+from conftest import Benchmark
+from synthetic import SyntheticPackage
+from test_memory import _collect_packages
+
+@pytest.fixture(scope='session')
+def synthetic_iso_packages(synthetic_packages: list[SyntheticPackage]) -> Iso:
+    return Iso(releasever=9, image_type='synthetic', packages=_collect_packages(synthetic_packages))
+
+def test_components(package_count: int, synthetic_iso_packages: Iso, sbom_benchmark: Benchmark) -> None:
+    """Assembling a Bom of package_count components, without rendering it"""
+    sbom_benchmark(
+        lambda: CDXDocument.from_iso(synthetic_iso_packages, SbomFileFormatType.JSON),
+        'cyclonedx-components', 'cyclonedx-json', package_count,
+    )
+
+@pytest.mark.filterwarnings('ignore::UserWarning')
+@pytest.mark.parametrize('file_format', [SbomFileFormatType.JSON, SbomFileFormatType.XML])
+def test_write(
+    file_format: SbomFileFormatType,
+    package_count: int,
+    synthetic_iso_packages: Iso,
+    sbom_benchmark: Benchmark,
+    tmp_path: Path,
+) -> None:
+    """Rendering an assembled Bom, which validates its dependency graph first"""
+    doc = CDXDocument.from_iso(synthetic_iso_packages, file_format)
+    sbom_benchmark(
+        lambda: doc.write(tmp_path / 'sbom'),
+        'cyclonedx-write', f'cyclonedx-{file_format.value}', package_count,
+    )
@@ -0,0 +1,62 @@
+import dataclasses
+import json
+from functools import lru_cache
+
+from alma_sbom.data import Package
+from alma_sbom.data.collectors.immudb.processor import processor_factory
+from alma_sbom.data.collectors.licenses import parse_licenses
+
+from conftest import Benchmark
+from synthetic import SyntheticPackage
+
+def _collect_packages(synthetic_packages: list[SyntheticPackage]) -> list[Package]:
+    """Make packages the way the iso subcommand does, from immudb records and rpm headers"""
+    packages = []
+    for synthetic in synthetic_packages:
+        ### records are decoded from each response, so no string is shared
+        response = json.loads(json.dumps(synthetic.immudb_response(build_id=1)))
+        immudb_info = response['value']
+        immudb_info['timestamp'] = response['timestamp']
+        pkg = processor_factory(immudb_info, synthetic.hash).get_package()
+        pkg.licenses = parse_licenses(json.loads(json.dumps(synthetic.license)))
+        pkg.summary = f'Synthetic package {synthetic.nevra.name}'
+        pkg.description = f'Synthetic package {synthetic.nevra.name} for benchmarks.'
+        packages.append(pkg)
+    return packages
+
+@lru_cache(maxsize=None)
+def _unslotted_class(cls: type) -> type:
+    return dataclasses.make_dataclass(
+        cls.__name__,
+        [(f.name, f.type) for f in dataclasses.fields(cls)],
+    )
+
+def _unslotted_copy(value: object) -> object:
+    """Copy value into plain dataclasses with a __dict__ and without interned strings"""
+    if dataclasses.is_dataclass(value):
+        return _unslotted_class(type(value))(**{
+            f.name: _unslotted_copy(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+        })
+    if isinstance(value, list):
+        return [_unslotted_copy(item) for item in value]
+    if isinstance(value, str) and len(value) > 1:
+        return value[:1] + value[1:]
+    return value
+
+def test_packages(package_count: int, synthetic_packages: list[SyntheticPackage], sbom_benchmark: Benchmark) -> None:
+    ### caches and classes made by the first run, e.g. of licenses, are not counted
+    packages = _collect_packages(synthetic_packages)
+    _unslotted_copy(packages[:1])
+    result = sbom_benchmark.memory(
+        lambda: _collect_packages(synthetic_packages),
+        'memory', package_count,
+    )
+
+    ### The same packages as plain dataclasses are recorded for comparison,
+    ### showing what __slots__ and interning save.
+    unslotted = sbom_benchmark.memory(
+        lambda: _unslotted_copy(packages),
+        'memory-unslotted', package_count,
+    )
+    assert result['bytes_per_package'] < unslotted['bytes_per_package']
@@ -0,0 +1,85 @@
+import pytest
+from pathlib import Path
+
+from alma_sbom.type import SbomType
+from alma_sbom.cli.config import CommonConfig, PackageConfig, BuildConfig, IsoConfig
+from alma_sbom.cli.commands import PackageCommand, BuildCommand, IsoCommand
+from alma_sbom.cli.factory import CollectorFactory
+
+from conftest import Benchmark
+from stubs import AlbsStubServer
+from synthetic import SyntheticPackage
+
+def _gen_base_config(pytestconfig: pytest.Config, output_file: Path, sbom_type: str, albs_url: str = CommonConfig.DEF_ALBS_URL) -> CommonConfig:
+    return CommonConfig.from_str(
+        str(output_file),
+        albs_url,
+        'username', 'password', 'database', 'address', None,
+        sbom_type_str=sbom_type,
+        validation=pytestconfig.getoption('sbom_bench_validation'),
+        jobs=pytestconfig.getoption('sbom_bench_jobs'),
+        ### the fake immudb is measured, not the local cache
+        use_cache=False,
+    )
+
+@pytest.mark.parametrize('sbom_type', SbomType.choices())
+def test_build(
+    sbom_type: str,
+    package_count: int,
+    synthetic_packages: list[SyntheticPackage],
+    albs_stub: AlbsStubServer,
+    sbom_benchmark: Benchmark,
+    pytestconfig: pytest.Config,
+    tmp_path: Path,
+) -> None:
+    albs_stub.add_build(package_count, synthetic_packages)
+    base = _gen_base_config(pytestconfig, tmp_path / 'sbom', sbom_type, albs_url=albs_stub.url)
+    config = BuildConfig.from_base(base, str(package_count))
+
+    def run() -> None:
+        assert BuildCommand(config).run() == 0
+
+    sbom_benchmark(run, 'build', sbom_type, package_count)
+
+@pytest.mark.parametrize('sbom_type', SbomType.choices())
+def test_package(
+    sbom_type: str,
+    package_count: int,
+    synthetic_package_files: list[Path],
+    sbom_benchmark: Benchmark,
+    pytestconfig: pytest.Config,
+    tmp_path: Path,
+) -> None:
+    pytest.importorskip('rpm')
+    base = _gen_base_config(pytestconfig, tmp_path / 'sbom', sbom_type)
+    configs = [PackageConfig.from_base(base, None, path) for path in synthetic_package_files]
+
+    ### each package is a run of the package subcommand, sharing the
+    ### collectors like the batch subcommand does
+    def run() -> None:
+        collector_factory = CollectorFactory(base)
+        for config in configs:
+            assert PackageCommand(config, collector_factory).run() == 0
+
+    sbom_benchmark(run, 'package', sbom_type, package_count)
+
+@pytest.mark.parametrize('repodata', [False, True], ids=['packages', 'repodata'])
+@pytest.mark.parametrize('sbom_type', SbomType.choices())
+def test_iso(
+    sbom_type: str,
+    repodata: bool,
+    package_count: int,
+    synthetic_iso: Path,
+    sbom_benchmark: Benchmark,
+    pytestconfig: pytest.Config,
+    tmp_path: Path,
+) -> None:
+    if not repodata:
+        pytest.importorskip('rpm')
+    base = _gen_base_config(pytestconfig, tmp_path / 'sbom', sbom_type)
+    config = IsoConfig.from_base(base, synthetic_iso, repodata=repodata)
+
+    def run() -> None:
+        assert IsoCommand(config).run() == 0
+
+    sbom_benchmark(run, 'iso-repodata' if repodata else 'iso', sbom_type, package_count)
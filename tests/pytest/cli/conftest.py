@@ -0,0 +1,45 @@
+import pytest
+from pathlib import Path
+
+from alma_sbom.type import Hash, PackageNevra
+from alma_sbom.data import Package
+from alma_sbom.cli.config import CommonConfig
+from alma_sbom.cli.factory import CollectorFactory
+
+TESTED_HASHES = [f'{num:064x}' for num in range(4)]
+
+
+class FakeImmudbCollector:
+    def collect_package_by_hash(self, hash: str, allow_negative: bool = False) -> Package:
+        if hash not in TESTED_HASHES:
+            raise KeyError(hash)
+        return Package(
+            package_nevra=PackageNevra(epoch=None, name='bash', version='5.1.8', release='9.el9', arch='x86_64'),
+            hashs=[Hash(value=hash)],
+        )
+
+@pytest.fixture
+def tested_hashes() -> list[str]:
+    """Hashes which FakeImmudbCollector knows"""
+    return list(TESTED_HASHES)
+
+@pytest.fixture
+def base_config(tmp_path: Path) -> CommonConfig:
+    return CommonConfig.from_str(
+        str(tmp_path / 'unused'),
+        'https://build.almalinux.org',
+        'username', 'password', 'database', 'address', None,
+        sbom_type_str='spdx-json',
+        jobs=2,
+        use_cache=False,
+    )
+
+@pytest.fixture
+def fake_immudb(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Replace immudb collectors with FakeImmudbCollector and return the ones generated"""
+    collectors = []
+    def gen_immudb_collector(self) -> FakeImmudbCollector:
+        collectors.append(FakeImmudbCollector())
+        return collectors[-1]
+    monkeypatch.setattr(CollectorFactory, 'gen_immudb_collector', gen_immudb_collector)
+    return collectors
@@ -0,0 +1,74 @@
+import json
+import pytest
+from pathlib import Path
+
+from alma_sbom.type import SbomRecordType
+from alma_sbom.cli.config import CommonConfig, BatchConfig, BatchTarget, PackageConfig, BuildConfig
+from alma_sbom.cli.commands.batch import BatchCommand
+
+def test_target_from_dict() -> None:
+    target = BatchTarget.from_dict({'build_id': 123, 'output_file': 'out.json', 'file_format': ''})
+    assert target.command == 'build'
+    assert target.build_id == '123'
+    assert target.file_format is None
+
+    with pytest.raises(ValueError):
+        BatchTarget.from_dict({'build_id': 123, 'rpm_package_hash': 'abc', 'output_file': 'out.json'})
+    with pytest.raises(ValueError):
+        BatchTarget.from_dict({'build_id': 123})
+    with pytest.raises(ValueError):
+        BatchTarget.from_dict({'build_id': 123, 'output_file': 'out.json', 'unknown': 1})
+
+def test_target_to_config(base_config: CommonConfig, tested_hashes: list[str]) -> None:
+    config = BatchTarget.from_dict({
+        'rpm_package_hash': tested_hashes[0],
+        'output_file': 'out.json',
+        'file_format': 'cyclonedx-json',
+    }).to_config(base_config)
+    assert isinstance(config, PackageConfig)
+    assert config.output_file == Path('out.json')
+    assert config.sbom_type.record_type == SbomRecordType.CYCLONEDX
+
+    config = BatchTarget.from_dict({'build_id': '1', 'output_file': 'out.json'}).to_config(base_config)
+    assert isinstance(config, BuildConfig)
+    assert config.sbom_type == base_config.sbom_type
+
+def test_read_csv_manifest(base_config: CommonConfig, tmp_path: Path, tested_hashes: list[str]) -> None:
+    manifest = tmp_path / 'manifest.csv'
+    manifest.write_text(
+        'rpm_package_hash,build_id,output_file,file_format\n'
+        f'{tested_hashes[0]},,a.json,\n'
+        ',42,b.json,cyclonedx-xml\n'
+    )
+    config = BatchConfig.from_base(base_config, manifest=manifest)
+    assert config.manifest_format == 'csv'
+    assert [target.command for target in config.read_manifest()] == ['package', 'build']
+
+def test_run(base_config: CommonConfig, fake_immudb: list, tmp_path: Path, tested_hashes: list[str]) -> None:
+    manifest = tmp_path / 'manifest.jsonl'
+    records = [
+        {'rpm_package_hash': pkg_hash, 'output_file': str(tmp_path / f'{num}.json')}
+        for num, pkg_hash in enumerate(tested_hashes)
+    ]
+    records[0]['file_format'] = 'cyclonedx-json'
+    manifest.write_text(''.join(json.dumps(record) + '\n' for record in records))
+
+    command = BatchCommand(BatchConfig.from_base(base_config, manifest=manifest))
+    assert command.run() == 0
+
+    for num in range(len(tested_hashes)):
+        assert json.loads((tmp_path / f'{num}.json').read_text())
+    assert 'bomFormat' in json.loads((tmp_path / '0.json').read_text())
+    ### immudb collectors are shared among the targets on each worker thread
+    assert 1 <= len(fake_immudb) <= base_config.jobs
+
+def test_run_with_failed_target(base_config: CommonConfig, fake_immudb: list, tmp_path: Path, tested_hashes: list[str]) -> None:
+    manifest = tmp_path / 'manifest.jsonl'
+    manifest.write_text(''.join(json.dumps(record) + '\n' for record in [
+        {'rpm_package_hash': tested_hashes[0], 'output_file': str(tmp_path / 'ok.json')},
+        {'rpm_package_hash': 'unknown', 'output_file': str(tmp_path / 'ng.json')},
+    ]))
+
+    command = BatchCommand(BatchConfig.from_base(base_config, manifest=manifest))
+    assert command.run() == 1
+    assert (tmp_path / 'ok.json').exists()
@@ -0,0 +1,193 @@
+import json
+import pytest
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+from alma_sbom.type import Hash, PackageNevra
+from alma_sbom.data import Build, Package
+from alma_sbom.data.attributes.property import BuildPropertiesForPackage
+from alma_sbom.data.collectors.albs import AlbsArtifact
+from alma_sbom.cli.config import CommonConfig, BuildConfig, CollectConfig
+from alma_sbom.cli.commands import BuildCommand
+from alma_sbom.cli.factory import CollectorFactory, DocumentFactory
+from alma_sbom.cli.main import Main
+
+
+
+class FakeAlbsCollector:
+    def __init__(self, pkg_hashes: list[str], build_finished: bool = True) -> None:
+        self.pkg_hashes = pkg_hashes
+        self.build_finished = build_finished
+
+    def collect_build_by_id(self, build_id: str) -> Build:
+        if build_id == '13':
+            raise RuntimeError('unknown build')
+        return Build(build_id=build_id, author='test author')
+
+    def iter_package_hash(self):
+        yield from self.pkg_hashes
+
+    def get_artifact(self, pkg_hash: str) -> AlbsArtifact:
+        return AlbsArtifact(pkg_hash, task_ids=['1', '2'], arches=['x86_64', 'aarch64'])
+
+    def iter_build_id_by_created_at(self, created_after: datetime, created_before: datetime = None):
+        yield from ['12', '11']
+
+@pytest.fixture
+def fake_albs(monkeypatch: pytest.MonkeyPatch, tested_hashes: list[str]) -> None:
+    monkeypatch.setattr(CollectorFactory, 'gen_albs_collector', lambda self: FakeAlbsCollector(tested_hashes[:2]))
+
+def _parse(*args: str) -> BuildConfig:
+    args = Main.create_parser().parse_args(['build', *args])
+    return BuildConfig.from_base_args(CommonConfig.from_args(args), args)
+
+def test_build_args() -> None:
+    config = _parse('--build-id', '42')
+    assert config.build_id == '42' and not config.is_multi()
+
+    config = _parse('--build-id', '42', '100-102', '--output-dir', 'out')
+    assert config.is_multi()
+    assert config.parse_build_ids(config.build_ids) == ['42', '100', '101', '102']
+
+    config = _parse('--created-after', '2024-04-01', '--output-dir', 'out')
+    assert config.created_after == datetime(2024, 4, 1)
+    assert config.created_before is None
+
+    ### dates with offsets are converted to naive UTC
+    config = _parse(
+        '--created-after', '2024-04-01T09:00+09:00',
+        '--created-before', '2024-05-01T00:00:00Z',
+        '--output-dir', 'out',
+    )
+    assert config.created_after == datetime(2024, 4, 1)
+    assert config.created_before == datetime(2024, 5, 1)
+
+def test_jobs_args(capsys: pytest.CaptureFixture) -> None:
+    parser = Main.create_parser()
+    assert parser.parse_args(['--jobs', '4', 'build', '--build-id', '42']).jobs == 4
+    for jobs in ['0', '-1', 'many']:
+        with pytest.raises(SystemExit):
+            parser.parse_args(['--jobs', jobs, 'build', '--build-id', '42'])
+        assert 'argument --jobs: must be a positive integer' in capsys.readouterr().err
+
+def test_parse_build_ids() -> None:
+    assert BuildConfig.parse_build_ids(('3', '1-3', '2')) == ['3', '1', '2']
+    for build_ids in [('a',), ('3-1',), ('1-',)]:
+        with pytest.raises(ValueError):
+            BuildConfig.parse_build_ids(build_ids)
+
+def test_invalid_config(base_config: CommonConfig, tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        BuildConfig.from_base(base_config, build_ids=('1-3',))
+    with pytest.raises(ValueError):
+        BuildConfig.from_base(base_config, build_ids=('1-3',), output_dir=tmp_path, output_template='{unknown}')
+    with pytest.raises(ValueError):
+        BuildConfig.from_base(base_config, build_id='1', build_ids=('1-3',), output_dir=tmp_path)
+    with pytest.raises(ValueError):
+        CollectConfig.from_base(
+            base_config,
+            target_command='build',
+            target=BuildConfig.from_base(base_config, build_ids=('1-3',), output_dir=tmp_path),
+        )
+
+def test_get_output_file(base_config: CommonConfig, tmp_path: Path) -> None:
+    config = BuildConfig.from_base(base_config, build_ids=('1',), output_dir=tmp_path)
+    assert config.get_output_file('42') == tmp_path / 'build-42.spdx.json'
+
+@pytest.mark.parametrize('build_ids', [('10-12',), ()], ids=['range', 'created_at'])
+def test_run_builds(build_ids: tuple, base_config: CommonConfig, fake_albs: None, fake_immudb: list, tmp_path: Path) -> None:
+    config = BuildConfig.from_base(
+        base_config,
+        build_ids=build_ids,
+        created_after=None if build_ids else datetime(2024, 4, 1),
+        output_dir=tmp_path / 'out',
+        output_template='{build_id}.json',
+    )
+    assert BuildCommand(config).run() == 0
+
+    output_files = sorted(path.name for path in (tmp_path / 'out').iterdir())
+    assert output_files == (['10.json', '11.json', '12.json'] if build_ids else ['11.json', '12.json'])
+    doc = json.loads((tmp_path / 'out' / '11.json').read_text())
+    assert len(doc['packages']) == 2
+    ### immudb collectors are shared by builds on each worker thread
+    assert len(fake_immudb) <= base_config.jobs
+
+def test_run_builds_with_failure(base_config: CommonConfig, fake_albs: None, fake_immudb: list, tmp_path: Path) -> None:
+    config = BuildConfig.from_base(base_config, build_ids=('12-14',), output_dir=tmp_path)
+    assert BuildCommand(config).run() == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['build-12.spdx.json', 'build-14.spdx.json']
+
+def test_set_build_tasks() -> None:
+    pkg = Package(
+        package_nevra=PackageNevra(epoch=None, name='bash', version='5.1.8', release='9.el9', arch='noarch'),
+        build_properties=BuildPropertiesForPackage(
+            build_id='1', build_url=None, author='test author',
+            package_type='rpm', target_arch='noarch', source=None,
+        ),
+    )
+    BuildCommand._set_build_tasks(pkg, FakeAlbsCollector([]).get_artifact('0' * 64))
+    properties = {prop.name: prop.value for prop in pkg.get_properties()}
+    assert properties['almalinux:albs:build:taskIDs'] == '1,2'
+    assert properties['almalinux:albs:build:taskArches'] == 'x86_64,aarch64'
+
+    ### packages without build properties are left as they are
+    pkg = Package(package_nevra=pkg.package_nevra)
+    BuildCommand._set_build_tasks(pkg, FakeAlbsCollector([]).get_artifact('0' * 64))
+    assert pkg.build_properties is None
+
+def test_map_concurrently_is_bounded(base_config: CommonConfig) -> None:
+    command = BuildCommand(BuildConfig.from_base(base_config, '1'))
+    pulled = []
+    def items():
+        for num in range(100):
+            pulled.append(num)
+            yield num
+
+    results = command._map_concurrently(lambda num: num * 2, items())
+    assert next(results) == 0
+    assert len(pulled) == base_config.jobs * BuildCommand.MAX_PENDING_PER_JOB
+    assert list(results) == [num * 2 for num in range(1, 100)]
+
+class ThreadCheckingImmudbCollector:
+    """Records the threads using it, and finishes earlier hashes later"""
+    def __init__(self, pkg_hashes: list[str]) -> None:
+        self.pkg_hashes = pkg_hashes
+        self.threads = set()
+
+    def collect_package_by_hash(self, hash: str, allow_negative: bool = False) -> Package:
+        self.threads.add(threading.get_ident())
+        time.sleep(0.01 * (len(self.pkg_hashes) - self.pkg_hashes.index(hash)))
+        return Package(
+            package_nevra=PackageNevra(epoch=None, name='bash', version='5.1.8', release='9.el9', arch='x86_64'),
+            hashs=[Hash(value=hash)],
+        )
+
+def test_build_with_jobs_matches_serial(base_config: CommonConfig, monkeypatch: pytest.MonkeyPatch, tested_hashes: list[str]) -> None:
+    collectors = []
+    def gen_immudb_collector(self) -> ThreadCheckingImmudbCollector:
+        collectors.append(ThreadCheckingImmudbCollector(tested_hashes))
+        return collectors[-1]
+    monkeypatch.setattr(CollectorFactory, 'gen_immudb_collector', gen_immudb_collector)
+    monkeypatch.setattr(CollectorFactory, 'gen_albs_collector', lambda self: FakeAlbsCollector(tested_hashes))
+
+    serial_build = BuildCommand(BuildConfig.from_base(replace(base_config, jobs=1), '1')).runner()
+    parallel_build = BuildCommand(BuildConfig.from_base(replace(base_config, jobs=4), '1')).runner()
+    assert parallel_build.packages == serial_build.packages
+    assert [pkg.hashs[0].value for pkg in parallel_build.packages] == tested_hashes
+
+    ### each worker thread looks hashes up with a collector of its own
+    assert all(len(collector.threads) == 1 for collector in collectors)
+    assert len(collectors) == len({thread for collector in collectors for thread in collector.threads})
+
+def test_stream_build(base_config: CommonConfig, fake_albs: None, fake_immudb: list, tmp_path: Path) -> None:
+    base = replace(base_config, output_file=tmp_path / 'sbom.json', stream=True)
+    command = BuildCommand(BuildConfig.from_base(base, '1'))
+    build = command.runner()
+    ### packages are looked up while the document is written
+    assert not isinstance(build.packages, list)
+    assert not fake_immudb
+    assert command._write_documents(DocumentFactory.gen_from_build, build) == 0
+    assert len(json.loads((tmp_path / 'sbom.json').read_text())['packages']) == 2
@@ -0,0 +1,85 @@
+import argparse
+import json
+import pytest
+from dataclasses import replace
+from pathlib import Path
+
+from alma_sbom.type import SbomType, ValidationMode
+from alma_sbom.cli.config import CommonConfig, BatchTarget, PackageConfig
+from alma_sbom.cli.commands import PackageCommand
+from alma_sbom.cli.main import Main
+from alma_sbom.formats.spdx import validation
+
+
+def test_parse_format_output() -> None:
+    assert CommonConfig.parse_format_output('cyclonedx-xml=out/sbom.xml') == (
+        SbomType.from_str('cyclonedx-xml'), Path('out/sbom.xml'),
+    )
+    with pytest.raises(ValueError):
+        CommonConfig.parse_format_output('cyclonedx-xml')
+    with pytest.raises(ValueError):
+        CommonConfig.parse_format_output('cyclonedx-tagvalue=sbom.spdx')
+    with pytest.raises(argparse.ArgumentTypeError):
+        CommonConfig.parse_format_output('cyclonedx=sbom.json')
+
+def test_formats_args(tested_hashes: list[str]) -> None:
+    args = Main.create_parser().parse_args([
+        '--formats', 'spdx-json=a.json,cyclonedx-json=b.json',
+        'package', '--rpm-package-hash', tested_hashes[0],
+    ])
+    config = CommonConfig.from_args(args)
+    assert config.formats == (
+        (SbomType.from_str('spdx-json'), Path('a.json')),
+        (SbomType.from_str('cyclonedx-json'), Path('b.json')),
+    )
+
+def test_get_output_configs(base_config: CommonConfig, tested_hashes: list[str]) -> None:
+    assert base_config.get_output_configs() == [base_config]
+
+    config = PackageConfig.from_base(
+        replace(base_config, formats=(
+            CommonConfig.parse_format_output('spdx-json=a.json'),
+            CommonConfig.parse_format_output('cyclonedx-xml=b.xml'),
+        )),
+        tested_hashes[0], None,
+    )
+    output_configs = config.get_output_configs()
+    assert [(str(c.sbom_type), c.output_file) for c in output_configs] == [
+        ('spdx-json', Path('a.json')),
+        ('cyclonedx-xml', Path('b.xml')),
+    ]
+    assert all(isinstance(c, PackageConfig) and not c.formats for c in output_configs)
+    assert all(c.rpm_package_hash == tested_hashes[0] for c in output_configs)
+
+    with pytest.raises(ValueError):
+        replace(base_config, formats=(
+            CommonConfig.parse_format_output('spdx-json=a.json'),
+            CommonConfig.parse_format_output('cyclonedx-json=a.json'),
+        ))
+
+def test_batch_target_ignores_formats(base_config: CommonConfig) -> None:
+    base = replace(base_config, formats=(CommonConfig.parse_format_output('spdx-json=a.json'),))
+    config = BatchTarget.from_dict({'build_id': '1', 'output_file': 'out.json'}).to_config(base)
+    assert config.get_output_configs() == [config]
+
+def test_run_with_formats(base_config: CommonConfig, fake_immudb: list, tmp_path: Path, tested_hashes: list[str]) -> None:
+    base = replace(base_config, formats=tuple(
+        CommonConfig.parse_format_output(f'{sbom_type}={tmp_path / sbom_type}')
+        for sbom_type in ['spdx-json', 'spdx-tagvalue', 'cyclonedx-json']
+    ))
+    command = PackageCommand(PackageConfig.from_base(base, tested_hashes[0], None))
+    assert command.run() == 0
+
+    ### the package is collected once for all formats
+    assert len(fake_immudb) == 1
+    assert json.loads((tmp_path / 'spdx-json').read_text())['spdxVersion']
+    assert 'SPDXVersion: SPDX-2.3' in (tmp_path / 'spdx-tagvalue').read_text()
+    assert json.loads((tmp_path / 'cyclonedx-json').read_text())['bomFormat'] == 'CycloneDX'
+
+def test_run_with_async_validation_failure(base_config: CommonConfig, fake_immudb: list, monkeypatch: pytest.MonkeyPatch, tested_hashes: list[str]) -> None:
+    monkeypatch.setattr(validation, 'validate_full_spdx_document', lambda document: ['invalid'])
+    base = replace(base_config, validation=ValidationMode.ASYNC)
+    command = PackageCommand(PackageConfig.from_base(base, tested_hashes[0], None))
+    assert command.run() == 1
+    ### the document is in place before its validation has finished
+    assert json.loads(base.output_file.read_text())['spdxVersion']
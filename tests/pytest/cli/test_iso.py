@@ -0,0 +1,98 @@
+import hashlib
+import pytest
+from dataclasses import replace
+from pathlib import Path
+
+from alma_sbom.type import Hash, PackageNevra
+from alma_sbom.data import Package
+from alma_sbom.cli.config import CommonConfig, IsoConfig
+from alma_sbom.cli.commands import IsoCommand
+from alma_sbom.cli.factory import CollectorFactory
+
+
+def _gen_package(data: bytes) -> Package:
+    return Package(
+        package_nevra=PackageNevra(epoch=None, name=f'dummy{data[0]}', version='1.0', release='1.el9', arch='x86_64'),
+        hashs=[Hash(value=hashlib.sha256(data).hexdigest())],
+    )
+
+class FakeRpmCollector:
+    """Reads the dummy packages of tested_iso_image, which are not real rpm files"""
+    def collect_package_from_file(self, path: Path) -> Package:
+        with open(path, 'rb') as fd:
+            return _gen_package(fd.read())
+
+    def collect_package_from_window(self, window) -> Package:
+        return _gen_package(bytes(window.data))
+
+class FakeImmudbCollector:
+    def __init__(self, known_hashes: set[str]) -> None:
+        self.known_hashes = known_hashes
+
+    def collect_package_by_hash(self, hash: str, allow_negative: bool = False) -> Package:
+        if hash not in self.known_hashes:
+            raise KeyError(hash)
+        return Package(summary='notarized', hashs=[Hash(value=hash)])
+
+@pytest.fixture
+def fake_iso_collectors(monkeypatch: pytest.MonkeyPatch, tested_iso_packages: dict[str, bytes]) -> set[str]:
+    """Replace rpm and immudb collectors, which are inherited by forked workers
+
+    Only even packages are known by immudb, so the others fall back to NullPackage.
+    """
+    known_hashes = {
+        hashlib.sha256(data).hexdigest()
+        for data in tested_iso_packages.values()
+        if data[0] % 2 == 0
+    }
+    monkeypatch.setattr(CollectorFactory, 'gen_rpm_collector', lambda self: FakeRpmCollector())
+    monkeypatch.setattr(CollectorFactory, 'gen_immudb_collector', lambda self: FakeImmudbCollector(known_hashes))
+    return known_hashes
+
+@pytest.mark.parametrize('zero_copy', [False, True], ids=['memfd', 'zero_copy'])
+def test_parallel_runner_matches_serial(
+    zero_copy: bool,
+    base_config: CommonConfig,
+    tested_iso_image: Path,
+    tested_iso_packages: dict[str, bytes],
+    fake_iso_collectors: set[str],
+) -> None:
+    serial_command = IsoCommand(IsoConfig.from_base(replace(base_config, jobs=1), tested_iso_image, zero_copy=zero_copy))
+    parallel_command = IsoCommand(IsoConfig.from_base(replace(base_config, jobs=2), tested_iso_image, zero_copy=zero_copy))
+    assert serial_command.runner == serial_command._runner_with_iso_image
+    assert parallel_command.runner == parallel_command._runner_with_iso_image_in_parallel
+
+    serial_packages = serial_command.runner().packages
+    parallel_packages = parallel_command.runner().packages
+    assert parallel_packages == serial_packages
+
+    assert [pkg.package_nevra.name for pkg in parallel_packages] == [
+        f'dummy{data[0]}' for data in tested_iso_packages.values()
+    ]
+    assert [pkg.summary for pkg in parallel_packages] == [
+        'notarized' if pkg.hashs[0].value in fake_iso_collectors else None
+        for pkg in parallel_packages
+    ]
+
+def test_parallel_runner_is_bounded(
+    base_config: CommonConfig,
+    tested_iso_image: Path,
+    fake_iso_collectors: set[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(IsoCommand, 'CHUNK_SIZE', 1)
+    monkeypatch.setattr(IsoCommand, 'MAX_PENDING_PER_JOB', 1)
+    pulled = []
+    iter_chunks = IsoCommand._iter_chunks
+    def iter_pulled_chunks(self, package_paths: list[Path]):
+        for chunk in iter_chunks(self, package_paths):
+            pulled.append(chunk)
+            yield chunk
+    monkeypatch.setattr(IsoCommand, '_iter_chunks', iter_pulled_chunks)
+
+    command = IsoCommand(IsoConfig.from_base(replace(base_config, jobs=2, stream=True), tested_iso_image))
+    packages = command.runner().packages
+    ### packages are processed while the streaming document is written
+    assert next(packages).package_nevra.name == 'dummy0'
+    assert len(pulled) == 2
+    assert [pkg.package_nevra.name for pkg in packages] == ['dummy1', 'dummy2', 'dummy3']
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = ['immudb_wrapper', 'spdx_tools', 'cyclonedx', 'rpm', 'pycdlib', 'requests']
+
+def _loaded_modules(code: str) -> set[str]:
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        f'import sys\n{code}\nprint(" ".join(sys.modules))',
+    ], text=True)
+    return {name.split('.')[0] for name in output.split()}
+
+def test_startup_does_not_import_backends() -> None:
+    loaded = _loaded_modules(
+        'from alma_sbom.cli.main import Main\n'
+        'Main.create_parser().format_help()'
+    )
+    assert not loaded & set(HEAVY_MODULES)
+
+def test_document_factory_imports_selected_backend() -> None:
+    loaded = _loaded_modules(
+        'from alma_sbom.type import SbomRecordType\n'
+        'from alma_sbom.formats import document_factory\n'
+        'document_factory(SbomRecordType.CYCLONEDX)'
+    )
+    assert 'cyclonedx' in loaded
+    assert 'spdx_tools' not in loaded
@@ -0,0 +1,36 @@
+import pytest
+from pathlib import Path
+
+from alma_sbom.cli.config import CommonConfig, NotarizedFilterConfig
+from alma_sbom.cli.commands import NotarizedFilterCommand
+from alma_sbom.cli.main import Main
+from alma_sbom.data.collectors.immudb.bloom import BloomFilter
+
+
+def test_notarized_filter(tmp_path: Path, tested_hashes: list[str]) -> None:
+    hashes = tmp_path / 'hashes.txt'
+    hashes.write_text('# notarized hashes\n' + '\n'.join(tested_hashes[:2]) + '\n\n')
+    args = Main.create_parser().parse_args([
+        '--output-file', str(tmp_path / 'filter'),
+        'notarized-filter', '--hashes', str(hashes),
+    ])
+    config = NotarizedFilterConfig.from_base_args(CommonConfig.from_args(args), args)
+    assert NotarizedFilterCommand(config).run() == 0
+
+    bloom_filter = BloomFilter.read(tmp_path / 'filter')
+    assert all(hash in bloom_filter for hash in tested_hashes[:2])
+
+    ### the filter is given to other subcommands
+    args = Main.create_parser().parse_args([
+        '--notarized-filter', str(tmp_path / 'filter'),
+        'package', '--rpm-package-hash', tested_hashes[0],
+    ])
+    assert CommonConfig.from_args(args).notarized_filter == tmp_path / 'filter'
+
+def test_missing_notarized_filter(tmp_path: Path, tested_hashes: list[str]) -> None:
+    args = Main.create_parser().parse_args([
+        '--notarized-filter', str(tmp_path / 'missing'),
+        'package', '--rpm-package-hash', tested_hashes[0],
+    ])
+    with pytest.raises(FileNotFoundError):
+        CommonConfig.from_args(args)
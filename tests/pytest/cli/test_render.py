@@ -0,0 +1,50 @@
+import json
+import pytest
+from dataclasses import replace
+from pathlib import Path
+
+from alma_sbom.cli.config import CommonConfig, CollectConfig, RenderConfig, PackageConfig
+from alma_sbom.cli.commands import CollectCommand, RenderCommand
+from alma_sbom.cli.factory import CollectorFactory
+from alma_sbom.cli.main import Main
+from alma_sbom.data.snapshot import read_snapshot
+
+
+@pytest.fixture
+def snapshot(base_config: CommonConfig, fake_immudb: list, tmp_path: Path, tested_hashes: list[str]) -> Path:
+    base = replace(base_config, output_file=tmp_path / 'snapshot.ndjson')
+    config = CollectConfig.from_base(
+        base,
+        target_command='package',
+        target=PackageConfig.from_base(base, tested_hashes[0], None),
+    )
+    assert CollectCommand(config).run() == 0
+    return base.output_file
+
+def test_collect(snapshot: Path, fake_immudb: list, tested_hashes: list[str]) -> None:
+    pkg = read_snapshot(snapshot)
+    assert pkg.hashs[0].value == tested_hashes[0]
+    assert len(fake_immudb) == 1
+
+def test_collect_args() -> None:
+    args = Main.create_parser().parse_args(['collect', 'build', '--build-id', '42'])
+    config = CollectConfig.from_base_args(CommonConfig.from_args(args), args)
+    assert config.target_command == 'build'
+    assert config.target.build_id == '42'
+
+def test_render(snapshot: Path, base_config: CommonConfig, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    ### nothing is collected while rendering
+    for name in ['gen_immudb_collector', 'gen_albs_collector', 'gen_rpm_collector', 'gen_iso_collector']:
+        monkeypatch.setattr(CollectorFactory, name, None)
+
+    base = replace(base_config, formats=(
+        CommonConfig.parse_format_output(f'spdx-json={tmp_path / "sbom.spdx.json"}'),
+        CommonConfig.parse_format_output(f'cyclonedx-json={tmp_path / "sbom.cdx.json"}'),
+    ))
+    assert RenderCommand(RenderConfig.from_base(base, snapshot)).run() == 0
+    assert json.loads((tmp_path / 'sbom.spdx.json').read_text())['packages'][0]['name'] == 'bash'
+    assert json.loads((tmp_path / 'sbom.cdx.json').read_text())['metadata']['component']['name'] == 'bash'
+
+def test_render_missing_snapshot(base_config: CommonConfig, tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        RenderConfig.from_base(base_config, tmp_path / 'missing.ndjson')
@@ -0,0 +1,140 @@
+import json
+import socket
+import threading
+import pytest
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from alma_sbom.data import Build
+from alma_sbom.data.collectors.albs import AlbsArtifact
+from alma_sbom.cli.config import CommonConfig, ServeConfig
+from alma_sbom.cli.commands.serve import ServeCommand, DocumentCache
+from alma_sbom.cli.factory import CollectorFactory
+
+
+
+@pytest.fixture
+def server_url(base_config: CommonConfig, fake_immudb: list):
+    command = ServeCommand(ServeConfig.from_base(base_config, port=0, document_cache_size=2))
+    server = command.runner()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield f'http://{host}:{port}'
+    server.shutdown()
+    server.server_close()
+
+def test_document_cache() -> None:
+    cache = DocumentCache(max_size=2)
+    cache.put(('package', 'a'), b'a')
+    cache.put(('package', 'b'), b'b')
+    assert cache.get(('package', 'a')) == b'a'
+    cache.put(('package', 'c'), b'c')
+    ### 'b' is the least recently used one
+    assert cache.get(('package', 'b')) is None
+    assert cache.get(('package', 'a')) == b'a'
+    assert len(cache) == 2
+
+    cache = DocumentCache(max_size=0)
+    cache.put(('package', 'a'), b'a')
+    assert cache.get(('package', 'a')) is None
+
+def test_serve_package(server_url: str, fake_immudb: list, tested_hashes: list[str]) -> None:
+    with urlopen(f'{server_url}/package?rpm_package_hash={tested_hashes[0]}') as res:
+        assert res.headers['Content-Type'] == 'application/json'
+        first = res.read()
+    assert json.loads(first)['spdxVersion']
+
+    ### repeated requests are served from the document cache
+    with urlopen(f'{server_url}/package?rpm_package_hash={tested_hashes[0]}') as res:
+        assert res.read() == first
+
+    with urlopen(
+        f'{server_url}/package?rpm_package_hash={tested_hashes[0]}&file_format=cyclonedx-json'
+    ) as res:
+        assert 'bomFormat' in json.loads(res.read())
+
+    ### immudb collectors live as long as the worker threads of the server
+    assert 1 <= len(fake_immudb) <= 2
+
+class FakeAlbsCollector:
+    def __init__(self, pkg_hashes: list[str], build_finished: bool) -> None:
+        self.pkg_hashes = pkg_hashes
+        self.build_finished = build_finished
+
+    def collect_build_by_id(self, build_id: str) -> Build:
+        return Build(build_id=build_id, author='test author')
+
+    def iter_package_hash(self):
+        yield from self.pkg_hashes
+
+    def get_artifact(self, pkg_hash: str) -> AlbsArtifact:
+        return AlbsArtifact(pkg_hash)
+
+@pytest.mark.parametrize('build_finished', [True, False], ids=['finished', 'unfinished'])
+def test_serve_build_caches_finished_builds(
+    build_finished: bool,
+    base_config: CommonConfig,
+    fake_immudb: list,
+    monkeypatch: pytest.MonkeyPatch,
+    tested_hashes: list[str],
+) -> None:
+    monkeypatch.setattr(
+        CollectorFactory, 'gen_albs_collector',
+        lambda self: FakeAlbsCollector(tested_hashes[:2], build_finished),
+    )
+    command = ServeCommand(ServeConfig.from_base(base_config, port=0, document_cache_size=2))
+    document, _ = command.generate('/build', {'build_id': '1'})
+    assert json.loads(document)['spdxVersion']
+    ### packages may still be added to unfinished builds
+    assert len(command._documents) == (1 if build_finished else 0)
+
+@pytest.mark.parametrize('path, status', [
+    ('/package?rpm_package_hash=unknown', 404),
+    ('/unknown?rpm_package_hash=unknown', 404),
+    ('/package', 400),
+    ('/package?rpm_package_hash={hash}&file_format=cyclonedx-yaml', 400),
+])
+def test_serve_errors(server_url: str, path: str, status: int, tested_hashes: list[str]) -> None:
+    with pytest.raises(HTTPError) as e:
+        urlopen(server_url + path.format(hash=tested_hashes[0]))
+    assert e.value.code == status
+
+def test_unix_socket_is_removed_on_close(base_config: CommonConfig, tmp_path: Path) -> None:
+    unix_socket = tmp_path / 'sbom.sock'
+    ### a socket left by a previous run is replaced
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(unix_socket))
+    command = ServeCommand(ServeConfig.from_base(base_config, unix_socket=unix_socket))
+    server = command.runner()
+    assert unix_socket.is_socket()
+    server.server_close()
+    server.remove_socket()
+    assert not unix_socket.exists()
+
+def test_unix_socket_replaced_by_another_is_kept(base_config: CommonConfig, tmp_path: Path) -> None:
+    unix_socket = tmp_path / 'sbom.sock'
+    server = ServeCommand(ServeConfig.from_base(base_config, unix_socket=unix_socket)).runner()
+    server.server_close()
+    unix_socket.unlink()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as other:
+        other.bind(str(unix_socket))
+        server.remove_socket()
+        assert unix_socket.is_socket()
+
+def test_unix_socket_in_use(base_config: CommonConfig, tmp_path: Path) -> None:
+    unix_socket = tmp_path / 'sbom.sock'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as other:
+        other.bind(str(unix_socket))
+        other.listen()
+        with pytest.raises(FileExistsError):
+            ServeCommand(ServeConfig.from_base(base_config, unix_socket=unix_socket)).runner()
+        assert unix_socket.is_socket()
+
+def test_unix_socket_is_not_a_socket(base_config: CommonConfig, tmp_path: Path) -> None:
+    unix_socket = tmp_path / 'sbom.sock'
+    unix_socket.write_text('not a socket')
+    with pytest.raises(FileExistsError):
+        ServeConfig.from_base(base_config, unix_socket=unix_socket)
+    assert unix_socket.read_text() == 'not a socket'
@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+import io
+import pycdlib
+import pytest
+from pathlib import Path
+
+TESTED_TREEINFO = (
+    b'[general]\n'
+    b'family = AlmaLinux\n'
+    b'version = 9\n'
+    b'variants = Minimal\n'
+    b'[variant-Minimal]\n'
+    b'packages = Minimal/Packages\n'
+    b'repository = Minimal\n'
+)
+TESTED_ISO_PACKAGES = {
+    f'dummy{i}-1.0-1.el9.x86_64.rpm': bytes([i]) * (3000 + i * 2048)
+    for i in range(4)
+}
+
+
+def _make_repomd() -> bytes:
+    return (
+        b'<repomd xmlns="http://linux.duke.edu/metadata/repo">'
+        b'<data type="primary"><location href="repodata/primary.xml.gz"/></data>'
+        b'</repomd>'
+    )
+
+
+def _make_primary(packages: dict[str, bytes]) -> bytes:
+    primary = (
+        '<metadata xmlns="http://linux.duke.edu/metadata/common" '
+        'xmlns:rpm="http://linux.duke.edu/metadata/rpm">'
+    )
+    for name, data in packages.items():
+        pkg_name = name.split('-')[0]
+        primary += (
+            '<package type="rpm">'
+            f'<name>{pkg_name}</name><arch>x86_64</arch>'
+            '<version epoch="0" ver="1.0" rel="1.el9"/>'
+            f'<checksum type="sha256" pkgid="YES">{hashlib.sha256(data).hexdigest()}</checksum>'
+            f'<summary>{pkg_name}</summary><description>{pkg_name}</description>'
+            f'<location href="Packages/{name}"/>'
+            '<format><rpm:license>MIT</rpm:license>'
+            f'<rpm:sourcerpm>{pkg_name}-1.0-1.el9.src.rpm</rpm:sourcerpm></format>'
+            '</package>'
+        )
+    primary += '</metadata>'
+    return primary.encode('utf-8')
+
+
+@pytest.fixture
+def tested_iso_packages() -> dict[str, bytes]:
+    """Packages in tested_iso_image, which are not real rpm files"""
+    return dict(TESTED_ISO_PACKAGES)
+
+
+@pytest.fixture
+def tested_iso_image(tmp_path: Path) -> Path:
+    """ISO image of a Minimal variant with tested_iso_packages and their repodata"""
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', interchange_level=4)
+    iso.add_fp(io.BytesIO(TESTED_TREEINFO), len(TESTED_TREEINFO), '/.treeinfo', rr_name='.treeinfo')
+    iso.add_directory('/Minimal', rr_name='Minimal')
+    iso.add_directory('/Minimal/Packages', rr_name='Packages')
+    for name, data in TESTED_ISO_PACKAGES.items():
+        iso.add_fp(io.BytesIO(data), len(data), f'/Minimal/Packages/{name}', rr_name=name)
+    iso.add_directory('/Minimal/repodata', rr_name='repodata')
+    repomd = _make_repomd()
+    iso.add_fp(io.BytesIO(repomd), len(repomd), '/Minimal/repodata/repomd.xml', rr_name='repomd.xml')
+    primary = gzip.compress(_make_primary(TESTED_ISO_PACKAGES))
+    iso.add_fp(io.BytesIO(primary), len(primary), '/Minimal/repodata/primary.xml.gz', rr_name='primary.xml.gz')
+    iso_image = tmp_path / 'tested.iso'
+    iso.write(str(iso_image))
+    iso.close()
+    return iso_image
@@ -0,0 +1,39 @@
+import pytest
+
+from alma_sbom.data.collectors.immudb.bloom import BloomFilter
+
+TESTED_HASHES = [f'{num:064x}' for num in range(1000)]
+ABSENT_HASHES = [f'{num:064x}' for num in range(1000, 11000)]
+
+
+@pytest.fixture
+def bloom_filter_instance() -> BloomFilter:
+    return BloomFilter.from_hashes(TESTED_HASHES, false_positive_rate=0.01)
+
+
+def test_contains(bloom_filter_instance: BloomFilter) -> None:
+    ### there are never false negatives
+    assert all(hash in bloom_filter_instance for hash in TESTED_HASHES)
+    assert TESTED_HASHES[0].upper() in bloom_filter_instance
+    false_positives = sum(hash in bloom_filter_instance for hash in ABSENT_HASHES)
+    assert false_positives < len(ABSENT_HASHES) * 0.02
+
+
+def test_write_read(bloom_filter_instance: BloomFilter, tmp_path) -> None:
+    bloom_filter_instance.write(tmp_path / 'filter')
+    bloom_filter = BloomFilter.read(tmp_path / 'filter')
+    assert bloom_filter.num_bits == bloom_filter_instance.num_bits
+    assert bloom_filter.num_hashes == bloom_filter_instance.num_hashes
+    assert bloom_filter.bits == bloom_filter_instance.bits
+
+
+@pytest.mark.parametrize('data', [b'', b'not a filter', BloomFilter.HEADER.pack(b'ASBF', 1, 3, 64)])
+def test_read_invalid(data: bytes, tmp_path) -> None:
+    (tmp_path / 'filter').write_bytes(data)
+    with pytest.raises(ValueError):
+        BloomFilter.read(tmp_path / 'filter')
+
+
+def test_invalid_rate() -> None:
+    with pytest.raises(ValueError):
+        BloomFilter.for_capacity(10, false_positive_rate=1)
@@ -0,0 +1,170 @@
+import json
+import pytest
+import time
+
+from alma_sbom.data.collectors import ImmudbCollector
+from alma_sbom.data.collectors.immudb.bloom import BloomFilter
+from alma_sbom.data.collectors.immudb.cache import ImmudbCache
+
+TESTED_HASH_VALUE = '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1'
+TESTED_IMMUDB_INFO = {
+    'Name': 'bash-5.1.8-9.el9.x86_64.rpm',
+    'Hash': TESTED_HASH_VALUE,
+    'Metadata': {
+        'sbom_api_ver': '0.2',
+        'name': 'bash',
+    },
+    'timestamp': 1714500330,
+}
+
+
+@pytest.fixture
+def immudb_cache_instance(tmp_path) -> ImmudbCache:
+    return ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024)
+
+
+def test_get_put(immudb_cache_instance: ImmudbCache) -> None:
+    assert immudb_cache_instance.get(TESTED_HASH_VALUE) is None
+    immudb_cache_instance.put(TESTED_HASH_VALUE, TESTED_IMMUDB_INFO)
+    assert immudb_cache_instance.get(TESTED_HASH_VALUE) == TESTED_IMMUDB_INFO
+    assert immudb_cache_instance.hits == 1
+    assert immudb_cache_instance.misses == 1
+
+
+def test_persistence(tmp_path) -> None:
+    ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024).put(TESTED_HASH_VALUE, TESTED_IMMUDB_INFO)
+    assert ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024).get(TESTED_HASH_VALUE) == TESTED_IMMUDB_INFO
+
+
+def test_refresh(tmp_path) -> None:
+    ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024).put(TESTED_HASH_VALUE, TESTED_IMMUDB_INFO)
+    assert ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024, refresh=True).get(TESTED_HASH_VALUE) is None
+
+
+def test_lru_eviction(tmp_path) -> None:
+    value = {'Metadata': {'data': 'x' * 100}}
+    entry_size = len(json.dumps(value, separators=(',', ':')))
+    cache = ImmudbCache(cache_dir=tmp_path, max_size=entry_size * 3)
+    cache.put('hash1', value)
+    cache.put('hash2', value)
+    cache.put('hash3', value)
+    cache.get('hash1')
+    cache.put('hash4', value)
+    ### the least recently used ones are evicted below 90% of max_size
+    assert cache.get('hash1') == value
+    assert cache.get('hash2') is None
+    assert cache.get('hash3') is None
+    assert cache.get('hash4') == value
+
+    ### so that the next put does not evict anything
+    cache.put('hash5', value)
+    assert cache.get('hash1') == value
+
+
+def test_eviction_counts_other_instances(tmp_path) -> None:
+    value = {'Metadata': {'data': 'x' * 100}}
+    entry_size = len(json.dumps(value, separators=(',', ':')))
+    ### like the worker processes of the iso subcommand sharing a database
+    caches = [ImmudbCache(cache_dir=tmp_path, max_size=entry_size * 4) for _ in range(2)]
+    for num in range(10):
+        caches[num % 2].put(f'hash{num}', value)
+    total_size = caches[0]._conn.execute('SELECT SUM(size) FROM entries').fetchone()[0]
+    assert total_size <= entry_size * 4
+
+
+def test_hits_write_access_times_in_batches(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ImmudbCache, 'ACCESS_BATCH_SIZE', 2)
+    cache = ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024)
+    cache.put('hash1', TESTED_IMMUDB_INFO)
+    cache.put('hash2', TESTED_IMMUDB_INFO)
+    def accessed_at(key: str) -> float:
+        return cache._conn.execute('SELECT accessed_at FROM entries WHERE key = ?', (key,)).fetchone()[0]
+    put_at = accessed_at('hash1')
+
+    cache.get('hash1')
+    assert accessed_at('hash1') == put_at
+    cache.get('hash2')
+    assert accessed_at('hash1') > put_at
+
+    ### close() writes the rest
+    batch_at = accessed_at('hash1')
+    cache.get('hash1')
+    cache.close()
+    cache = ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024)
+    assert accessed_at('hash1') > batch_at
+
+
+def test_missing(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024, negative_ttl=3600)
+    assert not cache.is_missing(TESTED_HASH_VALUE)
+    cache.put_missing(TESTED_HASH_VALUE)
+    assert cache.is_missing(TESTED_HASH_VALUE)
+    assert cache.get(TESTED_HASH_VALUE) is None
+
+    ### absent hashes are looked up again after negative_ttl
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 3600)
+    assert not cache.is_missing(TESTED_HASH_VALUE)
+
+
+def test_missing_disabled(tmp_path) -> None:
+    cache = ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024)
+    cache.put_missing(TESTED_HASH_VALUE)
+    assert not cache.is_missing(TESTED_HASH_VALUE)
+    assert ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024, negative_ttl=3600).is_missing(TESTED_HASH_VALUE) is False
+
+
+class FakeClient:
+    def __init__(self, response: dict) -> None:
+        self.response = response
+        self.hashes = []
+
+    def authenticate(self, hash: str) -> dict:
+        self.hashes.append(hash)
+        return self.response
+
+
+def _gen_collector(client: FakeClient, **kwargs) -> ImmudbCollector:
+    collector = ImmudbCollector('username', 'password', 'database', 'address', None, **kwargs)
+    collector.client = client
+    return collector
+
+
+@pytest.mark.parametrize('response, stored', [
+    ({'value': {}}, True),
+    ({'error': 'tbtree: key not found'}, True),
+    ({'error': 'connection refused'}, False),
+])
+def test_collector_skips_missing(response: dict, stored: bool, tmp_path) -> None:
+    cache = ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024, negative_ttl=3600)
+    client = FakeClient(response)
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            _gen_collector(client, cache=cache).collect_package_by_hash(TESTED_HASH_VALUE, allow_negative=True)
+    assert len(client.hashes) == (1 if stored else 2)
+
+
+def test_collector_skips_hash_not_in_filter() -> None:
+    client = FakeClient({'value': TESTED_IMMUDB_INFO, 'timestamp': 1714500330})
+    collector = _gen_collector(client, notarized_filter=BloomFilter.from_hashes(['0' * 64], 0.001))
+    with pytest.raises(KeyError):
+        collector.collect_package_by_hash(TESTED_HASH_VALUE, allow_negative=True)
+    assert not client.hashes
+
+    ### builds look up hashes not in the filter, which may be notarized since it was made
+    assert 'Metadata' in collector._extract_immudb_info_about_package(hash=TESTED_HASH_VALUE)
+    assert client.hashes == [TESTED_HASH_VALUE]
+
+def test_collector_looks_up_stale_missing_hash(tmp_path) -> None:
+    cache = ImmudbCache(cache_dir=tmp_path, max_size=1024 * 1024, negative_ttl=3600)
+    cache.put_missing(TESTED_HASH_VALUE)
+    client = FakeClient({'value': TESTED_IMMUDB_INFO, 'timestamp': 1714500330})
+    collector = _gen_collector(client, cache=cache)
+    with pytest.raises(KeyError):
+        collector.collect_package_by_hash(TESTED_HASH_VALUE, allow_negative=True)
+    assert not client.hashes
+
+    ### a build is not blocked by a hash found absent before it was notarized
+    assert 'Metadata' in collector._extract_immudb_info_about_package(hash=TESTED_HASH_VALUE)
+    assert client.hashes == [TESTED_HASH_VALUE]
+    assert cache.get(TESTED_HASH_VALUE) is not None
@@ -1,8 +1,10 @@
 import pytest
+from datetime import datetime, timedelta, timezone
 
 from alma_sbom.data import Build
 from alma_sbom.data.attributes.property import BuildPropertiesForBuild as BuildProperties
 from alma_sbom.data.collectors import AlbsCollector
+from alma_sbom.data.collectors.albs import AlbsArtifact
 from alma_sbom.cli.config import CommonConfig
 
 EXPECTED_BUILD = Build(
@@ -16,6 +18,38 @@ EXPECTED_BUILD = Build(
     )
 )
 
+TESTED_BUILD_PAGES = [
+    [
+        {'id': 10, 'created_at': '2024-04-30T10:00:00Z'},
+        {'id': 9, 'created_at': '2024-04-20T12:00:00.123456+02:00'},
+    ],
+    [
+        {'id': 8, 'created_at': '2024-04-10T00:00:00'},
+        ### 2024-04-01T01:00:00 in UTC
+        {'id': 7, 'created_at': '2024-03-31T23:00:00-02:00'},
+        {'id': 6, 'created_at': '2024-03-30T00:00:00'},
+    ],
+    [],
+]
+
+
+class FakeBuildListSession:
+    """Session answering the pages of the build list of ALBS"""
+    def __init__(self) -> None:
+        self.page_numbers = []
+
+    def get(self, url: str, params: dict) -> 'FakeBuildListSession':
+        assert url == f'{CommonConfig.DEF_ALBS_URL}/api/v1/builds/'
+        self.page_numbers.append(params['pageNumber'])
+        self.builds = TESTED_BUILD_PAGES[params['pageNumber'] - 1]
+        return self
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return {'builds': self.builds}
+
 
 @pytest.fixture
 def albs_collector_instance() -> AlbsCollector:
@@ -31,3 +65,44 @@ def test_collect_build_by_id_and_iter_package_hash(albs_collector_instance: Albs
         tested_pkg_hash_list.append(pkg)
     assert tested_pkg_hash_list == albs_collector_instance.package_hash_list
 
+
+
+def test_index_artifacts() -> None:
+    build_info = {
+        'tasks': [
+            {'id': 1, 'arch': 'x86_64', 'artifacts': [
+                {'type': 'rpm', 'cas_hash': 'noarch'},
+                {'type': 'rpm', 'cas_hash': 'x86_64'},
+                {'type': 'build_log', 'cas_hash': None},
+            ]},
+            {'id': 2, 'arch': 'aarch64', 'artifacts': [
+                {'type': 'rpm', 'cas_hash': 'aarch64'},
+                {'type': 'rpm', 'cas_hash': 'noarch'},
+            ]},
+        ],
+    }
+    artifacts = AlbsCollector._index_artifacts(build_info)
+    assert list(artifacts) == ['noarch', 'x86_64', 'aarch64']
+    assert artifacts['noarch'] == AlbsArtifact('noarch', task_ids=['1', '2'], arches=['x86_64', 'aarch64'])
+    assert artifacts['aarch64'] == AlbsArtifact('aarch64', task_ids=['2'], arches=['aarch64'])
+
+
+@pytest.mark.parametrize('created_after,created_before,expected_ids,expected_pages', [
+    ### stops at the first build older than created_after
+    (datetime(2024, 4, 1), None, ['10', '9', '8', '7'], [1, 2]),
+    ### created_before is excluded, offsets are compared in UTC
+    (datetime(2024, 4, 1), datetime(2024, 4, 30, 10), ['9', '8', '7'], [1, 2]),
+    (datetime(2024, 4, 15, 9, tzinfo=timezone(timedelta(hours=9))), None, ['10', '9'], [1, 2]),
+    ### stops at the empty last page
+    (datetime(2024, 1, 1), None, ['10', '9', '8', '7', '6'], [1, 2, 3]),
+])
+def test_iter_build_id_by_created_at(
+    created_after: datetime,
+    created_before: datetime,
+    expected_ids: list[str],
+    expected_pages: list[int],
+) -> None:
+    session = FakeBuildListSession()
+    collector = AlbsCollector(CommonConfig.DEF_ALBS_URL, session=session)
+    assert list(collector.iter_build_id_by_created_at(created_after, created_before)) == expected_ids
+    assert session.page_numbers == expected_pages
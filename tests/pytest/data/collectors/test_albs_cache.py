@@ -0,0 +1,138 @@
+import json
+import pytest
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+from alma_sbom.data.collectors.albs import AlbsCache, AlbsCollector
+
+TESTED_ETAG = '"11363-1"'
+TESTED_BUILD_INFO = {
+    'id': 11363,
+    'created_at': '2024-04-30T14:02:23.231308',
+    'finished_at': None,
+    'owner': {'username': 'test', 'email': 'test@almalinux.org'},
+    'tasks': [{
+        'artifacts': [{'type': 'rpm', 'name': 'bash-5.1.8-9.el9.x86_64.rpm', 'cas_hash': '0' * 64}],
+    }],
+}
+
+
+class AlbsServer:
+    """Local HTTP/1.1 server answering a build with an ETag"""
+
+    def __init__(self) -> None:
+        self.build_info = dict(TESTED_BUILD_INFO)
+        self.requests = []
+        self.client_ports = set()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._gen_handler())
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _gen_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self) -> None:
+                server.requests.append(dict(self.headers))
+                server.client_ports.add(self.client_address[1])
+                if self.headers.get('If-None-Match') == TESTED_ETAG:
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = json.dumps(server.build_info).encode()
+                self.send_response(HTTPStatus.OK)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', TESTED_ETAG)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def albs_server() -> Iterator[AlbsServer]:
+    server = AlbsServer()
+    thread = threading.Thread(target=server._server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server._server.shutdown()
+    server._server.server_close()
+
+
+@pytest.fixture
+def albs_cache_instance(tmp_path: Path) -> AlbsCache:
+    return AlbsCache(cache_dir=tmp_path, max_size=1024 * 1024, finished_ttl=3600)
+
+
+def test_get_put(albs_cache_instance: AlbsCache) -> None:
+    assert albs_cache_instance.get('url') is None
+    albs_cache_instance.put('url', TESTED_BUILD_INFO, etag=TESTED_ETAG, last_modified=None)
+    cached = albs_cache_instance.get('url')
+    assert cached.pop('cached_at') <= time.time()
+    assert cached == {
+        'build': TESTED_BUILD_INFO,
+        'etag': TESTED_ETAG,
+        'last_modified': None,
+    }
+
+
+def test_revalidate_unfinished_build(albs_server: AlbsServer, albs_cache_instance: AlbsCache) -> None:
+    collector = AlbsCollector(albs_server.url, cache=albs_cache_instance)
+    assert collector._extract_build_info_by_id('11363') == TESTED_BUILD_INFO
+    assert collector._extract_build_info_by_id('11363') == TESTED_BUILD_INFO
+    assert len(albs_server.requests) == 2
+    assert 'If-None-Match' not in albs_server.requests[0]
+    collector.collect_build_by_id('11363')
+    assert not collector.build_finished
+    assert albs_server.requests[1]['If-None-Match'] == TESTED_ETAG
+
+
+def test_finished_build_without_request(albs_server: AlbsServer, albs_cache_instance: AlbsCache) -> None:
+    albs_server.build_info['finished_at'] = '2024-04-30T15:02:23.231308'
+    AlbsCollector(albs_server.url, cache=albs_cache_instance)._extract_build_info_by_id('11363')
+    build_info = AlbsCollector(albs_server.url, cache=albs_cache_instance)._extract_build_info_by_id('11363')
+    assert build_info == albs_server.build_info
+    assert len(albs_server.requests) == 1
+
+
+def test_revalidate_expired_finished_build(
+    albs_server: AlbsServer,
+    albs_cache_instance: AlbsCache,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    albs_server.build_info['finished_at'] = '2024-04-30T15:02:23.231308'
+    collector = AlbsCollector(albs_server.url, cache=albs_cache_instance)
+    collector.collect_build_by_id('11363')
+    assert collector.build_finished
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 3600)
+    assert collector._extract_build_info_by_id('11363') == albs_server.build_info
+    assert len(albs_server.requests) == 2
+    assert albs_server.requests[1]['If-None-Match'] == TESTED_ETAG
+
+    ### the revalidated build is trusted for another finished_ttl
+    assert collector._extract_build_info_by_id('11363') == albs_server.build_info
+    assert len(albs_server.requests) == 2
+
+
+def test_session_keeps_connection(albs_server: AlbsServer) -> None:
+    collector = AlbsCollector(albs_server.url)
+    for _ in range(3):
+        collector._extract_build_info_by_id('11363')
+    assert len(albs_server.requests) == 3
+    assert len(albs_server.client_ports) == 1
@@ -1,5 +1,7 @@
+import hashlib
 import os
 import pytest
+from pathlib import Path
 
 from alma_sbom.data.collectors import IsoCollector
 from alma_sbom.data.models import Iso
@@ -32,3 +34,44 @@ def test_get_fd_path(iso_collector_instance: IsoCollector) -> None:
 
 # TODO: Implement in the future
 # def test_iter_packages(self) -> None:
+
+
+def test_iter_package_windows(tested_iso_image: Path, tested_iso_packages: dict[str, bytes]) -> None:
+    iso_collector = IsoCollector(zero_copy=True)
+    assert iso_collector.collect_iso_by_file(tested_iso_image) == EXPECTED_ISO
+
+    expected_hashes = sorted(hashlib.sha256(data).hexdigest() for data in tested_iso_packages.values())
+    tested_hashes = []
+    for window in iso_collector.iter_package_windows():
+        assert window.length == len(window.data)
+        tested_hashes.append(hashlib.sha256(window.data).hexdigest())
+    assert sorted(tested_hashes) == expected_hashes
+
+
+def test_iter_package_windows_without_zero_copy(iso_collector_instance: IsoCollector) -> None:
+    with pytest.raises(RuntimeError):
+        next(iso_collector_instance.iter_package_windows())
+
+
+@pytest.mark.parametrize('zero_copy', [False, True])
+def test_collect_packages_from_repodata(tested_iso_image: Path, tested_iso_packages: dict[str, bytes], zero_copy: bool) -> None:
+    iso_collector = IsoCollector(zero_copy=zero_copy)
+    iso_collector.collect_iso_by_file(tested_iso_image)
+    packages = iso_collector.collect_packages_from_repodata(verify_count=len(tested_iso_packages))
+
+    assert [pkg.package_nevra.name for pkg in packages] == [
+        name.split('-')[0] for name in tested_iso_packages
+    ]
+    assert [pkg.hashs[0].value for pkg in packages] == [
+        hashlib.sha256(data).hexdigest() for data in tested_iso_packages.values()
+    ]
+
+
+def test_verify_package_checksum_mismatch(tested_iso_image: Path, tested_iso_packages: dict[str, bytes]) -> None:
+    iso_collector = IsoCollector()
+    iso_collector.collect_iso_by_file(tested_iso_image)
+    with pytest.raises(ValueError):
+        iso_collector._verify_package_checksum(
+            Path('/Minimal/Packages') / next(iter(tested_iso_packages)),
+            '0' * 64,
+        )
@@ -0,0 +1,30 @@
+from alma_sbom.type import Licenses
+from alma_sbom.data.collectors.licenses import (
+    get_licensing,
+    parse_licenses,
+    licenses_cache_info,
+)
+
+
+def test_get_licensing() -> None:
+    assert get_licensing() is get_licensing()
+
+
+def test_parse_licenses() -> None:
+    assert parse_licenses('GPLv3+') == Licenses(ids=[], expression='GPLv3+')
+    assert parse_licenses('MIT AND GPL-3.0-or-later') == Licenses(
+        ids=['MIT', 'GPL-3.0-or-later'],
+        expression='MIT AND GPL-3.0-or-later',
+    )
+
+
+def test_parse_licenses_cached() -> None:
+    licenses_str = 'BSD-3-Clause OR Apache-2.0'
+    parse_licenses(licenses_str)
+    hits = licenses_cache_info().hits
+    licenses = parse_licenses(licenses_str)
+    assert licenses_cache_info().hits == hits + 1
+
+    ### cached result must not be shared between packages
+    licenses.ids.append('MIT')
+    assert parse_licenses(licenses_str).ids == ['BSD-3-Clause', 'Apache-2.0']
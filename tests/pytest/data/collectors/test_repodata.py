@@ -0,0 +1,98 @@
+import gzip
+import io
+import lzma
+import pytest
+
+from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms
+from alma_sbom.data.collectors.repodata import (
+    get_primary_location,
+    open_metadata,
+    iter_packages_from_primary,
+)
+from alma_sbom.data.models import Package
+
+TESTED_REPOMD = b'''<?xml version="1.0" encoding="UTF-8"?>
+<repomd xmlns="http://linux.duke.edu/metadata/repo" xmlns:rpm="http://linux.duke.edu/metadata/rpm">
+  <revision>1714500330</revision>
+  <data type="primary">
+    <checksum type="sha256">0123</checksum>
+    <location href="repodata/0123-primary.xml.gz"/>
+  </data>
+  <data type="filelists">
+    <checksum type="sha256">4567</checksum>
+    <location href="repodata/4567-filelists.xml.gz"/>
+  </data>
+</repomd>
+'''
+TESTED_PRIMARY = b'''<?xml version="1.0" encoding="UTF-8"?>
+<metadata xmlns="http://linux.duke.edu/metadata/common" xmlns:rpm="http://linux.duke.edu/metadata/rpm" packages="1">
+<package type="rpm">
+  <name>bash</name>
+  <arch>x86_64</arch>
+  <version epoch="0" ver="5.1.8" rel="9.el9"/>
+  <checksum type="sha256" pkgid="YES">05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1</checksum>
+  <summary>The GNU Bourne Again shell</summary>
+  <description>The GNU Bourne Again shell (Bash) is a shell or command language
+interpreter that is compatible with the Bourne shell (sh). Bash
+incorporates useful features from the Korn shell (ksh) and the C shell
+(csh). Most sh scripts can be run by bash without modification.</description>
+  <packager>AlmaLinux Packaging Team &lt;packager@almalinux.org&gt;</packager>
+  <url>https://www.gnu.org/software/bash</url>
+  <time file="1714500330" build="1714500330"/>
+  <size package="1771389" installed="7738638" archive="7753164"/>
+  <location href="Packages/bash-5.1.8-9.el9.x86_64.rpm"/>
+  <format>
+    <rpm:license>GPLv3+</rpm:license>
+    <rpm:vendor>AlmaLinux</rpm:vendor>
+    <rpm:group>Unspecified</rpm:group>
+    <rpm:buildhost>x64-builder01.almalinux.org</rpm:buildhost>
+    <rpm:sourcerpm>bash-5.1.8-9.el9.src.rpm</rpm:sourcerpm>
+    <rpm:header-range start="4504" end="60349"/>
+  </format>
+</package>
+</metadata>
+'''
+
+EXPECTED_PACKAGE = Package(
+    package_nevra=PackageNevra(
+        epoch = 0,
+        name = 'bash',
+        version = '5.1.8',
+        release = '9.el9',
+        arch = 'x86_64',
+    ),
+    source_rpm='bash-5.1.8-9.el9.src.rpm',
+    hashs=[Hash(
+        value='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1',
+        algorithm=Algorithms.SHA_256,
+    )],
+    licenses=Licenses(ids=[], expression='GPLv3+'),
+    summary='The GNU Bourne Again shell',
+    description='The GNU Bourne Again shell (Bash) is a shell or command language\ninterpreter that is compatible with the Bourne shell (sh). Bash\nincorporates useful features from the Korn shell (ksh) and the C shell\n(csh). Most sh scripts can be run by bash without modification.',
+)
+
+
+def test_get_primary_location() -> None:
+    assert get_primary_location(io.BytesIO(TESTED_REPOMD)) == 'repodata/0123-primary.xml.gz'
+
+
+@pytest.mark.parametrize('location, compress', [
+    ('repodata/primary.xml', lambda data: data),
+    ('repodata/primary.xml.gz', gzip.compress),
+    ('repodata/primary.xml.xz', lzma.compress),
+])
+def test_open_metadata(location: str, compress) -> None:
+    with open_metadata(compress(TESTED_PRIMARY), location) as fd:
+        assert fd.read() == TESTED_PRIMARY
+
+
+def test_iter_packages_from_primary() -> None:
+    assert list(iter_packages_from_primary(io.BytesIO(TESTED_PRIMARY))) == [
+        (EXPECTED_PACKAGE, 'Packages/bash-5.1.8-9.el9.x86_64.rpm'),
+    ]
+
+
+def test_iter_packages_from_primary_unsupported_checksum() -> None:
+    primary = TESTED_PRIMARY.replace(b'type="sha256"', b'type="sha1"')
+    with pytest.raises(ValueError):
+        list(iter_packages_from_primary(io.BytesIO(primary)))
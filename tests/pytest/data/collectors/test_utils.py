@@ -0,0 +1,34 @@
+import hashlib
+import os
+from pathlib import Path
+
+from alma_sbom.data.collectors.utils import hash_file, hash_fileobj, hash_window, map_file
+
+TESTED_PACKAGE_NAME = 'bash-5.1.8-9.el9.x86_64.rpm'
+TESTED_PACKAGE_PATH = os.path.dirname(__file__) + f'/{TESTED_PACKAGE_NAME}'
+
+EXPECTED_HASH_VALUE = '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1'
+
+
+def test_hash_file() -> None:
+    assert hash_file(TESTED_PACKAGE_PATH) == EXPECTED_HASH_VALUE
+
+
+def test_hash_fileobj() -> None:
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        fd.read(1024)
+        fd.seek(0)
+        assert hash_fileobj(fd, buff_size=4096) == EXPECTED_HASH_VALUE
+
+
+def test_map_file(tmp_path: Path) -> None:
+    with map_file(TESTED_PACKAGE_PATH) as window:
+        assert window.offset == 0
+        assert window.length == os.path.getsize(TESTED_PACKAGE_PATH)
+        assert hash_window(window) == EXPECTED_HASH_VALUE
+
+    empty_file = tmp_path / 'empty.rpm'
+    empty_file.touch()
+    with map_file(empty_file) as window:
+        assert window.length == 0
+        assert hash_window(window) == hashlib.sha256(b'').hexdigest()
@@ -73,6 +73,25 @@ def test_get_purl(package_instance: Package) -> None:
     assert package_instance.get_purl() == expected_purl
 
 
+def test_get_purl_qualifiers(package_instance: Package) -> None:
+    expected_qualifiers = {
+        'arch': 'x86_64',
+        'distro': 'almalinux-9',
+        'upstream': 'bash-5.1.8-9.el9.src.rpm',
+    }
+    assert package_instance.get_purl_qualifiers() == expected_qualifiers
+    assert list(package_instance.get_purl_qualifiers()) == list(expected_qualifiers)
+
+
+def test_identifiers_follow_changes(package_instance: Package) -> None:
+    package_instance.get_cpe23()
+    package_instance.get_purl()
+    package_instance.package_nevra.epoch = 1
+    package_instance.package_nevra.name = 'libstdc++'
+    assert package_instance.get_cpe23() == "cpe:2.3:a:almalinux:libstdc\\+\\+:1\\:5.1.8-9.el9:*:*:*:*:*:*:*"
+    assert package_instance.get_purl() == "pkg:rpm/almalinux/libstdc++@5.1.8-9.el9?arch=x86_64&epoch=1&distro=almalinux-9&upstream=bash-5.1.8-9.el9.src.rpm"
+
+
 def test_get_properties(package_instance: Package) -> None:
     expected_props = PackageProperties(
         epoch=0,
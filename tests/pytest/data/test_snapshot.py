@@ -0,0 +1,114 @@
+import json
+import pytest
+from pathlib import Path
+
+from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms
+from alma_sbom.data import Package, Build, Iso
+from alma_sbom.data.attributes.property import (
+    PackageProperties,
+    BuildPropertiesForPackage,
+    BuildPropertiesForBuild,
+    GitSourceProperties,
+    SrpmSourceProperties,
+    SBOMProperties,
+)
+from alma_sbom.data.snapshot import get_kind, read_snapshot, write_snapshot
+
+def _gen_package(name: str, source: object) -> Package:
+    return Package(
+        package_nevra=PackageNevra(epoch=None, name=name, version='5.1.8', release='9.el9', arch='x86_64'),
+        source_rpm=f'{name}-5.1.8-9.el9.src.rpm',
+        package_timestamp=1714500330,
+        hashs=[Hash(value='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1', algorithm=Algorithms.SHA_256)],
+        licenses=Licenses(ids=['GPL-3.0-or-later'], expression='GPLv3+'),
+        summary='The GNU Bourne Again shell',
+        package_properties=PackageProperties(
+            epoch=None,
+            version='5.1.8',
+            release='9.el9',
+            arch='x86_64',
+            buildhost='x64-builder01.almalinux.org',
+            sourcerpm=f'{name}-5.1.8-9.el9.src.rpm',
+            timestamp=1714500330,
+        ),
+        build_properties=BuildPropertiesForPackage(
+            build_id=11363,
+            build_url=None,
+            author='test author',
+            package_type='rpm',
+            target_arch='x86_64',
+            source=source,
+        ),
+        sbom_properties=SBOMProperties(
+            immudb_hash='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1',
+        ),
+    )
+
+TESTED_PACKAGES = [
+    _gen_package('bash', GitSourceProperties(
+        git_url='https://git.almalinux.org/rpms/bash.git',
+        git_commit='4533026da95ca85fab57eafbc91c28a3a2dabd79',
+        git_ref='imports/c9/bash-5.1.8-9.el9',
+        git_commit_immudb_hash=None,
+    )),
+    _gen_package('zsh', SrpmSourceProperties(
+        srpm_url='https://example.org/zsh-5.1.8-9.el9.src.rpm',
+        srpm_checksum='0' * 64,
+        srpm_nevra='zsh-5.1.8-9.el9.src',
+    )),
+    Package(
+        package_nevra=PackageNevra(epoch=1, name='acl', version='2.3.1', release='4.el9', arch='aarch64'),
+        hashs=[Hash(value='1' * 64)],
+    ),
+]
+TESTED_BUILD = Build(
+    build_id='11363',
+    author='test author',
+    packages=TESTED_PACKAGES,
+    build_properties=BuildPropertiesForBuild(
+        build_id='11363',
+        build_url='https://build.almalinux.org/build/11363',
+        timestamp=1714500330,
+    ),
+)
+TESTED_ISO = Iso(releasever=9.6, image_type='minimal', packages=TESTED_PACKAGES)
+
+@pytest.mark.parametrize('name', ['snapshot.ndjson', 'snapshot.ndjson.gz'])
+@pytest.mark.parametrize('obj', [TESTED_PACKAGES[0], TESTED_BUILD, TESTED_ISO], ids=['package', 'build', 'iso'])
+def test_round_trip(obj: object, name: str, tmp_path: Path) -> None:
+    write_snapshot(tmp_path / name, obj)
+    assert read_snapshot(tmp_path / name) == obj
+
+def test_format(tmp_path: Path) -> None:
+    write_snapshot(tmp_path / 'snapshot.ndjson', TESTED_BUILD)
+    lines = (tmp_path / 'snapshot.ndjson').read_text().splitlines()
+    assert len(lines) == 1 + len(TESTED_PACKAGES)
+
+    header = json.loads(lines[0])
+    assert header['version'] == 1
+    assert header['kind'] == 'build'
+    assert header['build']['build_id'] == '11363'
+    assert 'packages' not in header['build']
+
+    ### None is omitted
+    assert json.loads(lines[3]) == {
+        'package_nevra': {'name': 'acl', 'epoch': 1, 'version': '2.3.1', 'release': '4.el9', 'arch': 'aarch64'},
+        'hashs': [{'value': '1' * 64, 'algorithm': 'SHA-256'}],
+    }
+
+def test_read_stream(tmp_path: Path) -> None:
+    ### packages may be an iterator, e.g. of the iso subcommand with --stream
+    write_snapshot(tmp_path / 'snapshot.ndjson', Iso(releasever=9.6, image_type='minimal', packages=iter(TESTED_PACKAGES)))
+    iso = read_snapshot(tmp_path / 'snapshot.ndjson', stream=True)
+    assert not isinstance(iso.packages, list)
+    assert list(iso.packages) == TESTED_PACKAGES
+
+def test_get_kind() -> None:
+    assert [get_kind(obj) for obj in [TESTED_PACKAGES[0], TESTED_BUILD, TESTED_ISO]] == ['package', 'build', 'iso']
+    with pytest.raises(TypeError):
+        get_kind(TESTED_PACKAGES)
+
+def test_unsupported_version(tmp_path: Path) -> None:
+    (tmp_path / 'snapshot.ndjson').write_text('{"version":2,"kind":"build"}\n')
+    with pytest.raises(ValueError):
+        read_snapshot(tmp_path / 'snapshot.ndjson')
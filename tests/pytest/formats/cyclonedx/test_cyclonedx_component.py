@@ -123,6 +123,16 @@ def package_instance() -> Package:
             immudb_hash='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1',
         ),
     )
+
+@pytest.mark.parametrize('epoch', [0, 1])
+@pytest.mark.parametrize('name', ['bash', 'libstdc++', 'perl-Pod-Usage'])
+def test_purl_from_package(package_instance, name: str, epoch: int) -> None:
+    package_instance.package_nevra.name = name
+    package_instance.package_nevra.epoch = epoch
+    component = component_from_package(package_instance)
+    assert component.purl == PackageURL.from_string(package_instance.get_purl())
+    assert component.purl.to_string() == PackageURL.from_string(package_instance.get_purl()).to_string()
+
 def test_component_from_package(package_instance) -> None:
     assert component_from_package(package_instance) == EXPECTED_PKG_COMPONENT
 
@@ -1,6 +1,8 @@
+import copy
 import pytest
 import os
 from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError
 from pathlib import Path
 from uuid import UUID
 
@@ -14,10 +16,13 @@ from cyclonedx.model.component import Component, ComponentType
 from cyclonedx.model.tool import ToolRepository
 from cyclonedx.schema import OutputFormat
 from packageurl import PackageURL
+from sortedcontainers import SortedSet
 
 from alma_sbom import constants
 from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms, SbomFileFormatType
-from alma_sbom.formats.cyclonedx.document import CDXFormatter, CDXDocument
+from alma_sbom.formats.cyclonedx import document as cdx_document
+from alma_sbom.formats.cyclonedx.document import CDXFormatter, CDXDocument, add_components
+from alma_sbom.formats.cyclonedx.component import component_from_package
 from alma_sbom.data import Package, Build, Iso
 from alma_sbom.data.attributes.property import (
     # Property,
@@ -442,3 +447,113 @@ def test_document_write(
     assert xml_output_file.exists()
     assert json_output_file.read_text(encoding='utf-8') == EXPECTED_JSON_OUTPUT
     assert xml_output_file.read_text(encoding='utf-8') == EXPECTED_XML_OUTPUT
+
+
+def _gen_components() -> list[Component]:
+    components = []
+    for name, version, arch in [
+        ('zsh', '5.8', 'x86_64'),
+        ('bash', '5.1.8', 'x86_64'),
+        ('bash', '4.4.20', 'x86_64'),
+        ('acl', '2.3.1', 'x86_64'),
+        ('bash', '5.1.8', 'i686'),
+    ]:
+        pkg = copy.deepcopy(TESTED_PACKAGE)
+        pkg.package_nevra.name = name
+        pkg.package_nevra.version = version
+        pkg.package_nevra.arch = arch
+        components.append(component_from_package(pkg))
+    return components
+
+def test_add_components() -> None:
+    bom = Bom()
+    add_components(bom, _gen_components()[:2])
+    add_components(bom, _gen_components()[2:])
+    assert [(c.name, c.version, c.purl.qualifiers['arch']) for c in bom.components] == [
+        ('acl', '0:2.3.1-9.el9', 'x86_64'),
+        ('bash', '0:4.4.20-9.el9', 'x86_64'),
+        ('bash', '0:5.1.8-9.el9', 'i686'),
+        ('bash', '0:5.1.8-9.el9', 'x86_64'),
+        ('zsh', '0:5.8-9.el9', 'x86_64'),
+    ]
+
+    ### components of distinct names and versions are in the order of a Bom
+    expected_bom = Bom()
+    for component in _gen_components()[:4]:
+        expected_bom.components.add(component)
+    bom = Bom()
+    add_components(bom, _gen_components()[:4])
+    assert list(bom.components) == list(expected_bom.components)
+
+@pytest.mark.parametrize('file_format', [SbomFileFormatType.JSON, SbomFileFormatType.XML])
+def test_formatter_write_registers_dependencies(file_format: SbomFileFormatType) -> None:
+    bom = copy.deepcopy(TESTED_BOM)
+    add_components(bom, _gen_components())
+    expected_bom = copy.deepcopy(bom)
+    expected_bom.validate()
+
+    CDXFormatter.from_format_type(file_format).write(bom)
+    assert len(bom.dependencies) == len(expected_bom.dependencies)
+    assert {id(d.ref) for d in bom.dependencies} == {
+        id(c.bom_ref) for c in [bom.metadata.component, *bom.components]
+    }
+    assert 'register_dependency' not in vars(bom)
+
+def test_pinned_cdx_lib_internals() -> None:
+    ### add_components() and _indexed_dependency_registration() must be
+    ### revisited when cyclonedx-python-lib is upgraded
+    assert cdx_document._uses_pinned_cdx_lib()
+    bom = Bom()
+    assert isinstance(vars(bom).get('_components'), SortedSet)
+    add_components(bom, _gen_components())
+    assert bom.components.key is cdx_document._component_sort_key
+    assert 'register_dependency' not in vars(bom)
+    assert callable(Bom.register_dependency)
+
+def test_indexed_dependency_registration_matches_library() -> None:
+    def register(bom: Bom, components: list[Component]) -> list:
+        bom.register_dependency(components[0], components[1:3])
+        bom.register_dependency(components[0], components[3:4])
+        bom.register_dependency(components[1])
+        bom.register_dependency(components[4])
+        bom.register_dependency(components[2], [components[4]])
+        return sorted(
+            (str(d.ref), sorted(str(dd.ref) for dd in d.dependencies))
+            for d in bom.dependencies
+        )
+
+    expected = register(Bom(), _gen_components())
+    bom = Bom()
+    with cdx_document._indexed_dependency_registration(bom):
+        assert register(bom, _gen_components()) == expected
+
+def test_add_components_with_other_cdx_lib(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cdx_document, '_uses_pinned_cdx_lib', lambda: False)
+    bom = Bom()
+    add_components(bom, _gen_components())
+    assert bom.components.key is None
+    assert [c.name for c in bom.components] == ['acl', 'bash', 'bash', 'bash', 'zsh']
+    with cdx_document._indexed_dependency_registration(bom):
+        assert 'register_dependency' not in vars(bom)
+
+def test_add_components_orders_multilib_by_qualifiers() -> None:
+    components = _gen_components()
+    ### bom-refs of x86_64 and i686 bash 5.1.8 in the reverse order of their arches
+    components[1].bom_ref.value = 'a'
+    components[4].bom_ref.value = 'b'
+    bom = Bom()
+    add_components(bom, reversed(components))
+    assert [(c.name, c.purl.qualifiers['arch']) for c in bom.components if c.version == '0:5.1.8-9.el9'] == [
+        ('bash', 'i686'),
+        ('bash', 'x86_64'),
+    ]
+
+def test_uses_pinned_cdx_lib_without_metadata(monkeypatch: pytest.MonkeyPatch) -> None:
+    def version(name: str) -> str:
+        raise PackageNotFoundError(name)
+    monkeypatch.setattr(cdx_document, 'version', version)
+    cdx_document._uses_pinned_cdx_lib.cache_clear()
+    try:
+        assert not cdx_document._uses_pinned_cdx_lib()
+    finally:
+        cdx_document._uses_pinned_cdx_lib.cache_clear()
@@ -0,0 +1,98 @@
+import copy
+import json
+import pytest
+from dataclasses import replace
+from pathlib import Path
+
+from alma_sbom.type import SbomFileFormatType
+from alma_sbom.formats.cyclonedx.document import CDXDocument
+from alma_sbom.formats.cyclonedx.stream import CDXJsonStreamDocument
+from alma_sbom.data import Iso
+
+from test_cyclonedx_document import TESTED_PACKAGE, TESTED_BUILD
+
+
+def gen_tested_packages(count: int):
+    for release in range(count):
+        yield replace(
+            TESTED_PACKAGE,
+            package_nevra=replace(TESTED_PACKAGE.package_nevra, release=f'{release}.el9'),
+        )
+
+def normalize(output: dict) -> dict:
+    """Drop the values which differ on every generation"""
+    output = copy.deepcopy(output)
+    refs = {output['metadata']['component'].pop('bom-ref'): 'root'}
+    for component in output.get('components', []):
+        refs[component.pop('bom-ref')] = component['purl']
+    output['components'] = sorted(output.get('components', []), key=lambda c: c['purl'])
+    output['dependencies'] = sorted(refs[dep['ref']] for dep in output['dependencies'])
+    del output['metadata']['timestamp']
+    del output['serialNumber']
+    return output
+
+def gen_failing_packages(count: int):
+    yield from gen_tested_packages(count)
+    raise RuntimeError('immudb lookup failed')
+
+def write_and_load(doc, output_file: Path) -> tuple[str, dict]:
+    doc.write(output_file)
+    text = output_file.read_text()
+    return text, json.loads(text)
+
+def test_write_iso(tmp_path: Path) -> None:
+    iso = Iso(releasever=9.6, image_type='test', packages=list(gen_tested_packages(3)))
+    _, expected = write_and_load(
+        CDXDocument.from_iso(iso, SbomFileFormatType.JSON),
+        tmp_path / 'expected.json',
+    )
+    ### packages may be a lazy iterable for streaming documents
+    iso.packages = gen_tested_packages(3)
+    text, output = write_and_load(
+        CDXJsonStreamDocument.from_iso(iso, SbomFileFormatType.JSON),
+        tmp_path / 'output.json',
+    )
+
+    assert list(output.keys()) == list(expected.keys())
+    assert normalize(output) == normalize(expected)
+    assert text == json.dumps(output, indent=4)
+
+def test_write_build(tmp_path: Path) -> None:
+    _, expected = write_and_load(
+        CDXDocument.from_build(TESTED_BUILD, SbomFileFormatType.JSON),
+        tmp_path / 'expected.json',
+    )
+    _, output = write_and_load(
+        CDXJsonStreamDocument.from_build(TESTED_BUILD, SbomFileFormatType.JSON),
+        tmp_path / 'output.json',
+    )
+
+    assert normalize(output) == normalize(expected)
+
+def test_write_package(tmp_path: Path) -> None:
+    _, expected = write_and_load(
+        CDXDocument.from_package(TESTED_PACKAGE, SbomFileFormatType.JSON),
+        tmp_path / 'expected.json',
+    )
+    text, output = write_and_load(
+        CDXJsonStreamDocument.from_package(TESTED_PACKAGE, SbomFileFormatType.JSON),
+        tmp_path / 'output.json',
+    )
+
+    assert 'components' not in output
+    assert normalize(output) == normalize(expected)
+    assert text == json.dumps(output, indent=4)
+
+def test_xml_is_not_supported() -> None:
+    with pytest.raises(ValueError):
+        CDXJsonStreamDocument.from_package(TESTED_PACKAGE, SbomFileFormatType.XML)
+
+def test_write_failure_keeps_output(tmp_path: Path) -> None:
+    output_file = tmp_path / 'output.json'
+    output_file.write_text('previous')
+    iso = Iso(releasever=9.6, image_type='test', packages=gen_failing_packages(2))
+    with pytest.raises(RuntimeError):
+        CDXJsonStreamDocument.from_iso(iso, SbomFileFormatType.JSON).write(output_file)
+    ### neither a truncated document nor the temporary file is left
+    assert output_file.read_text() == 'previous'
+    assert list(tmp_path.iterdir()) == [output_file]
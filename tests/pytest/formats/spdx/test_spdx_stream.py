@@ -0,0 +1,119 @@
+import json
+import re
+import pytest
+from pathlib import Path
+
+from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms, SbomFileFormatType
+from alma_sbom.formats.spdx.document import SPDXDocument
+from alma_sbom.formats.spdx.stream import SPDXJsonStreamDocument
+from alma_sbom.data import Package, Build, Iso
+from alma_sbom.data.attributes.property import (
+    PackageProperties,
+    BuildPropertiesForBuild,
+)
+
+### annotationDate and created differ in every generation
+DATE_PATTERN = re.compile(r'"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z"')
+### documentNamespace has an uuid
+NAMESPACE_PATTERN = re.compile(r'"documentNamespace": ".*"')
+
+
+def gen_tested_package(release: int) -> Package:
+    return Package(
+        package_nevra=PackageNevra(
+            epoch = 0,
+            name = 'bash',
+            version = '5.1.8',
+            release = f'{release}.el9',
+            arch = 'x86_64',
+        ),
+        source_rpm='bash-5.1.8-9.el9.src.rpm',
+        package_timestamp=1714500330,
+        hashs=[Hash(
+            value='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1',
+            algorithm=Algorithms.SHA_256,
+        )],
+        licenses=Licenses(ids=[], expression='GPLv3+'),
+        summary='The GNU Bourne Again shell',
+        package_properties=PackageProperties(
+            epoch=0,
+            version='5.1.8',
+            release=f'{release}.el9',
+            arch='x86_64',
+            buildhost='x64-builder01.almalinux.org',
+            sourcerpm='bash-5.1.8-9.el9.src.rpm',
+            timestamp=1714500330,
+        ),
+    )
+
+def gen_tested_packages(count: int):
+    for release in range(count):
+        yield gen_tested_package(release)
+
+def normalize(output: str) -> str:
+    return NAMESPACE_PATTERN.sub('', DATE_PATTERN.sub('', output))
+
+def write_both(expected_doc, output_doc, tmp_path: Path) -> tuple[str, str]:
+    expected_doc.write(tmp_path / 'expected.json')
+    output_doc.write(tmp_path / 'output.json')
+    return (
+        normalize((tmp_path / 'expected.json').read_text()),
+        normalize((tmp_path / 'output.json').read_text()),
+    )
+
+def test_write_iso(tmp_path: Path) -> None:
+    iso = Iso(releasever=9.6, image_type='test', packages=list(gen_tested_packages(3)))
+    expected_doc = SPDXDocument.from_iso(iso, SbomFileFormatType.JSON)
+    ### packages may be a lazy iterable for streaming documents
+    iso.packages = gen_tested_packages(3)
+    output_doc = SPDXJsonStreamDocument.from_iso(iso, SbomFileFormatType.JSON)
+
+    expected, output = write_both(expected_doc, output_doc, tmp_path)
+    assert output == expected
+    assert len(json.loads((tmp_path / 'output.json').read_text())['packages']) == 3
+
+def test_write_build(tmp_path: Path) -> None:
+    build = Build(
+        build_id=11363,
+        author='test author',
+        packages=list(gen_tested_packages(2)),
+        build_properties=BuildPropertiesForBuild(
+            build_id=11363,
+            build_url='https://build.almalinux.org/build/11363',
+            timestamp=1714500330,
+        ),
+    )
+    expected, output = write_both(
+        SPDXDocument.from_build(build, SbomFileFormatType.JSON),
+        SPDXJsonStreamDocument.from_build(build, SbomFileFormatType.JSON),
+        tmp_path,
+    )
+    assert output == expected
+
+def test_write_package(tmp_path: Path) -> None:
+    package = gen_tested_package(9)
+    expected, output = write_both(
+        SPDXDocument.from_package(package, SbomFileFormatType.JSON),
+        SPDXJsonStreamDocument.from_package(package, SbomFileFormatType.JSON),
+        tmp_path,
+    )
+    assert output == expected
+
+def test_write_iso_without_packages(tmp_path: Path) -> None:
+    iso = Iso(releasever=9.6, image_type='test')
+    with pytest.raises(ValueError):
+        SPDXJsonStreamDocument.from_iso(iso, SbomFileFormatType.JSON).write(tmp_path / 'output.json')
+
+def test_write_failure_leaves_no_output(tmp_path: Path) -> None:
+    def gen_failing_packages(count: int):
+        yield from gen_tested_packages(count)
+        raise RuntimeError('immudb lookup failed')
+
+    iso = Iso(releasever=9.6, image_type='test', packages=gen_failing_packages(2))
+    with pytest.raises(RuntimeError):
+        SPDXJsonStreamDocument.from_iso(iso, SbomFileFormatType.JSON).write(tmp_path / 'output.json')
+    assert list(tmp_path.iterdir()) == []
+
+def test_xml_is_not_supported() -> None:
+    with pytest.raises(ValueError):
+        SPDXJsonStreamDocument.from_package(gen_tested_package(9), SbomFileFormatType.XML)
@@ -0,0 +1,85 @@
+import pytest
+from pathlib import Path
+
+from spdx_tools.spdx.validation.document_validator import validate_full_spdx_document
+
+from alma_sbom.type import SbomFileFormatType, ValidationMode
+from alma_sbom.formats.spdx.document import SPDXDocument
+from alma_sbom.formats.spdx.stream import SPDXJsonStreamDocument
+from alma_sbom.formats.spdx.validation import DocumentValidation, validate_document_fast
+from alma_sbom.data import Iso
+
+from test_spdx_stream import gen_tested_packages
+
+
+@pytest.fixture
+def spdx_document() -> SPDXDocument:
+    iso = Iso(releasever=9.6, image_type='test', packages=list(gen_tested_packages(3)))
+    return SPDXDocument.from_iso(iso, SbomFileFormatType.JSON)
+
+def test_validate_document_fast(spdx_document: SPDXDocument) -> None:
+    assert validate_full_spdx_document(spdx_document.document) == []
+    assert validate_document_fast(spdx_document.document) == []
+
+def test_validate_document_fast_duplicated_id(spdx_document: SPDXDocument) -> None:
+    spdx_document.document.packages[1].spdx_id = spdx_document.document.packages[0].spdx_id
+    assert validate_full_spdx_document(spdx_document.document)
+    assert validate_document_fast(spdx_document.document)
+
+def test_validate_document_fast_without_describes(spdx_document: SPDXDocument) -> None:
+    spdx_document.document.relationships = []
+    assert validate_full_spdx_document(spdx_document.document)
+    assert validate_document_fast(spdx_document.document)
+
+def test_validate_document_fast_invalid_checksum(spdx_document: SPDXDocument) -> None:
+    spdx_document.document.packages[0].checksums[0].value = 'invalid'
+    assert validate_full_spdx_document(spdx_document.document)
+    assert validate_document_fast(spdx_document.document)
+
+def test_validate_document_fast_dangling_annotation(spdx_document: SPDXDocument) -> None:
+    spdx_document.document.annotations[0].spdx_id = 'SPDXRef-missing'
+    assert validate_full_spdx_document(spdx_document.document)
+    assert validate_document_fast(spdx_document.document)
+
+@pytest.mark.parametrize('validation', [ValidationMode.FULL, ValidationMode.FAST])
+def test_write_invalid_document(spdx_document: SPDXDocument, validation: ValidationMode, tmp_path: Path) -> None:
+    spdx_document.document.relationships = []
+    spdx_document.validation = validation
+    with pytest.raises(ValueError):
+        spdx_document.write(tmp_path / 'output.json')
+
+def test_write_without_validation(spdx_document: SPDXDocument, tmp_path: Path) -> None:
+    spdx_document.document.relationships = []
+    spdx_document.validation = ValidationMode.OFF
+    spdx_document.write(tmp_path / 'output.json')
+    assert spdx_document.wait_validation()
+    assert (tmp_path / 'output.json').exists()
+
+def test_write_with_async_validation(spdx_document: SPDXDocument, tmp_path: Path) -> None:
+    spdx_document.validation = ValidationMode.ASYNC
+    spdx_document.write(tmp_path / 'output.json')
+    assert spdx_document.wait_validation()
+
+    spdx_document.document.relationships = []
+    spdx_document.write(tmp_path / 'invalid.json')
+    assert (tmp_path / 'invalid.json').exists()
+    assert not spdx_document.wait_validation()
+
+def test_write_stream_with_async_validation(tmp_path: Path) -> None:
+    iso = Iso(releasever=9.6, image_type='test', packages=gen_tested_packages(3))
+    stream_document = SPDXJsonStreamDocument.from_iso(iso, SbomFileFormatType.JSON)
+    stream_document.validation = ValidationMode.ASYNC
+    stream_document.write(tmp_path / 'output.json')
+    assert stream_document.wait_validation()
+
+    packages = list(gen_tested_packages(3))
+    packages[1].hashs[0].value = 'invalid'
+    stream_document.packages = packages
+    stream_document.write(tmp_path / 'invalid.json')
+    assert (tmp_path / 'invalid.json').exists()
+    assert not stream_document.wait_validation()
+
+def test_document_validation_of_broken_document() -> None:
+    validation = DocumentValidation()
+    validation.submit(None)
+    assert not validation.wait()
@@ -1,9 +1,15 @@
 from alma_sbom.type import SbomRecordType
 from alma_sbom.formats import document_factory
 from alma_sbom.formats.spdx.document import SPDXDocument
+from alma_sbom.formats.spdx.stream import SPDXJsonStreamDocument
 from alma_sbom.formats.cyclonedx.document import CDXDocument
+from alma_sbom.formats.cyclonedx.stream import CDXJsonStreamDocument
 
 def test_document_factory() -> None:
     assert document_factory(SbomRecordType.SPDX) == SPDXDocument
     assert document_factory(SbomRecordType.CYCLONEDX) == CDXDocument
 
+
+def test_document_factory_stream() -> None:
+    assert document_factory(SbomRecordType.SPDX, stream=True) == SPDXJsonStreamDocument
+    assert document_factory(SbomRecordType.CYCLONEDX, stream=True) == CDXJsonStreamDocument
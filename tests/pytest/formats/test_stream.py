@@ -0,0 +1,37 @@
+import io
+import json
+import pytest
+from pathlib import Path
+
+from alma_sbom.formats.stream import JsonStreamWriter, open_atomic
+
+
+def test_writer_is_not_closed_on_failure() -> None:
+    fd = io.StringIO()
+    with pytest.raises(RuntimeError):
+        with JsonStreamWriter(fd) as writer:
+            writer.write_member('name', 'test')
+            raise RuntimeError('immudb lookup failed')
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(fd.getvalue())
+
+def test_open_atomic(tmp_path: Path) -> None:
+    output_file = tmp_path / 'output.json'
+    with open_atomic(output_file) as fd:
+        fd.write('{}')
+        assert not output_file.exists()
+    assert output_file.read_text() == '{}'
+    assert list(tmp_path.iterdir()) == [output_file]
+
+def test_open_atomic_writes_symlink_directly(tmp_path: Path) -> None:
+    ### like /dev/stdout, which is a symlink to the file descriptor
+    target = tmp_path / 'target.json'
+    target.write_text('')
+    output_file = tmp_path / 'output.json'
+    output_file.symlink_to(target)
+    with pytest.raises(RuntimeError):
+        with open_atomic(output_file) as fd:
+            fd.write('{')
+            raise RuntimeError('immudb lookup failed')
+    assert output_file.is_symlink()
+    assert target.read_text() == '{'
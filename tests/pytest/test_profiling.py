@@ -0,0 +1,46 @@
+import pstats
+import pytest
+from pathlib import Path
+
+from alma_sbom.profiling import StageTimer, stage, stage_timer
+from alma_sbom.cli.profiling import Profiling
+
+def test_disabled_timer_records_nothing() -> None:
+    timer = StageTimer()
+    with timer.stage('immudb'):
+        pass
+    assert list(timer.iter_stage('iso', range(3))) == [0, 1, 2]
+    assert timer.summary() == []
+
+def test_summary() -> None:
+    timer = StageTimer()
+    timer.enabled = True
+    for duration in range(1, 21):
+        timer.record('immudb', duration / 1000)
+    with timer.stage('write'):
+        pass
+    assert list(timer.iter_stage('iso', 'abc')) == ['a', 'b', 'c']
+
+    summary = {s.name: s for s in timer.summary()}
+    assert summary['immudb'].count == 20
+    assert summary['immudb'].total == pytest.approx(0.21)
+    assert summary['immudb'].p50 == pytest.approx(0.010)
+    assert summary['immudb'].p95 == pytest.approx(0.019)
+    assert summary['immudb'].max == pytest.approx(0.020)
+    assert summary['write'].count == 1
+    ### the final step which raises StopIteration is timed as well
+    assert summary['iso'].count == 4
+    assert timer.format_summary().splitlines()[0].split() == [
+        'stage', 'count', 'total(s)', 'p50(ms)', 'p95(ms)', 'max(ms)',
+    ]
+
+def test_profiling(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    dump = tmp_path / 'alma-sbom.prof'
+    with Profiling(profile=True, profile_dump=dump):
+        with stage('immudb'):
+            sum(range(1000))
+    assert not stage_timer.enabled
+
+    err = capsys.readouterr().err
+    assert err.splitlines()[1].split()[:2] == ['immudb', '1']
+    assert pstats.Stats(str(dump)).total_calls > 0